@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+
+# Performance tooling; run modules with `python -m <package>.benchmarks.<name>`
+# from the directory that contains the package.
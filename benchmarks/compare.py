@@ -0,0 +1,219 @@
+"""
+Compare benchmark results against the versioned baselines in
+benchmarks/baselines/<suite>.json.
+
+Timings vary between runs far more than within one: the machine's clock,
+thermal state and background load drift over minutes, so the spread of the
+samples inside a single run says little about whether two runs differ.
+Each suite therefore runs several times (--runs), and comparisons are made
+between runs, not samples. Every run contributes one value per scenario
+(its median, or its p99 or peak memory), and a change is flagged only when
+the two sets of runs do not overlap even after allowing the tolerance:
+every current run slower than the slowest baseline run by more than the
+tolerance (or faster than the fastest by more, for improvements). The
+spread of the baseline's runs thus acts as a noise floor. The table shows
+the fastest run of each side (min of N) and the resulting limit.
+
+Checks per scenario (and per stage for the level stress suite):
+    time    median time per tick/call, against the tolerance
+    p99     99th percentile tick time (level stress only), against the p99
+            tolerance; tails are noisier than medians, so its default is wider
+    memory  peak traced memory (level stress only), against the memory tolerance
+
+Runs offline with the standard library only. Exit status is 1 when any
+regression is flagged.
+
+Usage (from the directory that contains the package):
+    python -m <package>.benchmarks.compare RESULTS [RESULTS ...] [--baseline PATH]
+        [--tolerance 0.10] [--p99-tolerance 0.25] [--memory-tolerance 0.10]
+    python -m <package>.benchmarks.compare RESULTS [RESULTS ...] --save   # promote to the new baseline
+
+Several result files of the same suite are pooled as more runs.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+def result_runs(results: dict) -> List[Dict[str, dict]]:
+    """Scenario results per run (format 1 files hold a single run)."""
+    if 'runs' in results:
+        return results['runs']
+    return [results.get('scenarios', {})]
+
+def extract_metrics(results: dict) -> Dict[str, dict]:
+    """
+    Flatten a result file into rows keyed by scenario (and stage).
+
+    Returns:
+        {row name: {'unit', 'time': [per run median], optional 'p99': [per run],
+         optional 'memory': [per run]}}
+    """
+    rows = {}
+    for scenarios in result_runs(results):
+        for name, scenario in scenarios.items():
+            if 'stages' in scenario:  # level stress
+                if 'peak_memory_bytes' in scenario:
+                    row = rows.setdefault(f"{name}/memory", {'memory': []})
+                    row['memory'].append(scenario['peak_memory_bytes'])
+                for stage, stats in scenario['stages'].items():
+                    row = rows.setdefault(f"{name}/{stage}", {'time': [], 'p99': [], 'unit': 'ms'})
+                    row['time'].append(stats['p50_ms'])
+                    row['p99'].append(stats['p99_ms'])
+            else:  # micro
+                row = rows.setdefault(name, {'time': [], 'unit': 'us'})
+                row['time'].append(scenario['median_us'])
+    return rows
+
+def _delta(baseline: float, current: float) -> float:
+    return (current - baseline) / baseline if baseline else 0.0
+
+def _check(base: List[float], current: List[float], tolerance: float,
+           worse: str, better: str) -> Tuple[float, float, float, float, str]:
+    """
+    Compare per-run values of the baseline and the current results.
+
+    Returns:
+        (fastest baseline run, fastest current run, delta between them,
+         delta beyond which the change is flagged as worse, status)
+    """
+    base_best, current_best = min(base), min(current)
+    if current_best > max(base) * (1.0 + tolerance):
+        status = worse
+    elif max(current) * (1.0 + tolerance) < base_best:
+        status = better
+    else:
+        status = 'ok'
+    limit = _delta(base_best, max(base) * (1.0 + tolerance))
+    return base_best, current_best, _delta(base_best, current_best), limit, status
+
+def compare(baseline: dict, current: dict, tolerance: float, p99_tolerance: float,
+            memory_tolerance: float) -> Tuple[List[tuple], int]:
+    """
+    Compare two result files.
+
+    Returns:
+        (table rows as (name, metric, baseline, current, delta, limit, status),
+         number of regressions)
+    """
+    base_rows = extract_metrics(baseline)
+    current_rows = extract_metrics(current)
+
+    table = []
+    regressions = 0
+    for name, row in current_rows.items():
+        base = base_rows.get(name)
+        if base is None:
+            table.append((name, '-', None, None, None, None, 'new'))
+            continue
+
+        checks = (
+            ('time', f"time {row.get('unit')}", tolerance, 'SLOWER', 'faster', 1.0),
+            ('p99', "p99 ms", p99_tolerance, 'SLOWER', 'faster', 1.0),
+            ('memory', "peak KB", memory_tolerance, 'LARGER', 'smaller', 1 / 1024),
+        )
+        for key, metric, allowed, worse, better, scale in checks:
+            if row.get(key) and base.get(key):
+                base_best, current_best, delta, limit, status = _check(base[key], row[key], allowed,
+                                                                       worse, better)
+                regressions += status == worse
+                table.append((name, metric, base_best * scale, current_best * scale, delta, limit, status))
+
+    for name in base_rows:
+        if name not in current_rows:
+            table.append((name, '-', None, None, None, None, 'missing'))
+    return table, regressions
+
+def print_table(table: List[tuple]):
+    print(f"{'scenario':<44} {'metric':<9} {'baseline':>12} {'current':>12} {'delta':>8} {'limit':>8}  status")
+    for name, metric, base, current, delta, limit, status in table:
+        base_text = f"{base:12.3f}" if base is not None else f"{'-':>12}"
+        current_text = f"{current:12.3f}" if current is not None else f"{'-':>12}"
+        delta_text = f"{delta:+8.1%}" if delta is not None else f"{'-':>8}"
+        limit_text = f"{limit:8.1%}" if limit is not None else f"{'-':>8}"
+        print(f"{name:<44} {metric:<9} {base_text} {current_text} {delta_text} {limit_text}  {status}")
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINES_DIR, f"{suite}.json")
+
+def save_baseline(results: dict, path: str):
+    """Store results as the new baseline, bumping its version number."""
+    version = 0
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            version = json.load(f).get('baseline_version', 0)
+
+    results = dict(results, baseline_version=version + 1)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Saved baseline version {version + 1} to {path}")
+
+def merge_results(results: List[dict]) -> dict:
+    """Pool the runs of several result files of one suite; metadata comes from the first."""
+    merged = {key: value for key, value in results[0].items() if key != 'scenarios'}
+    merged['runs'] = [scenarios for result in results for scenarios in result_runs(result)]
+    return merged
+
+def _load(path: str) -> Optional[dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Failed to read {path}: {e}")
+        return None
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results with a stored baseline")
+    parser.add_argument('results', nargs='+', help="result files from level_stress or micro")
+    parser.add_argument('--baseline', help="baseline file, defaults to baselines/<suite>.json")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="allowed median slowdown (0.10 = 10%%)")
+    parser.add_argument('--p99-tolerance', type=float, default=0.25, help="allowed p99 slowdown")
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help="allowed peak memory growth")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    loaded = [_load(path) for path in args.results]
+    if any(result is None for result in loaded):
+        return 2
+    if len({result['suite'] for result in loaded}) > 1:
+        print("Result files are from different suites")
+        return 2
+    current = merge_results(loaded)
+    path = args.baseline or baseline_path(current['suite'])
+
+    if args.save:
+        save_baseline(current, path)
+        return 0
+
+    baseline = _load(path)
+    if baseline is None:
+        return 2
+
+    if baseline.get('environment') != current.get('environment'):
+        print("Warning: baseline was recorded in a different environment; deltas may not be meaningful")
+    print(f"Baseline v{baseline.get('baseline_version', '?')} ({baseline.get('commit')}) "
+          f"vs current ({current.get('commit')})")
+
+    for label, results in (('baseline', baseline), ('current results', current)):
+        if len(result_runs(results)) < 2:
+            print(f"Warning: {label} hold a single run; noise cannot be estimated, "
+                  f"so only the tolerance applies")
+
+    table, regressions = compare(baseline, current, args.tolerance, args.p99_tolerance,
+                                  args.memory_tolerance)
+    print_table(table)
+
+    if regressions:
+        print(f"{regressions} regression(s) beyond tolerance")
+        return 1
+    print("No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Shared helpers for the benchmark modules: timing summaries, environment
+metadata and result files.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Bump when the result file layout changes
+RESULTS_FORMAT_VERSION = 2
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * p / 100.0))
+    return sorted_samples[index]
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """
+    Summarize per-tick timings.
+
+    Args:
+        samples_ns: Duration of each tick in nanoseconds
+
+    Returns:
+        Dictionary with ticks, ticks_per_s, mean_ms, stdev_ms, p50_ms, p95_ms and p99_ms
+    """
+    samples = sorted(samples_ns)
+    total = sum(samples)
+    return {
+        'ticks': len(samples),
+        'ticks_per_s': len(samples) / (total / 1e9) if total else 0.0,
+        'mean_ms': total / len(samples) / 1e6 if samples else 0.0,
+        'stdev_ms': statistics.stdev(samples) / 1e6 if len(samples) > 1 else 0.0,
+        'p50_ms': percentile(samples, 50) / 1e6,
+        'p95_ms': percentile(samples, 95) / 1e6,
+        'p99_ms': percentile(samples, 99) / 1e6,
+    }
+
+def time_ticks(tick: Callable[[], None], min_ticks: int, max_seconds: float) -> List[int]:
+    """
+    Call tick() repeatedly, timing each call.
+    Runs at least min_ticks calls, then stops once max_seconds have passed.
+
+    Returns:
+        Duration of each call in nanoseconds
+    """
+    samples = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(max_seconds * 1e9)
+    while len(samples) < min_ticks or clock() < deadline:
+        start = clock()
+        tick()
+        samples.append(clock() - start)
+    return samples
+
+def calibrate(func: Callable[[], None], min_seconds: float = 0.01) -> int:
+    """Find a call count per repeat that takes at least min_seconds, in powers of ten."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_seconds or number >= 10 ** 7:
+            return number
+        number *= 10
+
+def run_benchmark(func: Callable[[], None], repeats: int = 20, warmup: int = 3,
+                  number: Optional[int] = None) -> Dict[str, object]:
+    """
+    Time a function with warmup and repeated measurement.
+
+    Args:
+        func: Operation to time, called with no arguments
+        repeats: Timed repeats; each one gives one sample
+        warmup: Untimed repeats run first, so caches and lazy setup are warm
+        number: Calls per repeat, calibrated to about 10 ms when None
+
+    Returns:
+        describe() summary of the per-call times
+    """
+    if number is None:
+        number = calibrate(func)
+
+    clock = time.perf_counter_ns
+    samples = []
+    for repeat in range(warmup + repeats):
+        start = clock()
+        for _ in range(number):
+            func()
+        if repeat >= warmup:
+            samples.append((clock() - start) / number)
+
+    summary = describe(samples)
+    summary['number'] = number
+    return summary
+
+def describe(samples_ns: List[float]) -> Dict[str, object]:
+    """
+    Statistical summary of per-call times.
+
+    Returns:
+        Dictionary with repeats, ops_per_s, mean/stdev/min/median/max in
+        microseconds and the samples themselves (for significance tests)
+    """
+    samples_us = [sample / 1000.0 for sample in samples_ns]
+    mean = statistics.fmean(samples_us)
+    return {
+        'repeats': len(samples_us),
+        'ops_per_s': 1e6 / mean if mean else 0.0,
+        'mean_us': mean,
+        'stdev_us': statistics.stdev(samples_us) if len(samples_us) > 1 else 0.0,
+        'min_us': min(samples_us),
+        'median_us': statistics.median(samples_us),
+        'max_us': max(samples_us),
+        'samples_us': [round(sample, 4) for sample in samples_us],
+    }
+
+def git_revision() -> Optional[str]:
+    """Short commit hash of the working tree, if it is a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def environment_info() -> Dict[str, str]:
+    """Interpreter and library versions recorded with every result file."""
+    import pygame
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'pygame': pygame.version.ver,
+        'sdl': '.'.join(str(part) for part in pygame.get_sdl_version()),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+def make_results(suite: str, runs: List[Dict[str, dict]]) -> dict:
+    """
+    Wrap scenario results with the suite name, format version and environment.
+
+    Args:
+        suite: Suite name, which also names its baseline file
+        runs: Scenario results of each full run of the suite, in run order
+    """
+    return {
+        'suite': suite,
+        'format_version': RESULTS_FORMAT_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_revision(),
+        'environment': environment_info(),
+        'runs': runs,
+    }
+
+def write_results(results: dict, path: str):
+    """Write a result file with sorted keys, so files from two runs diff cleanly."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"Wrote results to {path}", file=sys.stderr)
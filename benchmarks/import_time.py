@@ -0,0 +1,83 @@
+"""
+Import-time budget check.
+
+Imports the game entry module in a fresh interpreter with `-X importtime`,
+reports the slowest imports and fails when the time spent in this package's
+own modules (or, optionally, the whole import) exceeds its budget.
+
+Usage (from the directory that contains the package):
+    python -m <package>.benchmarks.import_time [--budget-ms 60] [--total-budget-ms N] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+PACKAGE = __package__.split('.')[0]
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Milliseconds of import time allowed in the package's own modules
+OWN_BUDGET_MS = 60.0
+
+def measure_import_time(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a clean interpreter and parse `-X importtime` output.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        List of (module name, self microseconds, cumulative microseconds)
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYGAME_HIDE_SUPPORT_PROMPT='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=PACKAGE_PARENT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure and enforce the import-time budget")
+    parser.add_argument('--module', default=f'{PACKAGE}.main', help="module to import")
+    parser.add_argument('--budget-ms', type=float, default=OWN_BUDGET_MS,
+                        help="budget for this package's own modules")
+    parser.add_argument('--total-budget-ms', type=float, default=None,
+                        help="optional budget for the whole import, third-party included")
+    parser.add_argument('--top', type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args(argv)
+
+    entries = measure_import_time(args.module)
+    own_ms = sum(self_us for name, self_us, _ in entries
+                 if name == PACKAGE or name.startswith(PACKAGE + '.')) / 1000.0
+    total_ms = max((cumulative_us for name, _, cumulative_us in entries if name == args.module),
+                   default=0) / 1000.0
+
+    print(f"Slowest imports (self time) for {args.module}:")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda entry: entry[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000.0:8.2f} ms self  {cumulative_us / 1000.0:8.2f} ms cumulative  {name}")
+
+    print(f"Package modules: {own_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    print(f"Total import:    {total_ms:.1f} ms"
+          + (f" (budget {args.total_budget_ms:.1f} ms)" if args.total_budget_ms is not None else ""))
+
+    over_budget = own_ms > args.budget_ms
+    if args.total_budget_ms is not None and total_ms > args.total_budget_ms:
+        over_budget = True
+
+    if over_budget:
+        print("Import-time budget exceeded")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Level stress benchmark.
+
+Builds synthetic TileMaps from 10x6 up to 500x500, populates them with
+towers, enemies and projectiles, and times each per-frame stage of a level
+separately (tile draw, targeting, projectile update, collision, HUD) plus
+all of them together as one frame. Results are written as JSON with
+ticks/s and frame-time percentiles per stage, and peak traced memory per
+scenario, for each of several runs of the whole suite.
+
+The engine's tower, enemy and projectile managers are still stubs, so the
+scenarios use small benchmark-local entity classes that do the work those
+managers will do, in the straightforward way. Tiles are drawn with the real
+TileMap.draw and the HUD with the real level UI.
+
+Usage (from the directory that contains the package):
+    python -m <package>.benchmarks.level_stress [--scenario NAME ...] [--seconds 1.0]
+        [--min-ticks 5] [--runs 3] [--output PATH]
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import math
+import random
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict
+import pygame
+from ..engine.map_loader import TileMap, TILE_PATH, TILE_TOWER_SLOT
+from ..screens.level_screen import UI
+from ..settings import SCREEN_WIDTH, SCREEN_HEIGHT, UI_SETTINGS, TOWER_SETTINGS
+from .harness import RESULTS_DIR, make_results, summarize, time_ticks, write_results
+
+# name -> (map width, map height, towers, enemies, projectiles)
+SCENARIOS = {
+    'tiny': (10, 6, 4, 10, 10),
+    'small': (40, 30, 20, 100, 50),
+    'medium': (100, 100, 50, 300, 200),
+    'large': (250, 250, 100, 1000, 500),
+    'huge': (500, 500, 200, 2000, 1000),
+}
+
+STAGES = ('tile_draw', 'targeting', 'projectile_update', 'collision', 'hud', 'frame')
+
+TICK_DT = 1.0 / 60.0
+PROJECTILE_SPEED = 400.0
+HIT_RADIUS = 16.0
+
+class BenchTower:
+    __slots__ = ('x', 'y', 'range_sq', 'target')
+
+    def __init__(self, x: float, y: float, tower_range: float):
+        self.x = x
+        self.y = y
+        self.range_sq = tower_range * tower_range
+        self.target = None
+
+class BenchEnemy:
+    __slots__ = ('x', 'y', 'health')
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+        self.health = 100
+
+class BenchProjectile:
+    __slots__ = ('x', 'y', 'origin_x', 'origin_y', 'target_x', 'target_y', 'active')
+
+    def __init__(self, x: float, y: float, target_x: float, target_y: float):
+        self.x = self.origin_x = x
+        self.y = self.origin_y = y
+        self.target_x = target_x
+        self.target_y = target_y
+        self.active = True
+
+def make_tile_map(width: int, height: int) -> TileMap:
+    """
+    Generate a map with a serpentine path: horizontal runs every fourth row,
+    joined at alternating ends, with tower slots between the runs.
+    """
+    tiles = [[0] * width for _ in range(height)]
+    rows = list(range(1, height, 4))
+
+    for i, y in enumerate(rows):
+        for x in range(width):
+            tiles[y][x] = TILE_PATH
+        if i + 1 < len(rows):
+            column = width - 1 if i % 2 == 0 else 0
+            for connector_y in range(y, rows[i + 1]):
+                tiles[connector_y][column] = TILE_PATH
+
+    tower_slots = []
+    for y in rows:
+        slot_y = y + 2
+        if slot_y >= height:
+            continue
+        for x in range(1, width - 1, 3):
+            if tiles[slot_y][x] == 0:
+                tiles[slot_y][x] = TILE_TOWER_SLOT
+                tower_slots.append((x, slot_y))
+
+    last_row = rows[-1]
+    exit_x = 0 if len(rows) % 2 == 0 else width - 1
+    return TileMap(width, height, tiles, [(0, rows[0])], tower_slots, exit_points=[(exit_x, last_row)])
+
+class LevelScenario:
+    """A populated synthetic level and one callable per benchmark stage."""
+
+    def __init__(self, width: int, height: int, towers: int, enemies: int, projectiles: int,
+                 seed: int = 1234):
+        rng = random.Random(seed)
+        self.tile_map = make_tile_map(width, height)
+        tile_size = self.tile_map.tile_size
+
+        def center(tile):
+            return (tile[0] + 0.5) * tile_size, (tile[1] + 0.5) * tile_size
+
+        slots = self.tile_map.tower_slots or [(0, 0)]
+        path = self.tile_map.paths[0]
+        self.towers = [BenchTower(*center(slots[i % len(slots)]), TOWER_SETTINGS['base_range'])
+                       for i in range(towers)]
+        self.enemies = [BenchEnemy(*center(rng.choice(path))) for _ in range(enemies)]
+        self.projectiles = []
+        for _ in range(projectiles):
+            tower = rng.choice(self.towers)
+            target = rng.choice(self.enemies)
+            self.projectiles.append(BenchProjectile(tower.x, tower.y, target.x, target.y))
+
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.ui = UI(pygame.font.Font(None, UI_SETTINGS['font_size_medium']))
+        self.player = SimpleNamespace(energy=10, health=100)
+        self.wave_manager = SimpleNamespace(current_wave=1, enemies_left=enemies)
+        self.hits = 0
+
+    def tile_draw(self):
+        # LevelScreen.draw renders the whole map; here onto a screen-sized
+        # target, since a full-size surface for large maps would not fit in memory
+        self.tile_map.draw(self.screen)
+
+    def targeting(self):
+        enemies = self.enemies
+        for tower in self.towers:
+            best, best_sq = None, tower.range_sq
+            tx, ty = tower.x, tower.y
+            for enemy in enemies:
+                dx = enemy.x - tx
+                dy = enemy.y - ty
+                distance_sq = dx * dx + dy * dy
+                if distance_sq <= best_sq:
+                    best, best_sq = enemy, distance_sq
+            tower.target = best
+
+    def projectile_update(self):
+        step = PROJECTILE_SPEED * TICK_DT
+        for projectile in self.projectiles:
+            dx = projectile.target_x - projectile.x
+            dy = projectile.target_y - projectile.y
+            distance = math.hypot(dx, dy)
+            if distance <= step:
+                # Arrived: fire again from the tower so the count stays constant
+                projectile.x, projectile.y = projectile.origin_x, projectile.origin_y
+            else:
+                projectile.x += dx / distance * step
+                projectile.y += dy / distance * step
+
+    def collision(self):
+        radius_sq = HIT_RADIUS * HIT_RADIUS
+        enemies = self.enemies
+        for projectile in self.projectiles:
+            px, py = projectile.x, projectile.y
+            for enemy in enemies:
+                dx = enemy.x - px
+                dy = enemy.y - py
+                if dx * dx + dy * dy <= radius_sq:
+                    self.hits += 1
+                    break
+
+    def hud(self):
+        self.ui.update(self.player, self.wave_manager)
+        self.ui.draw(self.screen)
+
+    def frame(self):
+        self.targeting()
+        self.projectile_update()
+        self.collision()
+        self.tile_draw()
+        self.hud()
+
+    def stage(self, name: str) -> Callable[[], None]:
+        return getattr(self, name)
+
+def measure_peak_memory(spec: tuple) -> int:
+    """Peak traced allocation while building a scenario and running one tick of every stage."""
+    tracemalloc.start()
+    try:
+        scenario = LevelScenario(*spec)
+        for stage in STAGES:
+            scenario.stage(stage)()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_scenario(name: str, min_ticks: int, seconds: float) -> dict:
+    """Time every stage of one scenario."""
+    spec = SCENARIOS[name]
+    width, height, towers, enemies, projectiles = spec
+    scenario = LevelScenario(*spec)
+
+    result = {
+        'map': [width, height],
+        'counts': {'towers': towers, 'enemies': enemies, 'projectiles': projectiles},
+        'peak_memory_bytes': measure_peak_memory(spec),
+        'stages': {},
+    }
+    for stage in STAGES:
+        tick = scenario.stage(stage)
+        tick()  # warm up
+        result['stages'][stage] = summarize(time_ticks(tick, min_ticks, seconds))
+    return result
+
+def print_table(scenarios: Dict[str, dict]):
+    print(f"{'scenario':<10} {'stage':<18} {'ticks/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, result in scenarios.items():
+        for stage, stats in result['stages'].items():
+            print(f"{name:<10} {stage:<18} {stats['ticks_per_s']:>12.1f} {stats['p50_ms']:>9.3f} "
+                  f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time level stages on synthetic maps of growing size")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help="scenario to run (repeatable, default all)")
+    parser.add_argument('--seconds', type=float, default=1.0, help="time budget per stage")
+    parser.add_argument('--min-ticks', type=int, default=5, help="minimum timed ticks per stage")
+    parser.add_argument('--runs', type=int, default=3,
+                        help="full runs of the suite, so comparisons can tell drift from noise")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'level_stress.json'),
+                        help="result file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+
+    # Every scenario once per run, so slow drift of the machine spreads over all of them
+    runs = []
+    for run in range(args.runs):
+        scenarios = {}
+        for name in args.scenario or list(SCENARIOS):
+            print(f"Run {run + 1}/{args.runs}: scenario {name}...", file=sys.stderr)
+            scenarios[name] = run_scenario(name, args.min_ticks, args.seconds)
+        runs.append(scenarios)
+
+    results = make_results('level_stress', runs)
+    if args.output == '-':
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    else:
+        print_table(runs[-1])
+        write_results(results, args.output)
+
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
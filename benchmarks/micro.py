@@ -0,0 +1,165 @@
+"""
+Micro-benchmarks for loaders and deck operations.
+
+Each benchmark is a no-argument callable timed with warmup and repeated
+measurement (see harness.run_benchmark), in each of several runs of the
+whole suite. Results are written as JSON with sorted keys, one entry per
+benchmark and run, with the commit they were measured at, so files from
+two commits can be diffed directly or checked against the stored baseline
+with benchmarks.compare.
+
+Usage (from the directory that contains the package):
+    python -m <package>.benchmarks.micro [--filter TEXT] [--repeats 20] [--warmup 3]
+        [--runs 3] [--output PATH]
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import contextlib
+import itertools
+import shutil
+import sys
+import tempfile
+from typing import Callable, Dict
+import pygame
+from ..engine.deck_system import Card, Deck
+from ..engine.map_loader import MapLoader
+from ..settings import COLORS
+from ..utils.resource_loader import ResourceLoader, ensure_mixer
+from .harness import RESULTS_DIR, make_results, run_benchmark, write_results
+from .level_stress import make_tile_map
+
+FALLBACK_SHAPE_NAMES = ('rect', 'circle', 'triangle', 'diamond', 'hexagon')
+MAP_SIZES = ((100, 100), (500, 500))
+DECK_SIZE = 40
+
+def _image_benchmarks(work_dir: str) -> Dict[str, Callable[[], None]]:
+    image_path = os.path.join(work_dir, 'sprite.png')
+    sprite = pygame.Surface((64, 64), pygame.SRCALPHA)
+    sprite.fill((200, 80, 40, 255))
+    pygame.image.save(sprite, image_path)
+    missing_path = os.path.join(work_dir, 'missing.png')
+
+    loader = ResourceLoader()
+    # Time decoding, not disk cache reads, and leave the user's cache directory alone
+    loader._surface_cache = None
+    loader.load_image(image_path)
+
+    def load_image_hit():
+        loader.load_image(image_path)
+
+    def load_image_miss():
+        # Memory cache miss: decoded again
+        loader.invalidate(image_path)
+        loader.load_image(image_path)
+
+    def load_image_fallback_miss():
+        loader.invalidate(missing_path)
+        loader.load_image(missing_path, fallback_shape='circle')
+
+    return {
+        'resource_loader.load_image_hit': load_image_hit,
+        'resource_loader.load_image_miss': load_image_miss,
+        'resource_loader.load_image_fallback_miss': load_image_fallback_miss,
+    }
+
+def _fallback_benchmarks() -> Dict[str, Callable[[], None]]:
+    loader = ResourceLoader()
+    benchmarks = {}
+    for shape in FALLBACK_SHAPE_NAMES:
+        benchmarks[f'resource_loader.fallback_shape.{shape}'] = (
+            lambda shape=shape: loader._create_fallback_shape(shape, (32, 32), COLORS['GREEN'])
+        )
+
+    ensure_mixer()
+    frequencies = itertools.cycle(range(200, 1200))
+    benchmarks['resource_loader.fallback_tone_cached'] = lambda: loader._create_fallback_tone(0.1, 440)
+    # More distinct frequencies than the synth cache holds, so every call renders
+    benchmarks['resource_loader.fallback_tone_uncached'] = (
+        lambda: loader._create_fallback_tone(0.1, next(frequencies))
+    )
+    return benchmarks
+
+def _map_benchmarks(work_dir: str) -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    for width, height in MAP_SIZES:
+        tile_map = make_tile_map(width, height)
+        json_path = os.path.join(work_dir, f'map_{width}x{height}.json')
+        pack_path = os.path.join(work_dir, f'map_{width}x{height}.pack')
+        MapLoader.save_map(tile_map, json_path)
+        MapLoader.save_map(tile_map, pack_path)
+
+        benchmarks[f'map_loader.load_map_json.{width}x{height}'] = lambda path=json_path: MapLoader.load_map(path)
+        benchmarks[f'map_loader.load_map_pack.{width}x{height}'] = lambda path=pack_path: MapLoader.load_map(path)
+    return benchmarks
+
+def _deck_benchmarks() -> Dict[str, Callable[[], None]]:
+    # Deck and Card are still stubs, so these time the current API calls
+    cards = [Card(f"card_{i}", f"Card {i}", i % 5, 'tower', "") for i in range(DECK_SIZE)]
+    deck = Deck(list(cards))
+
+    def shuffle():
+        deck.shuffle()
+
+    def draw_hand():
+        for _ in range(5):
+            deck.draw_card()
+        deck.reshuffle_from_discard()
+
+    return {
+        'deck.shuffle': shuffle,
+        'deck.draw_hand': draw_hand,
+    }
+
+def collect_benchmarks(work_dir: str) -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    benchmarks.update(_image_benchmarks(work_dir))
+    benchmarks.update(_fallback_benchmarks())
+    benchmarks.update(_map_benchmarks(work_dir))
+    benchmarks.update(_deck_benchmarks())
+    return benchmarks
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run loader and deck micro-benchmarks")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--repeats', type=int, default=20, help="timed repeats per benchmark")
+    parser.add_argument('--warmup', type=int, default=3, help="untimed repeats per benchmark")
+    parser.add_argument('--runs', type=int, default=3,
+                        help="full runs of the suite, so comparisons can tell drift from noise")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'micro.json'), help="result file")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+    work_dir = tempfile.mkdtemp(prefix='micro-bench-')
+
+    runs = []
+    try:
+        # Loaders log every load; keep that out of the terminal but inside the timing
+        with open(os.devnull, 'w') as devnull:
+            with contextlib.redirect_stdout(devnull):
+                benchmarks = collect_benchmarks(work_dir)
+            for run in range(args.runs):
+                print(f"Run {run + 1}/{args.runs}", file=sys.stderr)
+                results = {}
+                for name, func in benchmarks.items():
+                    if args.filter not in name:
+                        continue
+                    with contextlib.redirect_stdout(devnull):
+                        results[name] = run_benchmark(func, repeats=args.repeats, warmup=args.warmup)
+                    stats = results[name]
+                    print(f"{name:<48} {stats['mean_us']:>12.2f} us  ±{stats['stdev_us']:>9.2f}  "
+                          f"{stats['ops_per_s']:>12.1f} ops/s")
+                runs.append(results)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    write_results(make_results('micro', runs), args.output)
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
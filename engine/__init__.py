@@ -7,13 +7,29 @@ logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 # Expose core classes at the package level for convenient imports:
 from .map_loader   import MapLoader, TileMap
+from .level_pack   import LevelPack, LevelPackBuilder, compile_data
 from .deck_system  import Deck, Hand, Card
 from .tower_defense import TowerManager, WaveManager, ProjectileManager
 from .entity_manager import EntityManager
+from .voice_manager import VoiceManager
+from .music_player import MusicPlayer
+from .level_preloader import LevelPreloader, PreparedLevel, prepare_level
+from .hot_reload import HotReloader
+from .frame_profiler import FrameProfiler, get_profiler
+from .metrics_sink import MetricsSink
+from .memory_profiler import MemoryProfiler
+from .gc_manager import GCManager
+from .input_latency import InputLatencyTracker
+from .quality_governor import QualityGovernor, get_quality_governor
+from .particle_system import ParticleSystem
+from .input_replay import InputRecorder, InputReplayer, seed_random, get_rng
 
 __all__ = [
     "MapLoader",
     "TileMap",
+    "LevelPack",
+    "LevelPackBuilder",
+    "compile_data",
     "Deck",
     "Hand",
     "Card",
@@ -21,4 +37,23 @@ __all__ = [
     "WaveManager",
     "ProjectileManager",
     "EntityManager",
+    "VoiceManager",
+    "MusicPlayer",
+    "LevelPreloader",
+    "PreparedLevel",
+    "prepare_level",
+    "HotReloader",
+    "FrameProfiler",
+    "get_profiler",
+    "MetricsSink",
+    "MemoryProfiler",
+    "GCManager",
+    "InputLatencyTracker",
+    "QualityGovernor",
+    "get_quality_governor",
+    "ParticleSystem",
+    "InputRecorder",
+    "InputReplayer",
+    "seed_random",
+    "get_rng",
 ]
@@ -0,0 +1,227 @@
+from array import array
+from contextlib import nullcontext
+from ..imports import *
+from ..settings import FPS, PROFILER_SETTINGS
+
+# Shared do-nothing context returned by scope() while profiling is off
+_NULL_SCOPE = nullcontext()
+
+# Graph colors, assigned to top-level scopes in order of first use
+SCOPE_COLORS = [
+    (80, 160, 255), (255, 170, 60), (120, 220, 120), (230, 90, 200),
+    (240, 230, 90), (90, 220, 220), (200, 120, 90), (160, 160, 160),
+]
+
+class _Scope:
+    """Times one named section with perf_counter_ns and adds it to the current frame."""
+
+    __slots__ = ('profiler', 'index', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', index: int):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._frame_ns[self.index] += time.perf_counter_ns() - self.start
+        return False
+
+class FrameProfiler:
+    """
+    Per-subsystem frame timing.
+    Code is wrapped in named scopes (`with profiler.scope('update'):`); the
+    total time of each scope per frame goes into a fixed-size ring buffer.
+    Names with a '/' are children of the scope named by their prefix (e.g.
+    'update/player' inside 'update') and are listed but not stacked in the
+    graph, so nothing is counted twice. While disabled, scope() returns a shared
+    no-op context and begin/end_frame return immediately.
+    """
+
+    def __init__(self, history: int = PROFILER_SETTINGS['history_frames']):
+        self.history = history
+        self.enabled = False
+        self._enable_next_frame = PROFILER_SETTINGS['enabled']
+
+        # Scope name -> index into the per-scope lists below
+        self._indices: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._scopes: List[_Scope] = []
+        self._frame_ns: List[int] = []  # accumulated time of each scope this frame
+        self._rings: List[array] = []  # per scope, nanoseconds per frame
+
+        self._frame_ring = array('q', [0] * history)  # whole frame time
+        self._frame_start = 0
+        self._cursor = 0
+        self.frames = 0  # frames recorded, at most history are kept
+
+    def toggle(self):
+        """Turn profiling on or off, starting with the next frame."""
+        self._enable_next_frame = not self._enable_next_frame
+
+    def scope(self, name: str):
+        """Context manager timing a section of the current frame."""
+        if not self.enabled:
+            return _NULL_SCOPE
+
+        index = self._indices.get(name)
+        if index is None:
+            index = self._add_scope(name)
+        return self._scopes[index]
+
+    def add_time(self, name: str, elapsed_ns: int):
+        """Add time measured outside a scope (e.g. in a callback) to the current frame."""
+        if not self.enabled:
+            return
+
+        index = self._indices.get(name)
+        if index is None:
+            index = self._add_scope(name)
+        self._frame_ns[index] += elapsed_ns
+
+    def begin_frame(self):
+        """Start timing a frame. Call at the top of the game loop."""
+        if self._enable_next_frame != self.enabled:
+            self.enabled = self._enable_next_frame
+            self.reset()
+        if not self.enabled:
+            return
+
+        for index in range(len(self._frame_ns)):
+            self._frame_ns[index] = 0
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Store this frame's timings. Call before waiting for the next frame."""
+        if not self.enabled:
+            return
+
+        cursor = self._cursor
+        self._frame_ring[cursor] = time.perf_counter_ns() - self._frame_start
+        for ring, elapsed in zip(self._rings, self._frame_ns):
+            ring[cursor] = elapsed
+
+        self._cursor = (cursor + 1) % self.history
+        self.frames += 1
+
+    def reset(self):
+        """Forget recorded frames, keeping known scope names."""
+        self._frame_ring = array('q', [0] * self.history)
+        self._rings = [array('q', [0] * self.history) for _ in self._names]
+        self._cursor = 0
+        self.frames = 0
+
+    def percentiles(self, name: Optional[str] = None) -> Dict[str, float]:
+        """
+        Get timing percentiles over the recorded frames.
+
+        Args:
+            name: Scope name, or None for the whole frame
+
+        Returns:
+            Dictionary with p50, p95 and p99 in milliseconds
+        """
+        count = min(self.frames, self.history)
+        if name is None:
+            ring = self._frame_ring
+        elif name in self._indices:
+            ring = self._rings[self._indices[name]]
+        else:
+            count = 0
+
+        if count == 0:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+
+        samples = sorted(ring[:count] if count < self.history else ring)
+        return {f"p{p}": samples[min(count - 1, count * p // 100)] / 1e6 for p in (50, 95, 99)}
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles for the whole frame ('frame') and every scope."""
+        stats = {'frame': self.percentiles()}
+        for name in self._names:
+            stats[name] = self.percentiles(name)
+        return stats
+
+    def draw(self, surface: pygame.Surface, font: pygame.font.Font,
+             pos: Optional[tuple] = None):
+        """
+        Draw the stacked frame-time graph with a percentile legend.
+
+        Args:
+            surface: Target surface
+            font: Font for the legend
+            pos: Top-left corner, defaults to the bottom-right of the surface
+        """
+        if not self.enabled:
+            return
+
+        height = PROFILER_SETTINGS['graph_height']
+        scale = height / PROFILER_SETTINGS['graph_scale_ms']  # pixels per millisecond
+        width = self.history
+        if pos is None:
+            pos = (surface.get_width() - width - 10, surface.get_height() - height - 10)
+        x0, y0 = pos
+        bottom = y0 + height
+
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 160))
+        surface.blit(background, pos)
+
+        # Frame budget line
+        budget_y = bottom - int(1000.0 / FPS * scale)
+        if budget_y > y0:
+            pygame.draw.line(surface, (255, 60, 60), (x0, budget_y), (x0 + width - 1, budget_y))
+
+        top_level = [index for index, name in enumerate(self._names) if '/' not in name]
+        colors = {index: SCOPE_COLORS[i % len(SCOPE_COLORS)] for i, index in enumerate(top_level)}
+        count = min(self.frames, self.history)
+
+        # Oldest frame on the left, newest on the right
+        for column in range(count):
+            frame = (self._cursor - count + column) % self.history
+            x = x0 + width - count + column
+            y = bottom
+            for index in top_level:
+                bar = self._rings[index][frame] / 1e6 * scale
+                if bar < 0.5:
+                    continue
+                top = max(y0, y - bar)
+                pygame.draw.line(surface, colors[index], (x, y - 1), (x, top))
+                y = top
+                if y <= y0:
+                    break
+
+        # Legend above the graph: frame and per-scope percentiles, children in their parent's color
+        lines = [("frame", (255, 255, 255), self.percentiles())]
+        for name in self._names:
+            parent = self._indices.get(name.split('/', 1)[0])
+            lines.append((name, colors.get(parent, (200, 200, 200)), self.percentiles(name)))
+
+        texts = [font.render(f"{name:<16} p50 {p['p50']:5.2f}  p95 {p['p95']:5.2f}  p99 {p['p99']:5.2f} ms",
+                             True, color) for name, color, p in lines]
+        x = min(x0, surface.get_width() - max(text.get_width() for text in texts) - 10)
+        y = y0 - font.get_linesize() * len(texts) - 4
+        for text in texts:
+            surface.blit(text, (x, y))
+            y += font.get_linesize()
+
+    def _add_scope(self, name: str) -> int:
+        index = len(self._names)
+        self._indices[name] = index
+        self._names.append(name)
+        self._scopes.append(_Scope(self, index))
+        self._frame_ns.append(0)
+        self._rings.append(array('q', [0] * self.history))
+        return index
+
+_profiler: Optional[FrameProfiler] = None
+
+def get_profiler() -> FrameProfiler:
+    """Get the global frame profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+    return _profiler
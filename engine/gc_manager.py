@@ -0,0 +1,130 @@
+import gc
+import threading
+from ..imports import *
+from ..settings import GameState, GC_SETTINGS
+from .frame_profiler import FrameProfiler, get_profiler
+
+# States whose data is frozen once loaded
+FREEZE_STATES = (GameState.LEVEL,)
+
+# Generation-2 threshold while full collections are deferred; high enough that
+# the collector never starts one on its own
+_DEFERRED_THRESHOLD = 1 << 30
+
+class GCManager:
+    """
+    Schedules garbage collection around game state transitions and waves.
+
+    After a level is entered, everything alive (map, managers, deck, cached
+    assets, card registries) is collected once and moved to the permanent
+    generation with gc.freeze(), so later collections no longer scan it.
+    While a wave is active, automatic generation-2 collections are turned
+    off; a pending one runs when the wave ends, in the time_between_waves gap,
+    or anyway once max_deferred generation-1 collections have piled up.
+    Leaving the level unfreezes and collects, during the transition.
+
+    Every collection's pause is counted per generation. Pauses on the main
+    thread are also added to the frame profiler as 'gc/gen<N>', and long ones
+    are printed; collections triggered by worker threads (asset and level
+    preloading) only update the counters, since the profiler is not thread-safe.
+    """
+
+    def __init__(self, profiler: Optional[FrameProfiler] = None,
+                 freeze_after_load: bool = GC_SETTINGS['freeze_after_load'],
+                 defer_full_collections: bool = GC_SETTINGS['defer_full_collections'],
+                 max_deferred: int = GC_SETTINGS['max_deferred'],
+                 log_pause_ms: float = GC_SETTINGS['log_pause_ms']):
+        self.profiler = profiler or get_profiler()
+        self.freeze_after_load = freeze_after_load
+        self.defer_full_collections = defer_full_collections
+        self.max_deferred = max_deferred
+        self.log_pause_ns = int(log_pause_ms * 1e6)
+
+        self._thresholds = gc.get_threshold()
+        self.wave_active = False
+        self.frozen = False
+
+        # Pause statistics per generation
+        self.collections = [0, 0, 0]
+        self.total_pause_ns = [0, 0, 0]
+        self.max_pause_ns = [0, 0, 0]
+
+        self._start_ns = 0
+        gc.callbacks.append(self._on_gc)
+
+    def on_enter(self, state):
+        """Freeze what a level loaded. Call after the state's on_enter()."""
+        if state in FREEZE_STATES and self.freeze_after_load:
+            self.collect("level loaded")
+            gc.freeze()
+            self.frozen = True
+            print(f"GC: froze {gc.get_freeze_count()} objects after entering {state}")
+
+    def on_exit(self, state):
+        """Let a level's objects be collected again. Call after the state's on_exit()."""
+        self.set_wave_active(False)
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+            self.collect(f"left {state}")
+
+    def set_wave_active(self, active: bool):
+        """
+        Track whether a wave is running. Call every frame from the level.
+        Ending a wave runs any generation-2 collection deferred during it.
+        """
+        if active == self.wave_active:
+            if active and gc.get_count()[2] >= self.max_deferred:
+                self.collect("deferred too long")
+            return
+
+        self.wave_active = active
+        if active and self.defer_full_collections:
+            threshold0, threshold1, _ = self._thresholds
+            gc.set_threshold(threshold0, threshold1, _DEFERRED_THRESHOLD)
+        else:
+            gc.set_threshold(*self._thresholds)
+            if gc.get_count()[2] >= self._thresholds[2]:
+                self.collect("between waves")
+
+    def collect(self, reason: str) -> int:
+        """Run a full collection now; its pause is reported like any other."""
+        collected = gc.collect()
+        print(f"GC: full collection ({reason}), {collected} objects freed")
+        return collected
+
+    def get_stats(self) -> Dict[str, list]:
+        """Collections, total and longest pause in milliseconds per generation."""
+        return {
+            'collections': list(self.collections),
+            'total_pause_ms': [ns / 1e6 for ns in self.total_pause_ns],
+            'max_pause_ms': [ns / 1e6 for ns in self.max_pause_ns],
+        }
+
+    def shutdown(self):
+        """Restore the collector's defaults and stop reporting."""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        gc.set_threshold(*self._thresholds)
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == 'start':
+            self._start_ns = time.perf_counter_ns()
+            return
+
+        elapsed = time.perf_counter_ns() - self._start_ns
+        generation = info['generation']
+        self.collections[generation] += 1
+        self.total_pause_ns[generation] += elapsed
+        if elapsed > self.max_pause_ns[generation]:
+            self.max_pause_ns[generation] = elapsed
+
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self.profiler.add_time(f'gc/gen{generation}', elapsed)
+        if elapsed >= self.log_pause_ns:
+            print(f"GC: gen{generation} pause {elapsed / 1e6:.1f} ms, "
+                  f"{info['collected']} collected{' during a wave' if self.wave_active else ''}")
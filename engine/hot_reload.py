@@ -0,0 +1,51 @@
+import os
+from ..imports import *
+from ..settings import ASSET_PATHS, DATA_PATHS
+from ..utils.file_watcher import FileWatcher
+from ..utils.resource_loader import ResourceLoader
+
+class HotReloader:
+    """
+    Applies edits to maps, cards and asset files while the game runs.
+    Changed assets are invalidated in the ResourceLoader only for that file.
+    Changed data also drops prepared levels that used it and is passed to
+    the current state's on_data_reloaded(data_type, path), which restarts
+    the level on the new map or replaces the Deck. Compiled data pack entries go stale on their
+    own, since the pack records each source file's modification time.
+    """
+
+    def __init__(self, state_manager, loader: ResourceLoader, level_preloader=None,
+                 watcher: Optional[FileWatcher] = None):
+        self.state_manager = state_manager
+        self.loader = loader
+        self.level_preloader = level_preloader
+        self.watcher = watcher or FileWatcher()
+
+        for data_type in ('maps', 'cards'):
+            self.watcher.watch(DATA_PATHS[data_type],
+                               lambda path, data_type=data_type: self._on_data_changed(data_type, path),
+                               extensions=('.json',))
+        for asset_type in ('images', 'sounds', 'fonts'):
+            self.watcher.watch(ASSET_PATHS[asset_type], self._on_asset_changed)
+
+    def poll(self) -> int:
+        """Check a batch of watched files and apply changes. Call once per frame."""
+        return self.watcher.poll()
+
+    def _on_asset_changed(self, path: str):
+        self.loader.invalidate(path)
+
+    def _on_data_changed(self, data_type: str, path: str):
+        print(f"Data changed: {path}")
+        self.loader.invalidate(path)
+
+        if self.level_preloader:
+            if data_type == 'maps':
+                self.level_preloader.discard(os.path.splitext(os.path.basename(path))[0])
+            else:
+                # Every level shares the deck
+                self.level_preloader.discard_all()
+
+        state = self.state_manager.states.get(self.state_manager.current_state)
+        if hasattr(state, 'on_data_reloaded'):
+            state.on_data_reloaded(data_type, path)
@@ -0,0 +1,169 @@
+from array import array
+from ..imports import *
+from ..settings import FPS, LATENCY_SETTINGS
+
+# Discrete inputs whose effect a player waits for; mouse motion is left out,
+# since dozens of motion events per frame would swamp the histograms
+MEASURED_EVENT_TYPES = (
+    pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+)
+
+# Upper bucket edges of the latency histograms in milliseconds; one more bucket holds the rest
+HISTOGRAM_EDGES_MS = (2, 4, 8, 12, 16, 20, 25, 33, 50, 67, 100)
+
+class _StateLatency:
+    """Latency samples of one game state, from event arrival to render and to flip."""
+
+    __slots__ = ('count', 'render_ring', 'display_ring', 'histogram', 'cursor')
+
+    def __init__(self, history: int):
+        self.count = 0
+        self.render_ring = array('d', [0.0] * history)
+        self.display_ring = array('d', [0.0] * history)
+        self.histogram = [0] * (len(HISTOGRAM_EDGES_MS) + 1)  # of display latency
+        self.cursor = 0
+
+    def add(self, render_ms: float, display_ms: float):
+        self.render_ring[self.cursor] = render_ms
+        self.display_ring[self.cursor] = display_ms
+        self.cursor = (self.cursor + 1) % len(self.render_ring)
+        self.count += 1
+
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES_MS) and display_ms > HISTOGRAM_EDGES_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+class InputLatencyTracker:
+    """
+    Measures input-to-display latency and paces frames in place of Clock.tick().
+
+    Instead of one long sleep, wait() sleeps in slices of poll_slice_ms and
+    fetches events after each; the game loop also calls poll() after update,
+    and mark_rendered() polls right before the flip. An event is stamped when
+    the next of these polls runs, so its display latency is under-reported
+    by at most the longest gap between polls: a sleep slice, the update, the
+    draw, or the flip plus the bookkeeping after it. For each measured event
+    handled in a frame, the time from arrival until that frame finished
+    drawing (render) and until flip() returned (display) is recorded for the
+    current game state.
+
+    In late-latch mode, wait() also moves the input poll as late as the frame
+    allows: frames keep a fixed flip cadence, and the wait ends the expected
+    frame work (the slowest of the recent frames) plus latch_margin_ms before
+    the next flip is due, instead of right after the previous flip. Input
+    that arrives while waiting is handled in the frame it will be displayed
+    in. The gain shows when flip() waits for vertical sync.
+    """
+
+    def __init__(self, late_latch: bool = LATENCY_SETTINGS['late_latch'], fps: int = FPS,
+                 history: int = LATENCY_SETTINGS['history']):
+        self.late_latch = late_latch
+        self.period = 1.0 / fps
+        self.history = history
+        self.poll_slice = LATENCY_SETTINGS['poll_slice_ms'] / 1000.0
+        self.latch_margin = LATENCY_SETTINGS['latch_margin_ms'] / 1000.0
+
+        self.states: Dict[object, _StateLatency] = {}
+        self._pending: List[tuple] = []  # (arrival time, event) fetched while waiting
+        self._frame_events: List[float] = []  # arrival times of measured events this frame
+        self._rendered = 0.0
+
+        now = time.perf_counter()
+        self._wake = now  # when the current frame polled its input
+        self._flip_target = now + self.period
+        self._work = array('d', [0.0] * LATENCY_SETTINGS['work_history_frames'])
+        self._work_cursor = 0
+
+    def get_events(self) -> list:
+        """Fetch this frame's events (replaces pygame.event.get())."""
+        now = time.perf_counter()
+        self._wake = now
+        self._stamp(pygame.event.get(), now)
+
+        events = [event for _, event in self._pending]
+        self._frame_events = [arrival for arrival, event in self._pending
+                              if event.type in MEASURED_EVENT_TYPES]
+        self._pending.clear()
+        return events
+
+    def poll(self):
+        """Stamp events that arrived since the last poll; they are handled next frame."""
+        self._stamp(pygame.event.get(), time.perf_counter())
+
+    def mark_rendered(self):
+        """The frame is drawn; call right before flip()."""
+        self._rendered = time.perf_counter()
+        self.poll()
+
+    def mark_flipped(self, state):
+        """
+        The frame is on screen; call right after flip().
+
+        Args:
+            state: Game state that handled this frame's input
+        """
+        flipped = time.perf_counter()
+        # Work ends before flip, which may be waiting for vertical sync
+        self._work[self._work_cursor] = self._rendered - self._wake
+        self._work_cursor = (self._work_cursor + 1) % len(self._work)
+        if not self._frame_events:
+            return
+
+        latency = self.states.get(state)
+        if latency is None:
+            latency = self.states[state] = _StateLatency(self.history)
+        for arrival in self._frame_events:
+            latency.add((self._rendered - arrival) * 1000.0, (flipped - arrival) * 1000.0)
+
+    def wait(self):
+        """Sleep until the next frame should poll input, fetching events meanwhile."""
+        now = time.perf_counter()
+        if self.late_latch:
+            self._flip_target += self.period
+            if self._flip_target < now:
+                self._flip_target = now + self.period  # fell behind, start a new cadence
+            wake = self._flip_target - max(self._work) - self.latch_margin
+        else:
+            wake = self._wake + self.period
+
+        while now < wake:
+            time.sleep(min(self.poll_slice, wake - now))
+            self.poll()
+            now = time.perf_counter()
+
+    def percentiles(self, state) -> Dict[str, float]:
+        """
+        Get latency percentiles of a state's recent input.
+
+        Returns:
+            Dictionary with count and render/display p50, p95 and p99 in milliseconds
+        """
+        latency = self.states.get(state)
+        if latency is None or latency.count == 0:
+            return {'count': 0}
+
+        count = min(latency.count, self.history)
+        stats = {'count': latency.count}
+        for name, ring in (('render', latency.render_ring), ('display', latency.display_ring)):
+            samples = sorted(ring[:count])
+            for p in (50, 95, 99):
+                stats[f'{name}_p{p}'] = samples[min(count - 1, count * p // 100)]
+        return stats
+
+    def print_report(self):
+        """Print percentiles and the display latency histogram of every state."""
+        mode = "late latch" if self.late_latch else "normal"
+        print(f"Input latency ({mode} pacing):")
+        labels = [f"<={edge}" for edge in HISTOGRAM_EDGES_MS] + [f">{HISTOGRAM_EDGES_MS[-1]}"]
+        for state, latency in self.states.items():
+            stats = self.percentiles(state)
+            print(f"  {state}: {stats['count']} inputs, display p50 {stats['display_p50']:.1f} "
+                  f"p95 {stats['display_p95']:.1f} p99 {stats['display_p99']:.1f} ms, "
+                  f"render p50 {stats['render_p50']:.1f} ms")
+            print("    " + "  ".join(f"{label}: {count}" for label, count in zip(labels, latency.histogram)
+                                     if count))
+
+    def _stamp(self, events: list, now: float):
+        for event in events:
+            self._pending.append((now, event))
@@ -0,0 +1,189 @@
+import gzip
+import os
+import random
+from ..imports import *
+from ..settings import FPS, REPLAY_SETTINGS
+
+# Bump when the replay file layout changes
+REPLAY_FORMAT_VERSION = 2
+
+# Older layouts the replayer still reads (version 1 has no quality levels)
+READABLE_FORMAT_VERSIONS = (1, REPLAY_FORMAT_VERSION)
+
+# Input events that are recorded; everything else (window, audio, timers)
+# is produced by the game or the OS and would be regenerated on replay
+RECORDED_EVENT_TYPES = (
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+)
+
+# Event attributes stored as lists in the file and rebuilt as tuples
+_TUPLE_ATTRIBUTES = ('pos', 'rel', 'buttons')
+
+_seed: Optional[int] = None
+_rngs: Dict[str, random.Random] = {}
+
+def seed_random(seed: Optional[int] = None) -> int:
+    """
+    Seed all game randomness for this session.
+    Seeds the random module and resets the named generators from get_rng().
+
+    Args:
+        seed: Master seed, or None to pick one
+
+    Returns:
+        The master seed in use
+    """
+    global _seed
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    _seed = seed
+    random.seed(seed)
+    _rngs.clear()
+    print(f"Random seed: {seed}")
+    return seed
+
+def get_rng(name: str) -> random.Random:
+    """
+    Get the generator for one subsystem (e.g. 'deck', 'spawns').
+    Each is derived from the master seed and its name, so a subsystem drawing
+    more or fewer numbers does not shift the sequence seen by the others.
+    """
+    rng = _rngs.get(name)
+    if rng is None:
+        if _seed is None:
+            seed_random()
+        rng = _rngs[name] = random.Random(f"{_seed}:{name}")
+    return rng
+
+def encode_event(event: pygame.event.Event) -> list:
+    """Convert an input event to [type, attributes] with JSON values."""
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        elif not isinstance(value, (bool, int, float, str, type(None))):
+            continue  # e.g. window handles
+        attributes[name] = value
+    return [event.type, attributes]
+
+def decode_event(data: list) -> pygame.event.Event:
+    event_type, attributes = data
+    for name in _TUPLE_ATTRIBUTES:
+        if name in attributes:
+            attributes[name] = tuple(attributes[name])
+    return pygame.event.Event(event_type, attributes)
+
+class InputRecorder:
+    """
+    Records the input of a session so it can be replayed exactly.
+
+    The file is gzip-compressed JSON lines: a header with the format version,
+    master seed, pygame version and starting quality level, then one line per
+    simulation tick, [dt_us] or [dt_us, [[event type, attributes], ...]], so
+    line n + 1 is tick n. A tick where the quality level changed has it as a
+    third element, [dt_us, events, level]: the level depends on how fast this
+    machine ran, and a replay must use the same one to emit the same
+    particles. The frame time is stored in whole microseconds and record()
+    returns the rounded value, so the live session simulates with exactly
+    the dt a replay will use.
+    """
+
+    def __init__(self, path: str, seed: int, quality_level: int = 0):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ticks = 0
+        self.quality_level = quality_level
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self._write({
+            'format_version': REPLAY_FORMAT_VERSION,
+            'seed': seed,
+            'fps': FPS,
+            'pygame': pygame.version.ver,
+            'quality_level': quality_level,
+        })
+        print(f"Recording input to {path}")
+
+    def record(self, dt: float, events: list, quality_level: int = 0) -> float:
+        """
+        Record one tick.
+
+        Args:
+            dt: Frame time the simulation is about to use
+            events: Events fetched for this tick
+            quality_level: Quality level the tick runs at
+
+        Returns:
+            dt rounded as stored in the file
+        """
+        dt_us = round(dt * 1e6)
+        recorded = [encode_event(event) for event in events if event.type in RECORDED_EVENT_TYPES]
+        if quality_level != self.quality_level:
+            self.quality_level = quality_level
+            self._write([dt_us, recorded, quality_level])
+        else:
+            self._write([dt_us, recorded] if recorded else [dt_us])
+        self.ticks += 1
+        return dt_us / 1e6
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            print(f"Recorded {self.ticks} ticks to {self.path}")
+
+    def _write(self, value):
+        self.file.write(json.dumps(value, separators=(',', ':')))
+        self.file.write('\n')
+
+class InputReplayer:
+    """
+    Plays back a file written by InputRecorder, one tick per next_tick() call.
+    The game seeds its randomness with the recorded seed and uses the
+    recorded frame times and quality levels, so a replay runs the same
+    simulation at whatever speed the machine allows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = gzip.open(path, 'rt', encoding='utf-8')
+        header = json.loads(self.file.readline())
+        if header.get('format_version') not in READABLE_FORMAT_VERSIONS:
+            self.file.close()
+            raise ValueError(f"{path}: unsupported replay format {header.get('format_version')}")
+        if header.get('pygame') != pygame.version.ver:
+            print(f"Warning: {path} was recorded with pygame {header.get('pygame')}, "
+                  f"event codes may differ")
+
+        self.seed: int = header['seed']
+        self.quality_level: int = header.get('quality_level', 0)  # of the last tick returned
+        self.ticks = 0
+        print(f"Replaying input from {path}")
+
+    def next_tick(self) -> Optional[tuple]:
+        """
+        Get the next recorded tick; its quality level is then in quality_level.
+
+        Returns:
+            (dt, events), or None once the recording has ended
+        """
+        line = self.file.readline() if self.file else ''
+        if not line:
+            self.close()
+            return None
+
+        tick = json.loads(line)
+        events = [decode_event(data) for data in tick[1]] if len(tick) > 1 else []
+        if len(tick) > 2:
+            self.quality_level = tick[2]
+        self.ticks += 1
+        return tick[0] / 1e6, events
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+def default_recording_path() -> str:
+    """Timestamped file in REPLAY_SETTINGS['directory']."""
+    return os.path.join(REPLAY_SETTINGS['directory'], time.strftime('session_%Y%m%d_%H%M%S.replay.gz'))
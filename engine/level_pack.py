@@ -0,0 +1,342 @@
+"""
+Compiled level data pack.
+
+Layout (little endian):
+    header  magic b'RLDP', u16 version, u16 reserved, u32 toc length
+    table of contents, UTF-8 JSON: section -> name -> entry description
+    payload entries
+
+Maps are stored as typed arrays: u8 tiles, u16 coordinates for spawn
+points, tower slots, exits and precomputed enemy paths, and u32 flat slot
+indices. Other data (cards, enemies, towers, levels) is validated JSON
+stored compactly. Every definition is validated when compiling, so the game
+loads the whole pack with one read and no checks.
+
+Build with:
+    python -m <package>.engine.level_pack [output_path]
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+from ..settings import DATA_PATHS, DATA_PACK_PATH
+from .map_loader import MapLoader, TileMap, TILE_PATH, TILE_TOWER_SLOT
+
+PACK_MAGIC = b'RLDP'
+PACK_VERSION = 1
+HEADER_FORMAT = '<4sHHI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAP_HEADER_FORMAT = '<HHHHHH'  # width, height, spawn points, tower slots, exits, paths
+MAP_HEADER_SIZE = struct.calcsize(MAP_HEADER_FORMAT)
+
+# Data directories compiled into the pack besides maps
+DATA_SECTIONS = ('cards', 'enemies', 'towers', 'levels')
+
+def _typed(typecode: str, values) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+def _untyped(typecode: str, buffer, offset: int, count: int):
+    data = array(typecode)
+    data.frombytes(buffer[offset:offset + count * data.itemsize])
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data, offset + count * data.itemsize
+
+def _flatten(points) -> List[int]:
+    return [value for point in points for value in point]
+
+def _pairs(values) -> List[tuple]:
+    return list(zip(values[::2], values[1::2]))
+
+def encode_map(tile_map: TileMap) -> bytes:
+    """Serialize a TileMap, including its paths and slot indices."""
+    parts = [
+        struct.pack(MAP_HEADER_FORMAT, tile_map.width, tile_map.height, len(tile_map.spawn_points),
+                    len(tile_map.tower_slots), len(tile_map.exit_points), len(tile_map.paths)),
+        _typed('B', [tile for row in tile_map.tiles for tile in row]),
+        _typed('H', _flatten(tile_map.spawn_points)),
+        _typed('H', _flatten(tile_map.tower_slots)),
+        _typed('I', tile_map.slot_indices),
+        _typed('H', _flatten(tile_map.exit_points)),
+    ]
+    for path in tile_map.paths:
+        parts.append(_typed('I', [len(path)]))
+        parts.append(_typed('H', _flatten(path)))
+    return b''.join(parts)
+
+def decode_map(buffer) -> TileMap:
+    """Rebuild a TileMap from encode_map() output without recomputing anything."""
+    width, height, spawn_count, slot_count, exit_count, path_count = \
+        struct.unpack_from(MAP_HEADER_FORMAT, buffer)
+    offset = MAP_HEADER_SIZE
+
+    tiles, offset = _untyped('B', buffer, offset, width * height)
+    spawns, offset = _untyped('H', buffer, offset, spawn_count * 2)
+    slots, offset = _untyped('H', buffer, offset, slot_count * 2)
+    slot_indices, offset = _untyped('I', buffer, offset, slot_count)
+    exits, offset = _untyped('H', buffer, offset, exit_count * 2)
+
+    paths = []
+    for _ in range(path_count):
+        (length,), offset = _untyped('I', buffer, offset, 1)
+        path, offset = _untyped('H', buffer, offset, length * 2)
+        paths.append(_pairs(path))
+
+    # Each row is a typed array slice; tiles[y][x] works as with JSON lists
+    rows = [tiles[y * width:(y + 1) * width] for y in range(height)]
+    return TileMap(width, height, rows, _pairs(spawns), _pairs(slots),
+                   exit_points=_pairs(exits), paths=paths, slot_indices=list(slot_indices))
+
+def validate_map(data) -> List[str]:
+    """
+    Check a map definition as found in data/maps.
+
+    Returns:
+        List of problems, empty if the map is valid
+    """
+    if not isinstance(data, dict):
+        return ["map must be an object"]
+    missing = [key for key in ('width', 'height', 'tiles', 'spawn_points', 'tower_slots') if key not in data]
+    if missing:
+        return [f"missing keys: {', '.join(missing)}"]
+
+    width, height, tiles = data['width'], data['height'], data['tiles']
+    if not all(isinstance(v, int) and 0 < v <= 0xFFFF for v in (width, height)):
+        return ["width and height must be integers between 1 and 65535"]
+    if not isinstance(tiles, list) or len(tiles) != height:
+        return [f"tiles must have {height} rows"]
+
+    errors = []
+    for y, row in enumerate(tiles):
+        if not isinstance(row, list) or len(row) != width:
+            errors.append(f"tiles row {y} must have {width} values")
+        elif not all(isinstance(tile, int) and 0 <= tile <= 0xFF for tile in row):
+            errors.append(f"tiles row {y} has values outside 0-255")
+    if errors:
+        return errors
+
+    def points(key) -> List[tuple]:
+        result = []
+        for point in data.get(key, []):
+            if not (isinstance(point, dict) and isinstance(point.get('x'), int) and isinstance(point.get('y'), int)
+                    and 0 <= point['x'] < width and 0 <= point['y'] < height):
+                errors.append(f"{key} entry {point} is not a point inside the map")
+            else:
+                result.append((point['x'], point['y']))
+        return result
+
+    spawn_points = points('spawn_points')
+    tower_slots = points('tower_slots')
+    exit_points = points('exit_points')
+
+    if not data['spawn_points']:
+        errors.append("at least one spawn point is required")
+    for x, y in spawn_points + exit_points:
+        if tiles[y][x] != TILE_PATH:
+            errors.append(f"spawn/exit point {(x, y)} is not on a path tile")
+    for x, y in tower_slots:
+        if tiles[y][x] != TILE_TOWER_SLOT:
+            errors.append(f"tower slot {(x, y)} is not on a tower slot tile")
+    if errors:
+        return errors
+
+    tile_map = TileMap(width, height, tiles, spawn_points, tower_slots, exit_points or None)
+    for spawn, path in zip(spawn_points, tile_map.paths):
+        if not path:
+            errors.append(f"no path from spawn point {spawn} to an exit")
+    return errors
+
+def validate_cards(data) -> List[str]:
+    """Check a card list as found in data/cards."""
+    if not isinstance(data, list):
+        return ["card file must be a list"]
+
+    errors = []
+    seen = set()
+    for index, card in enumerate(data):
+        if not isinstance(card, dict):
+            errors.append(f"card {index} must be an object")
+            continue
+        card_id = card.get('id')
+        if not isinstance(card_id, str) or not card_id:
+            errors.append(f"card {index} needs a string id")
+        elif card_id in seen:
+            errors.append(f"duplicate card id {card_id}")
+        else:
+            seen.add(card_id)
+        if not isinstance(card.get('name'), str):
+            errors.append(f"card {card_id or index} needs a string name")
+        if not isinstance(card.get('cost'), int) or card['cost'] < 0:
+            errors.append(f"card {card_id or index} needs a non-negative integer cost")
+    return errors
+
+class LevelPack:
+    """
+    Compiled level data, read from disk in one go.
+    Entries are decoded on request from the in-memory buffer.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = memoryview(f.read())
+
+        magic, version, _, toc_length = struct.unpack_from(HEADER_FORMAT, self._buffer)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} level pack")
+
+        self._toc: Dict[str, Dict[str, dict]] = json.loads(
+            bytes(self._buffer[HEADER_SIZE:HEADER_SIZE + toc_length]).decode('utf-8')
+        )
+        self._payload_start = HEADER_SIZE + toc_length
+
+    def map_names(self) -> List[str]:
+        return list(self._toc.get('maps', {}))
+
+    def names(self, section: str) -> List[str]:
+        return list(self._toc.get(section, {}))
+
+    def has(self, section: str, name: str) -> bool:
+        return name in self._toc.get(section, {})
+
+    def is_current(self, section: str, name: str, source_path: str) -> bool:
+        """
+        Check that an entry exists and was compiled from the source file as it
+        is now. A pack shipped without its sources counts as current.
+        """
+        entry = self._toc.get(section, {}).get(name)
+        if entry is None:
+            return False
+        try:
+            return os.stat(source_path).st_mtime_ns == entry['source_mtime_ns']
+        except OSError:
+            return True
+
+    def get_map(self, name: str) -> TileMap:
+        """Decode a map into a new TileMap."""
+        return decode_map(self._entry_bytes('maps', name))
+
+    def get_data(self, section: str, name: str):
+        """Decode a JSON entry, e.g. get_data('cards', 'basic_deck')."""
+        return json.loads(bytes(self._entry_bytes(section, name)).decode('utf-8'))
+
+    def _entry_bytes(self, section: str, name: str):
+        entry = self._toc[section][name]
+        start = self._payload_start + entry['offset']
+        return self._buffer[start:start + entry['size']]
+
+class LevelPackBuilder:
+    """Collects maps and data entries and writes them as a level pack."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, tuple]] = {}  # section -> name -> (payload, source mtime)
+
+    def add_map(self, name: str, tile_map: TileMap, source_mtime_ns: Optional[int] = None):
+        self._entries.setdefault('maps', {})[name] = (encode_map(tile_map), source_mtime_ns)
+
+    def add_data(self, section: str, name: str, data, source_mtime_ns: Optional[int] = None):
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self._entries.setdefault(section, {})[name] = (payload, source_mtime_ns)
+
+    def write(self, path: str) -> int:
+        """
+        Write the pack atomically.
+
+        Returns:
+            Number of entries written
+        """
+        toc: Dict[str, Dict[str, dict]] = {}
+        payloads = []
+        offset = 0
+        for section, entries in self._entries.items():
+            for name, (payload, source_mtime_ns) in entries.items():
+                toc.setdefault(section, {})[name] = {
+                    'offset': offset, 'size': len(payload), 'source_mtime_ns': source_mtime_ns,
+                }
+                payloads.append(payload)
+                offset += len(payload)
+
+        toc_bytes = json.dumps(toc, separators=(',', ':')).encode('utf-8')
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(struct.pack(HEADER_FORMAT, PACK_MAGIC, PACK_VERSION, 0, len(toc_bytes)))
+            f.write(toc_bytes)
+            for payload in payloads:
+                f.write(payload)
+        os.replace(temp_path, path)
+
+        return sum(len(entries) for entries in toc.values())
+
+def _json_files(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json'))
+
+def compile_data(output_path: str = DATA_PACK_PATH) -> List[str]:
+    """
+    Validate every JSON definition in DATA_PATHS and write the valid ones to a pack.
+    Invalid files are left out, so the game falls back to loading them directly.
+
+    Returns:
+        List of validation errors, empty if every file compiled
+    """
+    builder = LevelPackBuilder()
+    errors = []
+
+    sources = [('maps', path) for path in _json_files(DATA_PATHS['maps'])]
+    sources += [(section, path) for section in DATA_SECTIONS for path in _json_files(DATA_PATHS[section])]
+
+    for section, path in sources:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            errors.append(f"{path}: {e}")
+            continue
+
+        if section == 'maps':
+            problems = validate_map(data)
+        elif section == 'cards':
+            problems = validate_cards(data)
+        else:
+            problems = [] if isinstance(data, (dict, list)) else ["must be an object or a list"]
+
+        if problems:
+            errors += [f"{path}: {problem}" for problem in problems]
+        elif section == 'maps':
+            builder.add_map(name, MapLoader.from_data(data), mtime_ns)
+        else:
+            builder.add_data(section, name, data, mtime_ns)
+
+    for error in errors:
+        print(f"Invalid data: {error}")
+
+    count = builder.write(output_path)
+    print(f"Wrote {count} data entries to {output_path}")
+    return errors
+
+_level_pack: Optional[LevelPack] = None
+_level_pack_loaded = False
+
+def get_level_pack() -> Optional[LevelPack]:
+    """Get the compiled data pack, loading it on first use. None if there is no pack."""
+    global _level_pack, _level_pack_loaded
+    if not _level_pack_loaded:
+        _level_pack_loaded = True
+        if os.path.exists(DATA_PACK_PATH):
+            try:
+                _level_pack = LevelPack(DATA_PACK_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Failed to load data pack {DATA_PACK_PATH}: {e}")
+    return _level_pack
+
+if __name__ == "__main__":
+    sys.exit(1 if compile_data(sys.argv[1] if len(sys.argv) > 1 else DATA_PACK_PATH) else 0)
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from ..imports import *
+from ..settings import get_data_path
+from ..utils.asset_preloader import AssetManifest
+from .map_loader import MapLoader, TileMap
+from .deck_system import Deck, DeckManager
+from .tower_defense import TowerManager, WaveManager
+from .entity_manager import EntityManager
+from ..actors.player import Player
+
+# Card file every level's deck is built from
+DECK_FILE = 'basic_deck.json'
+
+class PreparedLevel:
+    """
+    Everything LevelScreen needs to start a level, built off the main thread.
+    Holds no pygame surfaces, so it can be created on a worker.
+    """
+
+    def __init__(self, level_id: str, tile_map: TileMap, player: Player,
+                 tower_manager: TowerManager, wave_manager: WaveManager,
+                 entity_manager: EntityManager, deck: Optional[Deck],
+                 manifest: AssetManifest):
+        self.level_id = level_id
+        self.tile_map = tile_map
+        self.player = player
+        self.tower_manager = tower_manager
+        self.wave_manager = wave_manager
+        self.entity_manager = entity_manager
+        self.deck = deck
+        self.manifest = manifest
+
+def prepare_level(level_id: str) -> PreparedLevel:
+    """
+    Load a level's map (from the data pack when compiled), waves, deck and
+    asset manifest and build its managers.
+    Only reads files and creates plain objects, so it is safe on a worker thread.
+
+    Args:
+        level_id: Level name, e.g. "example_level"
+
+    Returns:
+        PreparedLevel ready for LevelScreen.apply_prepared_level()
+    """
+    tile_map = MapLoader.load_level_map(level_id)
+    spawn_x, spawn_y = tile_map.spawn_points[0]
+
+    wave_manager = WaveManager(tile_map)
+    wave_manager.load_wave_data(get_data_path('levels', f"{level_id}.json"))
+
+    return PreparedLevel(
+        level_id=level_id,
+        tile_map=tile_map,
+        player=Player(spawn_x, spawn_y),
+        tower_manager=TowerManager(),
+        wave_manager=wave_manager,
+        entity_manager=EntityManager(),
+        deck=DeckManager.load_deck_from_file(get_data_path('cards', DECK_FILE)),
+        manifest=AssetManifest.for_level(level_id),
+    )
+
+class LevelPreloader:
+    """
+    Prepares levels in the background so entering one does not hitch.
+    request() is cheap enough to call on every hover; each level is prepared
+    at most once and only the most recent few requests are kept. When a level
+    finishes, its asset manifest is handed to the AssetPreloader.
+    """
+
+    def __init__(self, asset_preloader=None, max_prepared: int = 2):
+        self.asset_preloader = asset_preloader
+        self.max_prepared = max_prepared
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # level_id -> Future[PreparedLevel], oldest request first
+        self._futures: 'OrderedDict[str, Future]' = OrderedDict()
+        self._assets_queued = set()
+
+    def request(self, level_id: str):
+        """Start preparing a level if it is not already prepared or in flight."""
+        if level_id in self._futures:
+            self._futures.move_to_end(level_id)
+            return
+
+        if self._executor is None:
+            # One worker: levels are prepared in request order, never in parallel
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preload")
+
+        self._futures[level_id] = self._executor.submit(prepare_level, level_id)
+        while len(self._futures) > self.max_prepared:
+            self.discard(next(iter(self._futures)))
+
+    def update(self):
+        """Queue asset loading for levels that finished preparing. Call once per frame."""
+        for level_id, future in self._futures.items():
+            if level_id in self._assets_queued or not future.done():
+                continue
+            self._assets_queued.add(level_id)
+            if self.asset_preloader and not future.exception():
+                self.asset_preloader.start(future.result().manifest)
+
+    def is_ready(self, level_id: str) -> bool:
+        future = self._futures.get(level_id)
+        return future is not None and future.done()
+
+    def take(self, level_id: str) -> Optional[PreparedLevel]:
+        """
+        Hand over a prepared level, waiting for it if it is still in flight.
+
+        Returns:
+            PreparedLevel, or None if it was never requested or failed to load
+        """
+        future = self._futures.pop(level_id, None)
+        self._assets_queued.discard(level_id)
+        if future is None:
+            return None
+
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Failed to preload level {level_id}: {e}")
+            return None
+
+    def discard(self, level_id: str):
+        """Forget a level, cancelling it if it has not started."""
+        future = self._futures.pop(level_id, None)
+        self._assets_queued.discard(level_id)
+        if future is not None:
+            future.cancel()
+
+    def discard_all(self):
+        """Forget every prepared level, e.g. after shared data changed."""
+        for level_id in list(self._futures):
+            self.discard(level_id)
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker thread."""
+        self.discard_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
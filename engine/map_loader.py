@@ -1,14 +1,34 @@
+from collections import deque
 from ..imports import *
 
+# Tile values
+TILE_GRASS = 0
+TILE_PATH = 1
+TILE_TOWER_SLOT = 2
+
 class TileMap:
-    def __init__(self, width, height, tiles, spawn_points, tower_slots):
+    def __init__(self, width, height, tiles, spawn_points, tower_slots,
+                 exit_points=None, paths=None, slot_indices=None):
         self.width = width
         self.height = height
-        self.tiles = tiles  # 2D list of tile values
+        self.tiles = tiles  # rows of tile values (lists, or typed arrays from a level pack)
         self.spawn_points = spawn_points  # list of (x, y)
         self.tower_slots = tower_slots    # list of (x, y)
         self.tile_size = 64  # pixels per tile (customizable)
 
+        # Enemy routes, one per spawn point; precomputed in level packs
+        if exit_points is None:
+            exit_points = find_exit_points(width, height, tiles, spawn_points)
+        self.exit_points = exit_points
+        if paths is None:
+            paths = [find_path(width, height, tiles, spawn, exit_points) for spawn in spawn_points]
+        self.paths = paths  # list of [(x, y), ...] from spawn to exit
+
+        # Flat tile index (y * width + x) of each tower slot
+        if slot_indices is None:
+            slot_indices = [y * width + x for x, y in tower_slots]
+        self.slot_indices = slot_indices
+
     def draw(self, surface):
         colors = {
             0: (34, 139, 34),  # grass
@@ -22,21 +42,117 @@ class TileMap:
                 pygame.draw.rect(surface, colors.get(tile, (255, 0, 0)), rect)
                 pygame.draw.rect(surface, (0, 0, 0), rect, 1)  # border
 
+def _search_path_tiles(width, height, tiles, start) -> Dict[tuple, tuple]:
+    """Breadth-first search over path tiles. Returns {tile: previous tile} in discovery order."""
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (0 <= nx < width and 0 <= ny < height and (nx, ny) not in previous
+                    and tiles[ny][nx] == TILE_PATH):
+                previous[(nx, ny)] = (x, y)
+                queue.append((nx, ny))
+    return previous
+
+def find_exit_points(width, height, tiles, spawn_points) -> List[tuple]:
+    """
+    Default exits for maps that do not list any: for each spawn point, the
+    path tile on the map border farthest along the path from it.
+    """
+    exits = []
+    for spawn in spawn_points:
+        previous = _search_path_tiles(width, height, tiles, tuple(spawn))
+        # Tiles are discovered in order of distance, so the last border tile is the farthest
+        farthest = None
+        for x, y in previous:
+            if (x, y) != tuple(spawn) and (x in (0, width - 1) or y in (0, height - 1)):
+                farthest = (x, y)
+        if farthest is not None and farthest not in exits:
+            exits.append(farthest)
+    return exits
+
+def find_path(width, height, tiles, spawn, exit_points) -> List[tuple]:
+    """
+    Shortest route along path tiles from a spawn point to the nearest exit.
+
+    Returns:
+        List of (x, y) tiles including both ends, or [] if no exit is reachable
+    """
+    previous = _search_path_tiles(width, height, tiles, tuple(spawn))
+    best: List[tuple] = []
+    for exit_point in exit_points:
+        if tuple(exit_point) in previous:
+            route = _walk_back(previous, tuple(exit_point))
+            if not best or len(route) < len(best):
+                best = route
+    return best
+
+def _walk_back(previous: Dict[tuple, tuple], tile: tuple) -> List[tuple]:
+    route = []
+    while tile is not None:
+        route.append(tile)
+        tile = previous[tile]
+    route.reverse()
+    return route
+
 class MapLoader:
     @staticmethod
     def load_map(path):
+        """Load a map from JSON, or from a level pack for any other extension."""
+        if not path.endswith('.json'):
+            from .level_pack import LevelPack
+            pack = LevelPack(path)
+            return pack.get_map(pack.map_names()[0])
+
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
+        return MapLoader.from_data(data)
 
+    @staticmethod
+    def from_data(data: dict) -> TileMap:
+        """Build a TileMap from a parsed map definition."""
         tiles = data["tiles"]
         width = data["width"]
         height = data["height"]
         spawn_points = [(p["x"], p["y"]) for p in data["spawn_points"]]
         tower_slots  = [(p["x"], p["y"]) for p in data["tower_slots"]]
+        exit_points = [(p["x"], p["y"]) for p in data["exit_points"]] if "exit_points" in data else None
+
+        return TileMap(width, height, tiles, spawn_points, tower_slots, exit_points)
+
+    @staticmethod
+    def load_level_map(level_id: str) -> TileMap:
+        """
+        Load a level's map from the compiled data pack, falling back to
+        data/maps/<level_id>.json if the pack is missing or out of date.
+        """
+        from .level_pack import get_level_pack
+        from ..settings import get_data_path
+
+        path = get_data_path('maps', f"{level_id}.json")
+        pack = get_level_pack()
+        if pack is not None and pack.is_current('maps', level_id, path):
+            return pack.get_map(level_id)
+        return MapLoader.load_map(path)
 
-        return TileMap(width, height, tiles, spawn_points, tower_slots)
-    
     @staticmethod
     def save_map(tile_map: TileMap, file_path: str):
-        """Save map to JSON file"""
-        pass
\ No newline at end of file
+        """Save map to JSON, or to a single-map level pack for any other extension"""
+        if not file_path.endswith('.json'):
+            from .level_pack import LevelPackBuilder
+            builder = LevelPackBuilder()
+            builder.add_map(Path(file_path).stem, tile_map)
+            builder.write(file_path)
+            return
+
+        data = {
+            "width": tile_map.width,
+            "height": tile_map.height,
+            "tiles": [list(row) for row in tile_map.tiles],
+            "spawn_points": [{"x": x, "y": y} for x, y in tile_map.spawn_points],
+            "tower_slots": [{"x": x, "y": y} for x, y in tile_map.tower_slots],
+            "exit_points": [{"x": x, "y": y} for x, y in tile_map.exit_points],
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,173 @@
+import gc
+import tracemalloc
+from collections import deque
+from ..imports import *
+from ..settings import MEMORY_PROFILER_SETTINGS
+from ..utils.resource_loader import ResourceLoader
+from .map_loader import TileMap
+from .deck_system import Deck
+from .tower_defense import TowerManager, WaveManager
+from .entity_manager import EntityManager
+from .level_preloader import PreparedLevel
+
+# Objects whose live instance counts are reported at every transition
+TRACKED_TYPES = (TileMap, Deck, TowerManager, WaveManager, EntityManager, PreparedLevel)
+
+# Allocations made by the profiler itself or by imports are not of interest
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+class _Checkpoint:
+    """Memory state at one state transition."""
+
+    __slots__ = ('snapshot', 'traced', 'caches', 'objects')
+
+    def __init__(self, snapshot: tracemalloc.Snapshot, caches: Dict[str, dict],
+                 objects: Dict[str, int]):
+        self.snapshot = snapshot
+        self.traced = sum(stat.size for stat in snapshot.statistics('filename'))
+        self.caches = caches
+        self.objects = objects
+
+class MemoryProfiler:
+    """
+    Opt-in memory accounting per game state.
+
+    GameStateManager calls on_exit(state) after a state's on_exit and
+    on_enter(state) after the next state's on_enter. Each call takes a
+    tracemalloc snapshot and reports:
+      - on enter: what entering allocated (diff against the previous checkpoint)
+      - on exit: what the visit left resident (diff against the checkpoint
+        taken just before the state was entered)
+    with the top allocation sites, ResourceLoader cache sizes (pygame keeps
+    surface pixels and sound samples outside the Python allocator, so
+    tracemalloc cannot see them) and live counts of TRACKED_TYPES.
+
+    A state that leaves more than leak_threshold_bytes resident on each of
+    leak_visits consecutive visits is reported as a possible leak, with the
+    allocation sites that grew over those visits.
+    """
+
+    def __init__(self, loader: Optional[ResourceLoader] = None,
+                 top: int = MEMORY_PROFILER_SETTINGS['top_sites'],
+                 frames: int = MEMORY_PROFILER_SETTINGS['traceback_frames'],
+                 leak_visits: int = MEMORY_PROFILER_SETTINGS['leak_visits'],
+                 leak_threshold_bytes: int = MEMORY_PROFILER_SETTINGS['leak_threshold_bytes']):
+        """
+        Args:
+            loader: ResourceLoader whose caches are reported
+            top: Allocation sites listed per report
+            frames: Traceback depth recorded per allocation (more is slower)
+            leak_visits: Consecutive growing visits before a leak is reported
+            leak_threshold_bytes: Growth per visit that counts
+        """
+        self.loader = loader
+        self.top = top
+        self.leak_visits = leak_visits
+        self.leak_threshold_bytes = leak_threshold_bytes
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._group_by = 'traceback' if frames > 1 else 'lineno'
+
+        self._last = self._checkpoint()
+        self._before_enter: Dict[object, _Checkpoint] = {}
+        # Per state, (before enter, after exit) checkpoints of its last few visits
+        self._visits: Dict[object, deque] = {}
+        print(f"Memory profiler tracing with {frames} frame(s) per allocation")
+
+    def on_enter(self, state):
+        """
+        Report what entering a state allocated. Call after its on_enter() and
+        before GCManager.on_enter(), whose gc.freeze() hides objects from the count.
+        """
+        before = self._last
+        after = self._last = self._checkpoint()
+        self._before_enter[state] = before
+        self._report(f"Entered {state}", before, after)
+
+    def on_exit(self, state):
+        """
+        Report what a state left resident and check it for leaks. Call after
+        its on_exit() and after GCManager.on_exit() has unfrozen its objects.
+        """
+        after = self._last = self._checkpoint()
+        before = self._before_enter.pop(state, None)
+        if before is None:
+            return
+        self._report(f"Left {state}, still resident since it was entered", before, after)
+
+        visits = self._visits.setdefault(state, deque(maxlen=self.leak_visits))
+        visits.append((before, after))
+        self._check_leak(state, visits)
+
+    def stop(self):
+        """Stop tracing and drop stored snapshots."""
+        self._before_enter.clear()
+        self._visits.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _checkpoint(self) -> _Checkpoint:
+        gc.collect()  # count only what is really still referenced
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+        caches = {}
+        if self.loader:
+            caches = {name: {'entries': stats['entries'], 'bytes': stats['bytes']}
+                      for name, stats in self.loader.get_cache_stats().items()}
+
+        objects = dict.fromkeys((cls.__name__ for cls in TRACKED_TYPES), 0)
+        for obj in gc.get_objects():
+            if isinstance(obj, TRACKED_TYPES):
+                objects[type(obj).__name__] += 1
+        return _Checkpoint(snapshot, caches, objects)
+
+    def _report(self, title: str, before: _Checkpoint, after: _Checkpoint):
+        print(f"[memory] {title}: traced {_format_bytes(after.traced - before.traced, sign=True)} "
+              f"(total {_format_bytes(after.traced)})")
+
+        for name, stats in after.caches.items():
+            previous = before.caches.get(name, {'entries': 0, 'bytes': 0})
+            print(f"[memory]   {name} cache: {stats['entries']} entries, {_format_bytes(stats['bytes'])} "
+                  f"({_format_bytes(stats['bytes'] - previous['bytes'], sign=True)})")
+
+        live = ", ".join(f"{name} {count}" for name, count in after.objects.items() if count)
+        if live:
+            print(f"[memory]   live objects: {live}")
+
+        self._print_sites(after.snapshot.compare_to(before.snapshot, self._group_by))
+
+    def _check_leak(self, state, visits: deque):
+        if len(visits) < self.leak_visits:
+            return
+        retained = [after.traced - before.traced for before, after in visits]
+        if min(retained) <= self.leak_threshold_bytes:
+            return
+
+        print(f"[memory] Possible leak in {state}: memory grew on {self.leak_visits} "
+              f"consecutive visits ({', '.join(_format_bytes(size, sign=True) for size in retained)})")
+        self._print_sites(visits[-1][1].snapshot.compare_to(visits[0][0].snapshot, self._group_by))
+
+    def _print_sites(self, differences: list):
+        shown = 0
+        for stat in differences:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            print(f"[memory]   {_format_bytes(stat.size_diff, sign=True):>10} "
+                  f"{stat.count_diff:+6d} blocks  {frame.filename}:{frame.lineno}")
+            shown += 1
+            if shown >= self.top:
+                break
+
+def _format_bytes(size: int, sign: bool = False) -> str:
+    prefix = '+' if sign and size > 0 else ''
+    if abs(size) >= 1024 * 1024:
+        return f"{prefix}{size / (1024 * 1024):.1f} MB"
+    return f"{prefix}{size / 1024:.1f} KB"
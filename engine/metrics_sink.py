@@ -0,0 +1,202 @@
+import csv
+import gc
+import os
+import queue
+import threading
+from ..imports import *
+from ..settings import METRICS_SETTINGS
+
+# Written to the queue to make the writer thread close its file and exit
+_STOP = object()
+
+class MetricsSink:
+    """
+    Samples runtime metrics at a fixed interval and writes them to a JSONL
+    or CSV file from a background thread.
+
+    The game loop calls record_frame() every frame, which only adds to running
+    totals, and poll(), which every interval seconds builds one flat sample
+    (frame and sim tick times, GC collections and whatever the registered
+    sources report) and hands it to the writer queue. If the writer falls
+    behind, samples are dropped and counted instead of blocking the frame.
+    Files are rotated like a rotating log: metrics.jsonl -> metrics.jsonl.1 ...
+    A CSV file also rotates when a sample brings keys its header lacks; the
+    new header holds every column seen so far.
+    """
+
+    def __init__(self, path: Optional[str] = None, fmt: str = METRICS_SETTINGS['format'],
+                 interval: float = METRICS_SETTINGS['interval'],
+                 max_bytes: int = METRICS_SETTINGS['max_bytes'],
+                 backups: int = METRICS_SETTINGS['backups']):
+        """
+        Args:
+            path: Output file, defaults to metrics.<fmt> in METRICS_SETTINGS['directory']
+            fmt: 'jsonl' or 'csv'
+            interval: Seconds between samples
+            max_bytes: File size that triggers rotation
+            backups: Rotated files kept
+        """
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        self.path = path or os.path.join(METRICS_SETTINGS['directory'], f"metrics.{fmt}")
+        self.fmt = fmt
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        # name -> callable returning {metric: value}, prefixed with name in the sample
+        self.sources: Dict[str, object] = {}
+
+        self._queue: queue.Queue = queue.Queue(maxsize=METRICS_SETTINGS['queue_size'])
+        self.dropped = 0
+        self._next_sample = time.perf_counter() + interval
+        self._start = time.perf_counter()
+        self._reset_frames()
+        self._gc_collections = [stats['collections'] for stats in gc.get_stats()]
+
+        self._thread = threading.Thread(target=self._writer, name='metrics-writer', daemon=True)
+        self._thread.start()
+        print(f"Writing metrics to {self.path}")
+
+    def add_source(self, name: str, source):
+        """
+        Register a callable sampled at every interval.
+
+        Args:
+            name: Prefix for the metrics it returns ('cache' -> 'cache.image.bytes')
+            source: Zero-argument callable returning a dict of numbers (may be nested)
+        """
+        self.sources[name] = source
+
+    def record_frame(self, frame_time: float, sim_time: float):
+        """
+        Add one frame to the current sample.
+
+        Args:
+            frame_time: Seconds since the previous frame
+            sim_time: Seconds spent in the simulation update
+        """
+        self._frames += 1
+        self._frame_total += frame_time
+        self._sim_total += sim_time
+        if frame_time > self._frame_max:
+            self._frame_max = frame_time
+        if sim_time > self._sim_max:
+            self._sim_max = sim_time
+
+    def poll(self, now: Optional[float] = None) -> bool:
+        """
+        Take a sample if the interval has passed. Call once per frame.
+
+        Returns:
+            True if a sample was taken
+        """
+        now = time.perf_counter() if now is None else now
+        if now < self._next_sample:
+            return False
+        self._next_sample = now + self.interval
+
+        try:
+            self._queue.put_nowait(self.sample(now))
+        except queue.Full:
+            self.dropped += 1
+        return True
+
+    def sample(self, now: Optional[float] = None) -> Dict[str, object]:
+        """Build a sample from the frames since the last one and all sources."""
+        now = time.perf_counter() if now is None else now
+        frames = self._frames
+        sample = {
+            'time': round(now - self._start, 3),
+            'frames': frames,
+            'frame_ms_mean': self._frame_total / frames * 1000 if frames else 0.0,
+            'frame_ms_max': self._frame_max * 1000,
+            'sim_ms_mean': self._sim_total / frames * 1000 if frames else 0.0,
+            'sim_ms_max': self._sim_max * 1000,
+            'dropped_samples': self.dropped,
+        }
+        self._reset_frames()
+
+        # Collections per generation since the previous sample
+        collections = [stats['collections'] for stats in gc.get_stats()]
+        for generation, (count, previous) in enumerate(zip(collections, self._gc_collections)):
+            sample[f'gc.gen{generation}'] = count - previous
+        self._gc_collections = collections
+
+        for name, source in self.sources.items():
+            try:
+                _flatten(sample, name, source())
+            except Exception as e:
+                sample[f'{name}.error'] = str(e)
+        return sample
+
+    def close(self):
+        """Write out queued samples and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5.0)
+
+    def _reset_frames(self):
+        self._frames = 0
+        self._frame_total = 0.0
+        self._frame_max = 0.0
+        self._sim_total = 0.0
+        self._sim_max = 0.0
+
+    def _writer(self):
+        """Writer thread: the only place the file is touched."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        file = None
+        fieldnames: List[str] = []  # CSV columns, the union of every key seen so far
+        try:
+            while True:
+                sample = self._queue.get()
+                if sample is _STOP:
+                    break
+
+                new_keys = []
+                if self.fmt == 'csv':
+                    new_keys = [key for key in sample if key not in fieldnames]
+                    fieldnames += new_keys
+
+                # A key the header lacks (e.g. a source reporting more once a
+                # level is loaded) starts a new file, so no value is dropped
+                if file is not None and (file.tell() >= self.max_bytes or new_keys):
+                    file.close()
+                    file = None
+                    self._rotate()
+                if file is None:
+                    file = open(self.path, 'w', encoding='utf-8', newline='')
+                    if self.fmt == 'csv':
+                        csv.writer(file).writerow(fieldnames)
+
+                if self.fmt == 'jsonl':
+                    file.write(json.dumps(sample, separators=(',', ':')))
+                    file.write('\n')
+                else:
+                    # Keys a sample lacks are written as empty cells
+                    csv.DictWriter(file, fieldnames, restval='').writerow(sample)
+                file.flush()
+        except OSError as e:
+            print(f"Metrics writer stopped: {e}")
+        finally:
+            if file is not None:
+                file.close()
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+def _flatten(sample: dict, prefix: str, values: dict):
+    for key, value in values.items():
+        name = f"{prefix}.{key}"
+        if isinstance(value, dict):
+            _flatten(sample, name, value)
+        else:
+            sample[name] = value
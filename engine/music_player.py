@@ -0,0 +1,117 @@
+import os
+from ..imports import *
+from ..settings import AUDIO_SETTINGS, MUSIC_PLAYLISTS, GameState, get_asset_path
+
+class MusicPlayer:
+    """
+    Streams background music through pygame.mixer.music, so only the decoder's
+    small buffer is resident instead of a whole decoded track.
+    Each GameState has a playlist that loops; switching states fades the
+    current track out and the new playlist in over AUDIO_SETTINGS['music_crossfade_ms'].
+    pygame streams one music track at a time, so the crossfade is a fade-out
+    followed by a fade-in rather than an overlap.
+    """
+
+    # Transition phases
+    IDLE = "idle"
+    FADING_OUT = "fading_out"
+    FADING_IN = "fading_in"
+    PLAYING = "playing"
+
+    def __init__(self, crossfade_ms: int = AUDIO_SETTINGS['music_crossfade_ms']):
+        self.crossfade_ms = crossfade_ms
+        self.phase = self.IDLE
+
+        self._playlist: List[str] = []
+        self._pending_playlist: Optional[List[str]] = None
+        self._track_index = 0
+        self._fade = 0.0  # 0 = silent, 1 = full music volume
+
+    @property
+    def target_volume(self) -> float:
+        return AUDIO_SETTINGS['music_volume'] * AUDIO_SETTINGS['master_volume']
+
+    def play_for_state(self, state: GameState):
+        """Switch to the playlist of a game state, keeping the current one if it matches."""
+        playlist = [path for path in (get_asset_path('music', name) for name in MUSIC_PLAYLISTS.get(state, []))
+                    if os.path.exists(path)]
+        self.play_playlist(playlist)
+
+    def play_playlist(self, playlist: List[str]):
+        """
+        Crossfade to a list of music files. An empty list fades to silence.
+        Requesting the current playlist keeps its track playing, also while
+        it is fading out.
+
+        Args:
+            playlist: Full paths of tracks, played in order and looped
+        """
+        if playlist == self._playlist:
+            if self.phase == self.FADING_OUT:
+                # Back before the fade finished: keep the track and fade it in again
+                self._pending_playlist = None
+                self.phase = self.FADING_IN
+            return
+
+        if self.phase == self.IDLE:
+            self._start_playlist(playlist)
+        else:
+            self._pending_playlist = playlist
+            self.phase = self.FADING_OUT
+
+    def update(self, dt: float):
+        """Advance fades and move to the next queued track. Call once per frame."""
+        if self.phase == self.IDLE:
+            return
+
+        half_fade = max(self.crossfade_ms / 2000.0, 1e-3)
+
+        if self.phase == self.FADING_OUT:
+            self._fade = max(0.0, self._fade - dt / half_fade)
+            if self._fade == 0.0:
+                pygame.mixer.music.stop()
+                playlist, self._pending_playlist = self._pending_playlist or [], None
+                self._start_playlist(playlist)
+        elif self.phase == self.FADING_IN:
+            self._fade = min(1.0, self._fade + dt / half_fade)
+            if self._fade == 1.0:
+                self.phase = self.PLAYING
+
+        pygame.mixer.music.set_volume(self.target_volume * self._fade)
+
+        # Track finished on its own: stream the next one in the playlist
+        if self.phase in (self.PLAYING, self.FADING_IN) and not pygame.mixer.music.get_busy():
+            self._track_index = (self._track_index + 1) % len(self._playlist)
+            self._load_and_play(self._playlist[self._track_index])
+
+    def stop(self):
+        """Stop music immediately."""
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+        self._playlist = []
+        self._pending_playlist = None
+        self.phase = self.IDLE
+
+    def _start_playlist(self, playlist: List[str]):
+        self._playlist = playlist
+        self._track_index = 0
+        if not playlist:
+            self.phase = self.IDLE
+            return
+
+        self._fade = 0.0
+        pygame.mixer.music.set_volume(0.0)
+        if self._load_and_play(playlist[0]):
+            self.phase = self.FADING_IN
+
+    def _load_and_play(self, path: str) -> bool:
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play()
+            print(f"Streaming music: {path}")
+            return True
+        except pygame.error as e:
+            print(f"Failed to stream music {path}: {e}")
+            self._playlist = []
+            self.phase = self.IDLE
+            return False
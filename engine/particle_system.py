@@ -0,0 +1,183 @@
+import numpy as np
+from ..imports import *
+from ..settings import PERFORMANCE, PARTICLE_SETTINGS
+from .input_replay import get_rng
+from .quality_governor import QualityGovernor, get_quality_governor
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle pool stored as NumPy columns.
+
+    Every particle is one row in position, velocity, life, max_life, gravity,
+    color and size arrays; no per-particle Python objects exist. update()
+    integrates and expires all rows with array operations. draw() picks the
+    visible rows with a vectorized culling test and blits them in one
+    Surface.blits() call from sprites pre-rasterized for every palette color,
+    size and fade step.
+
+    The pool holds PERFORMANCE['particle_limit'] rows. The number in use is
+    capped by the quality governor's particle_limit(); when the cap is
+    reached, emitting recycles the oldest live particles first.
+    """
+
+    def __init__(self, capacity: int = PERFORMANCE['particle_limit'],
+                 governor: Optional[QualityGovernor] = None):
+        self.capacity = capacity
+        self.governor = governor or get_quality_governor()
+        self.palette = list(PARTICLE_SETTINGS['palette'])
+        self.sizes = PARTICLE_SETTINGS['sizes']
+        self.fade_steps = PARTICLE_SETTINGS['fade_steps']
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)  # seconds left, <= 0 is a free row
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)  # index into the palette
+        self.size = np.zeros(capacity, dtype=np.uint8)  # index into PARTICLE_SETTINGS['sizes']
+        self.birth = np.zeros(capacity, dtype=np.int64)  # emission order, for oldest-first recycling
+
+        self._emitted = 0
+        self._sprites: Optional[List[pygame.Surface]] = None
+        # Seeded from the session seed so replays emit the same particles
+        self._rng = np.random.default_rng(get_rng('particles').getrandbits(64))
+        self._quality_level = self.governor.level
+
+    @property
+    def active_count(self) -> int:
+        return int(np.count_nonzero(self.life > 0))
+
+    def limit(self) -> int:
+        """Particles allowed at the current quality level."""
+        return min(self.capacity, self.governor.particle_limit())
+
+    def emit(self, preset: str, pos: tuple, angle: Optional[float] = None,
+             count: Optional[int] = None) -> int:
+        """
+        Emit a burst of particles.
+
+        Args:
+            preset: Name in PARTICLE_SETTINGS['presets'] ('enemy_hit', 'enemy_death', 'tower_fire', ...)
+            pos: World position of the burst
+            angle: Direction in radians for presets with a spread, None for all directions
+            count: Particles to emit, defaults to the preset's count scaled by quality
+
+        Returns:
+            Number of particles emitted
+        """
+        spec = PARTICLE_SETTINGS['presets'][preset]
+        limit = self.limit()
+        if count is None:
+            count = int(round(spec['count'] * self.governor.quality['particle_scale']))
+        count = min(count, limit)
+        if count <= 0:
+            return 0
+
+        rows = self._allocate(count, limit)
+        rng = self._rng
+
+        spread = math.radians(spec.get('spread', 360))
+        if angle is None or spread >= 2 * math.pi:
+            angles = rng.uniform(0.0, 2 * math.pi, count)
+        else:
+            angles = rng.uniform(angle - spread / 2, angle + spread / 2, count)
+        speeds = rng.uniform(*spec['speed'], count)
+        life = rng.uniform(*spec['life'], count)
+
+        self.pos[rows] = pos
+        self.vel[rows, 0] = np.cos(angles) * speeds
+        self.vel[rows, 1] = np.sin(angles) * speeds
+        self.life[rows] = life
+        self.max_life[rows] = life
+        self.gravity[rows] = spec.get('gravity', 0.0)
+        color_indices = [self.palette.index(name) for name in spec['colors']]
+        self.color[rows] = rng.choice(color_indices, count)
+        self.size[rows] = rng.integers(spec['sizes'][0], spec['sizes'][1] + 1, count)
+        self.birth[rows] = np.arange(self._emitted, self._emitted + count)
+        self._emitted += count
+        return count
+
+    def update(self, dt: float):
+        """Integrate and age every particle."""
+        if self.governor.level != self._quality_level:
+            self._quality_level = self.governor.level
+            self._enforce_limit()
+
+        self.vel[:, 1] += self.gravity * dt
+        self.pos += self.vel * dt
+        self.life -= dt
+
+    def draw(self, surface: pygame.Surface, view: Optional[pygame.Rect] = None,
+             offset: tuple = (0, 0)):
+        """
+        Draw live particles inside the view.
+
+        Args:
+            surface: Target surface
+            view: World rectangle being shown; particles further than
+                PERFORMANCE['culling_margin'] outside it are skipped. None draws all
+            offset: Subtracted from world positions (camera position when drawing to the screen)
+        """
+        visible = self.life > 0
+        if view is not None:
+            margin = PERFORMANCE['culling_margin']
+            x, y = self.pos[:, 0], self.pos[:, 1]
+            visible &= ((x >= view.left - margin) & (x < view.right + margin)
+                        & (y >= view.top - margin) & (y < view.bottom + margin))
+        rows = np.flatnonzero(visible)
+        if rows.size == 0:
+            return
+
+        if self._sprites is None:
+            self._sprites = self._rasterize()
+
+        # Sprite index: color, then size, then fade step from the remaining life
+        fade = np.minimum((self.life[rows] / self.max_life[rows] * self.fade_steps).astype(np.intp),
+                          self.fade_steps - 1)
+        sprite_indices = ((self.color[rows].astype(np.intp) * len(self.sizes) + self.size[rows])
+                          * self.fade_steps + fade)
+        radii = np.asarray(self.sizes, dtype=np.float32)[self.size[rows]]
+        xs = (self.pos[rows, 0] - radii - offset[0]).astype(np.intp)
+        ys = (self.pos[rows, 1] - radii - offset[1]).astype(np.intp)
+
+        sprites = self._sprites
+        surface.blits([(sprites[index], (x, y)) for index, x, y
+                       in zip(sprite_indices.tolist(), xs.tolist(), ys.tolist())], False)
+
+    def clear(self):
+        """Remove every particle."""
+        self.life[:] = 0.0
+
+    def _allocate(self, count: int, limit: int) -> np.ndarray:
+        """Pick rows for new particles: free rows while under the limit, then the oldest live ones."""
+        alive = self.life > 0
+        free_rows = np.flatnonzero(~alive)[:max(0, limit - int(np.count_nonzero(alive)))]
+        if free_rows.size >= count:
+            return free_rows[:count]
+
+        live_rows = np.flatnonzero(alive)
+        needed = count - free_rows.size
+        oldest = live_rows[np.argpartition(self.birth[live_rows], needed - 1)[:needed]]
+        return np.concatenate((free_rows, oldest))
+
+    def _enforce_limit(self):
+        """Drop the oldest particles above a lowered limit."""
+        live_rows = np.flatnonzero(self.life > 0)
+        surplus = live_rows.size - self.limit()
+        if surplus > 0:
+            oldest = live_rows[np.argpartition(self.birth[live_rows], surplus - 1)[:surplus]]
+            self.life[oldest] = 0.0
+
+    def _rasterize(self) -> List[pygame.Surface]:
+        """One filled circle per palette color, size and fade step, in sprite index order."""
+        convert = pygame.display.get_surface() is not None
+        sprites = []
+        for name in self.palette:
+            rgb = PARTICLE_SETTINGS['palette'][name]
+            for radius in self.sizes:
+                for step in range(self.fade_steps):
+                    alpha = int(255 * (step + 1) / self.fade_steps)
+                    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (*rgb, alpha), (radius, radius), radius)
+                    sprites.append(sprite.convert_alpha() if convert else sprite)
+        return sprites
@@ -0,0 +1,122 @@
+from array import array
+from ..imports import *
+from ..settings import FPS, PERFORMANCE, QUALITY_SETTINGS
+
+class QualityGovernor:
+    """
+    Adjusts visual quality to the measured frame time.
+
+    The game loop reports the time each frame spent working (everything
+    before the flip, so neither waiting for vsync nor the frame-rate sleep
+    counts). Every evaluate_interval frames, once a full window of frames has
+    been seen at the current level, the window's p95 is compared with the FPS
+    budget:
+      - above downgrade_ratio * budget: step down one quality level
+      - below upgrade_ratio * budget for upgrade_hold_frames: step up one level
+    The gap between the two ratios and the longer wait before upgrading keep
+    the level from flapping; if a level has to be left again soon after an
+    upgrade to it, its upgrade wait doubles.
+
+    Systems read the knobs of the current level from `quality` (so far only
+    particle_scale, used by the ParticleSystem), or particle_limit() for the
+    scaled PERFORMANCE['particle_limit']. Every decision is printed and kept
+    in `decisions`.
+    """
+
+    def __init__(self, levels: Optional[List[dict]] = None):
+        self.levels = levels or QUALITY_SETTINGS['levels']
+        self.enabled = QUALITY_SETTINGS['enabled']
+        self.budget = 1.0 / FPS
+        self.window = array('d', [0.0] * QUALITY_SETTINGS['window_frames'])
+        self.level = 0
+        self.decisions: List[dict] = []
+
+        self._cursor = 0
+        self._filled = 0  # frames in the window since the last change
+        self._frame = 0
+        self._last_change_frame = 0
+        self._upgraded = False  # whether the last change raised quality
+        self._headroom_frames = 0  # consecutive evaluated frames with room to upgrade
+        # Headroom frames needed before upgrading to each level
+        self._upgrade_holds = [QUALITY_SETTINGS['upgrade_hold_frames']] * len(self.levels)
+
+    @property
+    def quality(self) -> dict:
+        """Knobs of the current quality level."""
+        return self.levels[self.level]
+
+    def particle_limit(self) -> int:
+        """PERFORMANCE['particle_limit'] scaled for the current level."""
+        return int(PERFORMANCE['particle_limit'] * self.quality['particle_scale'])
+
+    def record_frame(self, work_time: float):
+        """
+        Add one frame's work time in seconds and re-evaluate when due.
+        Call once per frame.
+        """
+        if not self.enabled:
+            return
+
+        self.window[self._cursor] = work_time
+        self._cursor = (self._cursor + 1) % len(self.window)
+        self._filled += 1
+        self._frame += 1
+        if self._filled >= len(self.window) and self._frame % QUALITY_SETTINGS['evaluate_interval'] == 0:
+            self._evaluate()
+
+    def set_level(self, level: int, reason: str, p95: float = 0.0):
+        """Switch to a quality level (0 is highest), logging the decision."""
+        level = max(0, min(len(self.levels) - 1, level))
+        if level == self.level:
+            return
+
+        decision = {
+            'frame': self._frame,
+            'from': self.quality['name'],
+            'to': self.levels[level]['name'],
+            'p95_ms': p95 * 1000.0,
+            'budget_ms': self.budget * 1000.0,
+            'reason': reason,
+        }
+        self.decisions.append(decision)
+        print(f"Quality {decision['from']} -> {decision['to']}: {reason} "
+              f"(p95 {decision['p95_ms']:.1f} ms, budget {decision['budget_ms']:.1f} ms)")
+
+        self._upgraded = level < self.level
+        self.level = level
+        self._filled = 0
+        self._headroom_frames = 0
+        self._last_change_frame = self._frame
+
+    def get_stats(self) -> Dict[str, object]:
+        """Current level and decision count, e.g. for the metrics sink."""
+        return {'level': self.level, 'name': self.quality['name'], 'changes': len(self.decisions)}
+
+    def _evaluate(self):
+        samples = sorted(self.window)
+        p95 = samples[min(len(samples) - 1, len(samples) * 95 // 100)]
+        interval = QUALITY_SETTINGS['evaluate_interval']
+
+        if p95 > self.budget * QUALITY_SETTINGS['downgrade_ratio']:
+            self._headroom_frames = 0
+            if self.level < len(self.levels) - 1:
+                # Falling back soon after an upgrade: wait longer before trying this level again
+                if self._upgraded and self._frame - self._last_change_frame < 2 * len(self.window):
+                    self._upgrade_holds[self.level] = min(self._upgrade_holds[self.level] * 2,
+                                                          QUALITY_SETTINGS['upgrade_hold_frames'] * 8)
+                self.set_level(self.level + 1, "frames over budget", p95)
+        elif p95 < self.budget * QUALITY_SETTINGS['upgrade_ratio'] and self.level > 0:
+            self._headroom_frames += interval
+            if self._headroom_frames >= self._upgrade_holds[self.level - 1]:
+                self.set_level(self.level - 1, "sustained headroom", p95)
+        else:
+            self._headroom_frames = 0
+
+_governor: Optional[QualityGovernor] = None
+
+def get_quality_governor() -> QualityGovernor:
+    """Get the global quality governor."""
+    global _governor
+    if _governor is None:
+        _governor = QualityGovernor()
+    return _governor
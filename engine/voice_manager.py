@@ -0,0 +1,141 @@
+from ..imports import *
+from ..settings import AUDIO_SETTINGS
+
+class VoiceManager:
+    """
+    Allocates mixer channels to sound effects by priority.
+    play() only queues a request; update() starts them once per frame so
+    duplicate triggers of the same sound in one frame collapse into one voice.
+    Inaudible sounds are dropped, each sound has a concurrency cap, and when
+    every channel is busy the least important voice is stolen.
+    """
+
+    def __init__(self, num_channels: int = AUDIO_SETTINGS['channels'],
+                 max_instances: int = AUDIO_SETTINGS['max_instances_per_sound'],
+                 audible_distance: float = AUDIO_SETTINGS['audible_distance']):
+        self.max_instances = max_instances
+        self.audible_distance = audible_distance
+        self.listener_pos = (0.0, 0.0)
+
+        pygame.mixer.set_num_channels(num_channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+
+        # Per channel: (sound, priority, start frame) of the voice last started on it
+        self._voices: List[Optional[tuple]] = [None] * num_channels
+
+        # Requests for this frame, keyed by sound: [priority, gain, pan, max_instances]
+        self._pending: Dict[pygame.mixer.Sound, list] = {}
+        self._frame = 0
+
+        # Metrics
+        self.started = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def set_listener(self, pos: tuple):
+        """Set the world position sounds are heard from (usually the camera center)."""
+        self.listener_pos = pos
+
+    def play(self, sound: pygame.mixer.Sound, priority: int = 0, position: Optional[tuple] = None,
+             volume: float = 1.0, max_instances: Optional[int] = None):
+        """
+        Request a sound for this frame.
+
+        Args:
+            sound: Sound to play
+            priority: Higher values win channels and may steal from lower ones
+            position: World position for distance attenuation and panning, None for UI sounds
+            volume: Base volume (0-1) before attenuation and global SFX volume
+            max_instances: Concurrency cap for this sound, defaults to the manager's
+        """
+        gain, pan = volume, 0.0
+        if position is not None:
+            dx = position[0] - self.listener_pos[0]
+            dy = position[1] - self.listener_pos[1]
+            distance = math.hypot(dx, dy)
+            gain *= max(0.0, 1.0 - distance / self.audible_distance)
+            pan = max(-1.0, min(1.0, dx / self.audible_distance))
+
+        if gain <= 0.0:
+            self.dropped += 1
+            return
+
+        request = self._pending.get(sound)
+        if request is not None:
+            # Same sound twice in one frame: keep the most important/loudest trigger
+            self.coalesced += 1
+            if (priority, gain) > (request[0], request[1]):
+                request[0], request[1], request[2] = priority, gain, pan
+            return
+
+        self._pending[sound] = [priority, gain, pan, max_instances or self.max_instances]
+
+    def update(self):
+        """Start this frame's requests. Call once per frame after game logic."""
+        self._frame += 1
+        if not self._pending:
+            return
+
+        sfx_volume = AUDIO_SETTINGS['sfx_volume'] * AUDIO_SETTINGS['master_volume']
+        requests = sorted(self._pending.items(), key=lambda item: item[1][0], reverse=True)
+        self._pending.clear()
+
+        for sound, (priority, gain, pan, max_instances) in requests:
+            if self._count_instances(sound) >= max_instances:
+                self.dropped += 1
+                continue
+
+            index = self._find_channel(priority)
+            if index is None:
+                self.dropped += 1
+                continue
+
+            channel = self._channels[index]
+            channel.play(sound)
+            volume = gain * sfx_volume
+            channel.set_volume(volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan))
+            self._voices[index] = (sound, priority, self._frame)
+            self.started += 1
+
+    def stop_all(self):
+        """Stop every effect voice, e.g. on state change."""
+        for channel in self._channels:
+            channel.stop()
+        self._voices = [None] * len(self._channels)
+        self._pending.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            'active': sum(1 for channel in self._channels if channel.get_busy()),
+            'channels': len(self._channels),
+            'started': self.started,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'stolen': self.stolen,
+        }
+
+    def _count_instances(self, sound: pygame.mixer.Sound) -> int:
+        return sum(1 for index, voice in enumerate(self._voices)
+                   if voice is not None and voice[0] is sound and self._channels[index].get_busy())
+
+    def _find_channel(self, priority: int) -> Optional[int]:
+        """
+        Pick a free channel, or steal the lowest-priority (then oldest) voice
+        if it is less important than the new request.
+        """
+        victim = None
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+            voice = self._voices[index]
+            if voice is None:
+                continue
+            if victim is None or (voice[1], voice[2]) < (self._voices[victim][1], self._voices[victim][2]):
+                victim = index
+
+        if victim is not None and self._voices[victim][1] < priority:
+            self._channels[victim].stop()
+            self.stolen += 1
+            return victim
+        return None
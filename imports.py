@@ -1,8 +1,9 @@
 
 import pygame
 import sys
+import math
 import time
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 from pathlib import Path
\ No newline at end of file
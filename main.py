@@ -3,7 +3,19 @@ Main game entry point and core game loop.
 """
 from .imports import *
 from .settings import *
-from .utils.resource_loader import ResourceLoader
+from .utils.resource_loader import ResourceLoader, get_resource_loader, ensure_mixer
+from .utils.asset_preloader import AssetPreloader
+from .engine.level_preloader import LevelPreloader
+from .engine.hot_reload import HotReloader
+from .engine.frame_profiler import get_profiler
+from .engine.metrics_sink import MetricsSink
+from .engine.memory_profiler import MemoryProfiler
+from .engine.gc_manager import GCManager
+from .engine.input_latency import InputLatencyTracker
+from .engine.quality_governor import get_quality_governor
+from .engine.input_replay import InputRecorder, InputReplayer, default_recording_path, seed_random
+from .engine.voice_manager import VoiceManager
+from .engine.music_player import MusicPlayer
 from .screens.menu_screen import MenuScreen
 from .screens.world_map_screen import WorldMapScreen
 from .screens.level_screen import LevelScreen
@@ -15,9 +27,16 @@ class GameStateManager:
     
     def __init__(self):
         self.states: Dict[GameState, object] = {}
+        self.state_factories: Dict[GameState, object] = {}  # Build states on first switch
         self.current_state: Optional[GameState] = None
         self.running = True
         self.transition_data = {}  # Data to pass between states
+        self.asset_preloader: Optional[AssetPreloader] = None  # Shared with states for background loads
+        self.level_preloader: Optional[LevelPreloader] = None  # Prepares the next level off the main thread
+        self.voice_manager: Optional[VoiceManager] = None  # Shared with states for sound effects
+        self.music_player: Optional[MusicPlayer] = None  # Follows state switches
+        self.memory_profiler: Optional[MemoryProfiler] = None  # Reports memory on state switches
+        self.gc_manager: Optional[GCManager] = None  # Freezes loaded levels, schedules full collections
         
         # Performance tracking
         self.frame_count = 0
@@ -27,6 +46,16 @@ class GameStateManager:
     def add_state(self, state_name: GameState, state_object):
         """Add a new state to the manager."""
         self.states[state_name] = state_object
+    
+    def add_state_factory(self, state_name: GameState, factory):
+        """
+        Register a callable that builds a state the first time it is switched to.
+        
+        Args:
+            state_name: The state the factory builds
+            factory: Zero-argument callable returning the state object
+        """
+        self.state_factories[state_name] = factory
         
     def switch_state(self, state_name: GameState, transition_data: dict = None):
         """
@@ -36,17 +65,35 @@ class GameStateManager:
             state_name: The state to switch to
             transition_data: Optional data to pass to the new state
         """
+        # Construct lazily registered states on first use
+        if state_name not in self.states and state_name in self.state_factories:
+            self.states[state_name] = self.state_factories.pop(state_name)()
+        
         if state_name in self.states:
             # Call exit method on current state if it exists
             if self.current_state and hasattr(self.states[self.current_state], 'on_exit'):
                 self.states[self.current_state].on_exit()
+            if self.current_state and self.gc_manager:
+                self.gc_manager.on_exit(self.current_state)
+            if self.current_state and self.memory_profiler:
+                self.memory_profiler.on_exit(self.current_state)
             
             self.current_state = state_name
             self.transition_data = transition_data or {}
             
+            # Crossfade to the new state's music
+            if self.music_player:
+                self.music_player.play_for_state(state_name)
+            
             # Call enter method on new state if it exists
             if hasattr(self.states[self.current_state], 'on_enter'):
                 self.states[self.current_state].on_enter(self.transition_data)
+            # Memory is checked before the GC manager freezes the new state's
+            # objects, since gc.get_objects() no longer returns frozen ones
+            if self.memory_profiler:
+                self.memory_profiler.on_enter(self.current_state)
+            if self.gc_manager:
+                self.gc_manager.on_enter(self.current_state)
                 
             print(f"Switched to state: {state_name}")
         else:
@@ -97,13 +144,52 @@ class Game:
     Main game class that handles initialization and the core game loop.
     """
     
-    def __init__(self):
+    def __init__(self, record_path: Optional[str] = None, replay_path: Optional[str] = None,
+                 seed: Optional[int] = None, metrics_format: Optional[str] = None,
+                 profile_memory: bool = False, latency: bool = False, late_latch: bool = False):
+        """
+        Args:
+            record_path: Record input and seeds to this file
+            replay_path: Replay a recorded session headlessly at full speed instead of reading input
+            seed: Master random seed, picked at random when None (a replay uses the recorded one)
+            metrics_format: Write metrics samples in this format ('jsonl' or 'csv');
+                METRICS_SETTINGS decides when None
+            profile_memory: Report memory on state switches (also MEMORY_PROFILER_SETTINGS['enabled'])
+            latency: Measure input-to-display latency (also LATENCY_SETTINGS['enabled'])
+            late_latch: Measure latency and poll input as late as possible before each flip
+        """
         self.screen: Optional[pygame.Surface] = None
         self.clock: Optional[pygame.time.Clock] = None
         self.state_manager: Optional[GameStateManager] = None
         self.resource_loader: Optional[ResourceLoader] = None
+        self.asset_preloader: Optional[AssetPreloader] = None
+        self.level_preloader: Optional[LevelPreloader] = None
+        self.hot_reloader: Optional[HotReloader] = None
+        self.profiler = get_profiler()
+        self.quality_governor = get_quality_governor()
+        self.voice_manager: Optional[VoiceManager] = None
+        self.music_player: Optional[MusicPlayer] = None
         self.running = False
         
+        # Input recording / replay
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.seed = seed
+        self.recorder: Optional[InputRecorder] = None
+        self.replayer: Optional[InputReplayer] = None
+        self.replay_start = 0.0
+        
+        # Metrics export
+        self.metrics_format = metrics_format
+        self.metrics: Optional[MetricsSink] = None
+        self.profile_memory = profile_memory
+        
+        # Input latency measurement, pacing frames instead of clock.tick
+        self.measure_latency = (latency or late_latch or LATENCY_SETTINGS['enabled']
+                                or LATENCY_SETTINGS['late_latch'])
+        self.late_latch = late_latch or LATENCY_SETTINGS['late_latch']
+        self.latency_tracker: Optional[InputLatencyTracker] = None
+        
         # Debug info
         self.debug_font: Optional[pygame.font.Font] = None
         
@@ -115,14 +201,23 @@ class Game:
             True if initialization successful, False otherwise
         """
         try:
-            # Initialize Pygame
-            pygame.init()
-            pygame.mixer.init(
-                frequency=22050,
-                size=-16,
-                channels=AUDIO_SETTINGS['channels'],
-                buffer=AUDIO_SETTINGS['buffer_size']
-            )
+            validate_settings()
+            
+            # Seed randomness first; a replay needs the recorded seed
+            if self.replay_path:
+                self.replayer = InputReplayer(self.replay_path)
+                self.seed = self.replayer.seed
+            self.seed = seed_random(self.seed)
+            if self.replayer is None and (self.record_path or REPLAY_SETTINGS['record']):
+                self.recorder = InputRecorder(self.record_path or default_recording_path(), self.seed,
+                                              self.quality_governor.level)
+            if self.replayer:
+                # The recorded quality levels are replayed instead of reacting to this machine's speed
+                self.quality_governor.enabled = False
+            
+            # Initialize only what the menu needs; audio starts after the first frame
+            pygame.display.init()
+            pygame.font.init()
             
             # Create display
             flags = 0
@@ -140,18 +235,50 @@ class Game:
             # Create clock
             self.clock = pygame.time.Clock()
             
-            # Initialize resource loader
-            self.resource_loader = ResourceLoader()
+            # Share the global resource loader and convert anything it
+            # loaded before the display existed
+            self.resource_loader = get_resource_loader()
+            self.resource_loader.convert_pending_surfaces()
+            if Path(ASSET_BUNDLE_PATH).exists():
+                self.resource_loader.mount_bundle(ASSET_BUNDLE_PATH)
             
             # Initialize debug font
             self.debug_font = pygame.font.Font(None, UI_SETTINGS['font_size_small'])
             
+            # Background asset loading, finished a slice at a time in update()
+            self.asset_preloader = AssetPreloader(self.resource_loader)
+            self.level_preloader = LevelPreloader(self.asset_preloader)
+            
             # Initialize state manager
             self.state_manager = GameStateManager()
+            self.state_manager.asset_preloader = self.asset_preloader
+            self.state_manager.level_preloader = self.level_preloader
+            
+            # Collector scheduling around level loads and waves
+            if GC_SETTINGS['enabled']:
+                self.state_manager.gc_manager = GCManager(self.profiler)
+            
+            # Memory accounting per state, from before the first state exists
+            if self.profile_memory or MEMORY_PROFILER_SETTINGS['enabled']:
+                self.state_manager.memory_profiler = MemoryProfiler(self.resource_loader)
             
             # Create and add all states
             self._initialize_states()
             
+            # Pick up edited maps, cards and assets without restarting
+            # (not during a replay, where files must match the recording)
+            if HOT_RELOAD_SETTINGS['enabled'] and self.replayer is None:
+                self.hot_reloader = HotReloader(self.state_manager, self.resource_loader,
+                                                self.level_preloader)
+            
+            # Periodic metrics samples, written off the main thread
+            if self.metrics_format or METRICS_SETTINGS['enabled']:
+                self._initialize_metrics()
+            
+            # Replays have no live input to measure
+            if self.measure_latency and self.replayer is None:
+                self.latency_tracker = InputLatencyTracker(late_latch=self.late_latch)
+            
             # Set initial state
             self.state_manager.switch_state(GameState.MENU)
             
@@ -164,28 +291,49 @@ class Game:
             return False
     
     def _initialize_states(self):
-        """Initialize all game states."""
+        """Register all game states; each is built on its first switch_state."""
         try:
-            # Create state objects
-            menu_screen = MenuScreen(self.state_manager)
-            world_map_screen = WorldMapScreen(self.state_manager)
-            level_screen = LevelScreen(self.state_manager, "example_level")
-            
-            # Add states to manager
-            self.state_manager.add_state(GameState.MENU, menu_screen)
-            self.state_manager.add_state(GameState.WORLD_MAP, world_map_screen)
-            self.state_manager.add_state(GameState.LEVEL, level_screen)
+            state_manager = self.state_manager
+            state_manager.add_state_factory(GameState.MENU, lambda: MenuScreen(state_manager))
+            state_manager.add_state_factory(GameState.WORLD_MAP, lambda: WorldMapScreen(state_manager))
+            state_manager.add_state_factory(GameState.LEVEL, lambda: LevelScreen(state_manager))
             
-            print("All game states initialized")
+            print("All game states registered")
             
         except Exception as e:
             print(f"Failed to initialize states: {e}")
             raise
     
-    def handle_events(self):
-        """Handle pygame events."""
-        events = pygame.event.get()
+    def _initialize_metrics(self):
+        """Start the metrics sink with cache and current-state sources."""
+        self.metrics = MetricsSink(fmt=self.metrics_format or METRICS_SETTINGS['format'])
+        self.metrics.add_source('cache', self.resource_loader.get_cache_stats)
+        self.metrics.add_source('state', self._current_state_metrics)
+        self.metrics.add_source('quality', self.quality_governor.get_stats)
+    
+    def _current_state_metrics(self) -> dict:
+        """Entity counts and the like from the current state's get_metrics(), if it has one."""
+        state = self.state_manager.states.get(self.state_manager.current_state)
+        if hasattr(state, 'get_metrics'):
+            return state.get_metrics()
+        return {}
+    
+    def _initialize_audio(self):
+        """Start the mixer, effect voices and music. Deferred until after the first frame."""
+        ensure_mixer()
+        
+        # Sound effect channel allocation
+        self.voice_manager = VoiceManager()
+        self.state_manager.voice_manager = self.voice_manager
         
+        # Streamed background music, starting with the current state's playlist
+        self.music_player = MusicPlayer()
+        self.state_manager.music_player = self.music_player
+        if self.state_manager.current_state:
+            self.music_player.play_for_state(self.state_manager.current_state)
+    
+    def handle_events(self, events: list):
+        """Handle this tick's pygame events."""
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
@@ -199,15 +347,29 @@ class Game:
                 elif event.key == pygame.K_F3:
                     # Toggle debug info
                     DEBUG['show_fps'] = not DEBUG['show_fps']
+                elif event.key == pygame.K_F4:
+                    # Toggle frame profiler
+                    self.profiler.toggle()
         
         # Pass events to state manager
         self.state_manager.handle_events(events)
     
     def update(self, dt: float):
         """Update game logic."""
+        # Finish any background-loaded assets within the per-frame budget
+        if self.hot_reloader:
+            self.hot_reloader.poll()
+        self.level_preloader.update()
+        self.asset_preloader.pump()
+        
         # Update state manager
         self.state_manager.update(dt)
         
+        # Start sound effects requested this frame
+        if self.voice_manager:
+            self.voice_manager.update()
+            self.music_player.update(dt)
+        
         # Update FPS counter
         if DEBUG['show_fps']:
             self.state_manager.update_fps(dt)
@@ -227,9 +389,16 @@ class Game:
         # Draw debug info
         if DEBUG['show_fps']:
             self._draw_debug_info()
-        
-        # Update display
+        if self.profiler.enabled:
+            self.profiler.draw(self.screen, self.debug_font)
+    
+    def present(self):
+        """Show the drawn frame."""
+        if self.latency_tracker:
+            self.latency_tracker.mark_rendered()
         pygame.display.flip()
+        if self.latency_tracker:
+            self.latency_tracker.mark_flipped(self.state_manager.current_state)
     
     def _draw_debug_info(self):
         """Draw debug information overlay."""
@@ -239,8 +408,25 @@ class Game:
         debug_info = [
             f"FPS: {self.state_manager.get_fps()}",
             f"State: {self.state_manager.current_state}",
+            f"Quality: {self.quality_governor.quality['name']}",
         ]
         
+        # Input latency of the current state
+        if self.latency_tracker:
+            stats = self.latency_tracker.percentiles(self.state_manager.current_state)
+            if stats['count']:
+                debug_info.append(f"Input latency: p50 {stats['display_p50']:.1f} / "
+                                  f"p95 {stats['display_p95']:.1f} ms"
+                                  f"{' (late latch)' if self.late_latch else ''}")
+        
+        # Resource cache usage
+        if self.resource_loader:
+            for name, stats in self.resource_loader.get_cache_stats().items():
+                debug_info.append(
+                    f"{name}: {stats['entries']} / {stats['bytes'] // 1024} KB, "
+                    f"hit {stats['hit_rate']:.0%}, evicted {stats['evictions']}"
+                )
+        
         y_offset = 10
         for info in debug_info:
             text_surface = self.debug_font.render(info, True, COLORS['WHITE'])
@@ -271,28 +457,72 @@ class Game:
         
         print("Starting main game loop")
         last_time = time.time()
+        self.replay_start = time.perf_counter()
         
         try:
             while self.running:
                 # Calculate delta time
                 current_time = time.time()
-                dt = current_time - last_time
+                dt = frame_time = current_time - last_time
                 last_time = current_time
                 
                 # Limit delta time to prevent large jumps
                 dt = min(dt, 1.0 / 30.0)  # Cap at 30 FPS minimum
                 
+                frame_start = time.perf_counter()
+                profiler = self.profiler
+                profiler.begin_frame()
+                
                 # Handle events
-                self.handle_events()
+                with profiler.scope('events'):
+                    if self.replayer:
+                        tick = self.replayer.next_tick()
+                        if tick is None:
+                            self._finish_replay()
+                            break
+                        dt, events = tick
+                        self.quality_governor.set_level(self.replayer.quality_level, "replay")
+                        pygame.event.pump()  # keep the OS queue serviced; live input is ignored
+                    else:
+                        events = self.latency_tracker.get_events() if self.latency_tracker else pygame.event.get()
+                        if self.recorder:
+                            dt = self.recorder.record(dt, events, self.quality_governor.level)
+                    self.handle_events(events)
                 
                 # Update game logic
-                self.update(dt)
+                with profiler.scope('update'):
+                    sim_start = time.perf_counter()
+                    self.update(dt)
+                    sim_time = time.perf_counter() - sim_start
+                if self.latency_tracker:
+                    self.latency_tracker.poll()  # stamp input that arrived while updating
                 
-                # Render
-                self.draw()
+                # Render, then show it (flip is timed apart since it may wait for vsync)
+                with profiler.scope('draw'):
+                    self.draw()
+                work_time = time.perf_counter() - frame_start
+                with profiler.scope('flip'):
+                    self.present()
                 
-                # Control frame rate
-                self.clock.tick(FPS)
+                profiler.end_frame()
+                
+                # Adapt visual quality to the time this frame worked; flip and sleep are
+                # excluded, since a flip waiting for vsync would look like a slow frame
+                self.quality_governor.record_frame(work_time)
+                
+                if self.metrics:
+                    self.metrics.record_frame(frame_time, sim_time)
+                    self.metrics.poll()
+                
+                # Audio startup waits until the first frame is on screen
+                if self.voice_manager is None:
+                    self._initialize_audio()
+                
+                # Control frame rate (a replay runs as fast as it can)
+                if self.latency_tracker:
+                    self.latency_tracker.wait()
+                elif self.replayer is None:
+                    self.clock.tick(FPS)
                 
         except Exception as e:
             print(f"Error in game loop: {e}")
@@ -302,28 +532,89 @@ class Game:
         finally:
             self.cleanup()
     
+    def _finish_replay(self):
+        """Report a completed replay, with profiler percentiles if profiling was on."""
+        elapsed = time.perf_counter() - self.replay_start
+        ticks = self.replayer.ticks
+        print(f"Replay finished: {ticks} ticks in {elapsed:.2f} s ({ticks / max(elapsed, 1e-9):.1f} ticks/s)")
+        if self.profiler.enabled:
+            for name, stats in self.profiler.get_stats().items():
+                print(f"  {name:<16} p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f} ms")
+        self.running = False
+    
     def cleanup(self):
         """Clean up resources and quit."""
         print("Cleaning up...")
         
+        if self.latency_tracker:
+            self.latency_tracker.print_report()
+        
+        # Flush metrics and finish the input recording
+        if self.metrics:
+            self.metrics.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.replayer:
+            self.replayer.close()
+        if self.state_manager and self.state_manager.memory_profiler:
+            self.state_manager.memory_profiler.stop()
+        if self.state_manager and self.state_manager.gc_manager:
+            self.state_manager.gc_manager.shutdown()
+        
+        # Stop background loading
+        if self.level_preloader:
+            self.level_preloader.shutdown()
+        if self.asset_preloader:
+            self.asset_preloader.shutdown()
+        
         # Clear resource cache
         if self.resource_loader:
             self.resource_loader.clear_cache()
         
         # Quit Pygame
-        pygame.mixer.quit()
+        if self.music_player:
+            self.music_player.stop()
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
         pygame.quit()
         
         print("Cleanup complete")
 
 def main():
     """Entry point for the game."""
+    import argparse
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--record', nargs='?', const='', metavar='PATH',
+                        help="record input and random seeds (default path in REPLAY_SETTINGS['directory'])")
+    parser.add_argument('--replay', metavar='PATH', help="replay a recording headlessly at full speed")
+    parser.add_argument('--seed', type=int, help="master random seed")
+    parser.add_argument('--profile', action='store_true', help="start with the frame profiler on")
+    parser.add_argument('--metrics', nargs='?', const=METRICS_SETTINGS['format'], choices=('jsonl', 'csv'),
+                        help="write periodic metrics samples (see METRICS_SETTINGS)")
+    parser.add_argument('--memory', action='store_true', help="report memory use on every state switch")
+    parser.add_argument('--latency', action='store_true', help="measure input-to-display latency")
+    parser.add_argument('--late-latch', action='store_true',
+                        help="measure latency and poll input just before each frame's work")
+    args = parser.parse_args()
+    
+    if args.replay:
+        # No window or audio device needed to re-run a session
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    
     print(f"Starting {TITLE}")
     print(f"Python version: {sys.version}")
     print(f"Pygame version: {pygame.version.ver}")
     
     # Create and run game
-    game = Game()
+    record_path = None
+    if args.record is not None:
+        record_path = args.record or default_recording_path()
+    game = Game(record_path=record_path, replay_path=args.replay, seed=args.seed,
+                metrics_format=args.metrics, profile_memory=args.memory,
+                latency=args.latency, late_latch=args.late_latch)
+    if args.profile:
+        game.profiler.toggle()
     game.run()
     
     print("Game ended")
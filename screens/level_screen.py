@@ -4,11 +4,13 @@ from ..engine.deck_system import Card
 # screens/level_screen.py
 
 from ..imports import *           # your common imports, e.g., pygame, typing, etc.
-from ..engine.deck_system import Card
-from ..engine.map_loader import MapLoader
-from ..engine.tower_defense import TowerManager, WaveManager
-from ..engine.entity_manager import EntityManager
+from ..engine.deck_system import Card, DeckManager
+from ..engine.tower_defense import WaveManager
+from ..engine.level_preloader import DECK_FILE, PreparedLevel, prepare_level
+from ..engine.frame_profiler import get_profiler
+from ..engine.particle_system import ParticleSystem
 from ..actors.player import Player
+from ..settings import SCREEN_WIDTH, SCREEN_HEIGHT, UI_SETTINGS, PERFORMANCE
 
 
 class UI:
@@ -74,8 +76,14 @@ class UI:
 
 
 class LevelScreen:
-    def __init__(self, state_manager, level_id: str, font: pygame.font.Font = pygame.font.get_default_font()):
+    DEFAULT_LEVEL = "example_level"
+
+    def __init__(self, state_manager, level_id: Optional[str] = None,
+                 font: Optional[pygame.font.Font] = None):
         """
+        The level is loaded here only if level_id is given; otherwise on_enter()
+        applies a level prepared by the world map or loads the requested one.
+
         Attributes:
           - state_manager: to push/pop screens
           - tile_map: instance of TileMap
@@ -83,6 +91,8 @@ class LevelScreen:
           - tower_manager: TowerManager
           - wave_manager: WaveManager
           - entity_manager: EntityManager
+          - deck: Deck for this level
+          - particles: ParticleSystem for hit, death and tower fire effects
           - ui: UI overlay
           - camera: simple offset (x, y)
         """
@@ -92,23 +102,72 @@ class LevelScreen:
         self.tower_manager = None
         self.wave_manager = None
         self.entity_manager = None
-        self.ui = UI(font)
+        self.deck = None
+        self.level_id = None
+        self.particles = ParticleSystem()
+        self.ui = UI(font or pygame.font.Font(None, UI_SETTINGS['font_size_medium']))
         self.camera = pygame.Vector2(0, 0)
         self.paused = False
 
-        self.load_level(level_id)
+        if level_id is not None:
+            self.load_level(level_id)
+
+    def on_enter(self, transition_data: dict):
+        """
+        Start the level from transition data: a PreparedLevel under
+        'prepared_level' is used as-is, otherwise 'level_id' is loaded here.
+        """
+        prepared = transition_data.get('prepared_level')
+        if prepared is not None:
+            self.apply_prepared_level(prepared)
+            return
+
+        level_id = transition_data.get('level_id', self.level_id or self.DEFAULT_LEVEL)
+        if level_id != self.level_id:
+            self.load_level(level_id)
 
     def load_level(self, level_id: str):
-        """Load level data and initialize all subsystems."""
-        project_root = Path(__file__).parent.parent  # one level up from screens/
-        map_file = project_root / "data" / "maps" / f"{level_id}.json"
-        self.tile_map = MapLoader.load_map(str(map_file))
+        """Load level data and initialize all subsystems synchronously."""
+        self.apply_prepared_level(prepare_level(level_id))
+
+    def apply_prepared_level(self, prepared: PreparedLevel):
+        """Take over a level built by prepare_level(), e.g. on a preload worker."""
+        self.level_id = prepared.level_id
+        self.tile_map = prepared.tile_map
+        self.player = prepared.player
+        self.tower_manager = prepared.tower_manager
+        self.wave_manager = prepared.wave_manager
+        self.entity_manager = prepared.entity_manager
+        self.deck = prepared.deck
+        self.particles.clear()
+        self.camera.update(0, 0)
+        self.paused = False
 
-        # Initialize core systems
-        self.player = Player(start_pos=self.tile_map.spawn_points[0])
-        self.tower_manager = TowerManager(self.tile_map)
-        self.wave_manager = WaveManager(self.tile_map.spawn_points, level_id)
-        self.entity_manager = EntityManager(self.tile_map, self.player)
+    def on_data_reloaded(self, data_type: str, path: str):
+        """
+        Apply a map or deck file that changed on disk. A map change restarts
+        the level through prepare_level(), so the wave manager and player
+        spawn are rebuilt on the new map, loaded the same way as on entry.
+        """
+        if data_type == 'maps' and Path(path).stem == self.level_id:
+            self.apply_prepared_level(prepare_level(self.level_id))
+            print(f"Reloaded map: {path}")
+        elif data_type == 'cards' and Path(path).name == DECK_FILE:
+            self.deck = DeckManager.load_deck_from_file(path)
+            print(f"Reloaded deck: {path}")
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Live entity counts and projectile pool occupancy, sampled by the metrics sink."""
+        if self.entity_manager is None:
+            return {}
+        projectiles = len(getattr(self.tower_manager, 'projectiles', None) or ())
+        return {
+            'enemies': len(getattr(self.entity_manager, 'enemies', None) or ()),
+            'towers': len(getattr(self.tower_manager, 'towers', None) or ()),
+            'projectiles': projectiles,
+            'projectile_pool': projectiles / PERFORMANCE['max_projectiles'],
+            'particles': self.particles.active_count,
+        }
 
     def handle_events(self, events: list[pygame.event.Event]):
         """Process input: movement, card plays, pause, etc."""
@@ -124,11 +183,31 @@ class LevelScreen:
         if self.paused:
             return
 
-        self.player.update(dt)
-        self.wave_manager.update(dt)
-        self.tower_manager.update(dt, self.entity_manager.enemies)
-        self.entity_manager.update(dt)
-        self.ui.update(self.player, self.wave_manager)
+        # Hear sound effects from the center of the view
+        voice_manager = getattr(self.state_manager, 'voice_manager', None)
+        if voice_manager:
+            voice_manager.set_listener((self.camera.x + SCREEN_WIDTH / 2,
+                                        self.camera.y + SCREEN_HEIGHT / 2))
+
+        scope = get_profiler().scope
+        with scope('update/player'):
+            self.player.update(dt)
+        with scope('update/waves'):
+            self.wave_manager.update(dt)
+        with scope('update/towers'):
+            self.tower_manager.update(dt, self.entity_manager.enemies)
+        with scope('update/entities'):
+            self.entity_manager.update(dt)
+        with scope('update/particles'):
+            self.particles.update(dt)
+        with scope('update/ui'):
+            self.ui.update(self.player, self.wave_manager)
+
+        # Full garbage collections wait for the gap between waves
+        gc_manager = getattr(self.state_manager, 'gc_manager', None)
+        if gc_manager:
+            gc_manager.set_wave_active(not self.wave_manager.is_wave_complete()
+                                       or bool(self.entity_manager.enemies))
 
         if self.check_win_condition():
             self.on_level_complete()
@@ -146,6 +225,8 @@ class LevelScreen:
         # draw towers & projectiles
         self.tower_manager.draw(temp_surf)
         self.entity_manager.draw(temp_surf)
+        self.particles.draw(temp_surf, view=pygame.Rect(self.camera.x, self.camera.y,
+                                                        SCREEN_WIDTH, SCREEN_HEIGHT))
 
         # blit world
         surface.blit(temp_surf, (cam_x, cam_y))
@@ -1,4 +1,5 @@
 from ..imports import *
+from ..settings import GameState
 
 class LevelNode:
     def __init__(self, x: int, y: int, level_id: str, unlocked: bool = False):
@@ -16,7 +17,9 @@ class LevelNode:
 class WorldMapScreen:
     def __init__(self, state_manager):
         # Attributes: background_image, level_nodes, camera_pos, state_manager
-        pass
+        self.state_manager = state_manager
+        self.level_nodes: List[LevelNode] = []
+        self.hovered_level: Optional[str] = None
     
     def load_world_data(self, file_path: str):
         """Load world map configuration"""
@@ -28,7 +31,30 @@ class WorldMapScreen:
     
     def handle_events(self, events: list):
         """Process input events"""
-        pass
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                node = self.get_node_at(event.pos)
+                self.hovered_level = node.level_id if node else None
+                if node:
+                    # Start loading on hover so the click finds the level ready
+                    self.preload_level(node.level_id)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                node = self.get_node_at(event.pos)
+                if node:
+                    self.on_level_selected(node.level_id)
+    
+    def get_node_at(self, mouse_pos: tuple) -> Optional[LevelNode]:
+        """Return the unlocked level node under the mouse, if any"""
+        for node in self.level_nodes:
+            if node.unlocked and node.is_clicked(mouse_pos):
+                return node
+        return None
+    
+    def preload_level(self, level_id: str):
+        """Prepare a level on the background loader"""
+        level_preloader = getattr(self.state_manager, 'level_preloader', None)
+        if level_preloader:
+            level_preloader.request(level_id)
     
     def update(self, dt: float):
         """Update world map state"""
@@ -40,7 +66,17 @@ class WorldMapScreen:
     
     def on_level_selected(self, level_id: str):
         """Handle level selection"""
-        pass
+        # Waits only for whatever part of the preload is still running
+        prepared = None
+        level_preloader = getattr(self.state_manager, 'level_preloader', None)
+        if level_preloader:
+            level_preloader.request(level_id)
+            prepared = level_preloader.take(level_id)
+        
+        self.state_manager.switch_state(GameState.LEVEL, {
+            'level_id': level_id,
+            'prepared_level': prepared,
+        })
     
     def on_back_to_menu(self):
         """Return to main menu"""
@@ -82,6 +82,7 @@ COLORS = {
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
 
 # Asset paths
 ASSET_PATHS = {
@@ -91,6 +92,12 @@ ASSET_PATHS = {
     'music': os.path.join(ASSETS_DIR, 'music'),
 }
 
+# Single-file asset bundle built by utils/asset_bundle.py, used when present
+ASSET_BUNDLE_PATH = os.path.join(BASE_DIR, 'assets.bundle')
+
+# Compiled level/card data built by engine/level_pack.py, used when present
+DATA_PACK_PATH = os.path.join(BASE_DIR, 'data.pack')
+
 # Data paths
 DATA_PATHS = {
     'maps': os.path.join(DATA_DIR, 'maps'),
@@ -98,6 +105,7 @@ DATA_PATHS = {
     'enemies': os.path.join(DATA_DIR, 'enemies'),
     'towers': os.path.join(DATA_DIR, 'towers'),
     'levels': os.path.join(DATA_DIR, 'levels'),
+    'manifests': os.path.join(DATA_DIR, 'manifests'),
     'saves': os.path.join(DATA_DIR, 'saves'),
 }
 
@@ -208,6 +216,21 @@ AUDIO_SETTINGS = {
     'sfx_volume': 0.8,
     'channels': 8,  # number of sound channels
     'buffer_size': 512,
+    'frequency': 22050,  # mixer sample rate in Hz
+    'sample_size': -16,  # signed 16-bit samples
+    'output_channels': 2,  # stereo output
+    'max_instances_per_sound': 3,  # concurrent voices of one sound effect
+    'audible_distance': 800,  # pixels from the listener where effects fade out
+    'music_crossfade_ms': 1500,  # fade-out plus fade-in time when music changes
+}
+
+# Streamed music per game state (files in ASSET_PATHS['music']), looped in order
+MUSIC_PLAYLISTS = {
+    GameState.MENU: ['menu_theme.ogg'],
+    GameState.WORLD_MAP: ['world_map.ogg'],
+    GameState.LEVEL: ['battle_1.ogg', 'battle_2.ogg'],
+    GameState.GAME_OVER: ['game_over.ogg'],
+    GameState.VICTORY: ['victory.ogg'],
 }
 
 # ==============================================================================
@@ -259,6 +282,135 @@ PERFORMANCE = {
     'culling_margin': 100,  # pixels outside screen to still render
 }
 
+# Resource cache budgets (LRU eviction once exceeded, pinned assets are kept)
+CACHE_SETTINGS = {
+    'image_budget_bytes': 64 * 1024 * 1024,
+    'sound_budget_bytes': 32 * 1024 * 1024,
+    'font_budget_bytes': 4 * 1024 * 1024,
+    'json_budget_bytes': 8 * 1024 * 1024,
+    'font_entry_bytes': 256 * 1024,  # estimated size of one loaded font
+}
+
+# Persistent cache of decoded/scaled/generated surfaces (see utils/surface_cache.py)
+DISK_CACHE_SETTINGS = {
+    'enabled': True,
+    'directory': os.path.join(CACHE_DIR, 'surfaces'),
+    'max_bytes': 128 * 1024 * 1024,
+}
+
+# Background asset preloading
+PRELOAD_SETTINGS = {
+    'worker_threads': 4,
+    'frame_budget_ms': 2.0,  # main-thread time per frame spent finishing preloaded assets
+}
+
+# Texture atlas settings
+ATLAS_SETTINGS = {
+    'page_size': (1024, 1024),  # size of each atlas surface in pixels
+    'padding': 1,  # empty pixels between packed sprites
+    'layout_cache': os.path.join(CACHE_DIR, 'atlas_layout.json'),
+}
+
+# Reload edited maps, cards and assets while the game runs (see engine/hot_reload.py)
+HOT_RELOAD_SETTINGS = {
+    'enabled': True,
+    'poll_interval': 0.25,  # seconds between file checks
+    'files_per_poll': 16,  # files stat'ed per check
+}
+
+# Frame profiler (toggle with F4, see engine/frame_profiler.py)
+PROFILER_SETTINGS = {
+    'enabled': False,
+    'history_frames': 240,  # ring buffer length, also the graph width in pixels
+    'graph_height': 120,
+    'graph_scale_ms': 33.3,  # frame time at the top of the graph
+}
+
+# Input recording and replay (see engine/input_replay.py)
+REPLAY_SETTINGS = {
+    'record': False,  # record every session, also enabled with --record
+    'directory': os.path.join(BASE_DIR, 'replays'),
+}
+
+# Periodic metrics samples written by a background thread (see engine/metrics_sink.py)
+METRICS_SETTINGS = {
+    'enabled': False,  # also enabled with --metrics
+    'format': 'jsonl',  # 'jsonl' or 'csv'
+    'interval': 1.0,  # seconds between samples
+    'directory': os.path.join(BASE_DIR, 'metrics'),
+    'max_bytes': 4 * 1024 * 1024,  # rotate the file at this size
+    'backups': 3,  # rotated files kept
+    'queue_size': 256,  # samples waiting for the writer before new ones are dropped
+}
+
+# Memory reports on state switches (see engine/memory_profiler.py)
+MEMORY_PROFILER_SETTINGS = {
+    'enabled': False,  # also enabled with --memory; tracing slows every allocation
+    'top_sites': 10,  # allocation sites listed per report
+    'traceback_frames': 1,  # call stack depth recorded per allocation
+    'leak_visits': 3,  # consecutive growing visits before a state is reported
+    'leak_threshold_bytes': 64 * 1024,  # growth per visit that counts
+}
+
+# Garbage collector scheduling (see engine/gc_manager.py)
+GC_SETTINGS = {
+    'enabled': True,
+    'freeze_after_load': True,  # move objects alive after a level loads out of GC scans
+    'defer_full_collections': True,  # run gen-2 collections between waves instead of mid-wave
+    'max_deferred': 100,  # gen-1 collections before a deferred gen-2 collection runs anyway
+    'log_pause_ms': 5.0,  # print collections that pause longer than this
+}
+
+# Input-to-display latency measurement (see engine/input_latency.py)
+LATENCY_SETTINGS = {
+    'enabled': False,  # also enabled with --latency or --late-latch
+    'late_latch': False,  # poll input as late before the next flip as frame work allows
+    'poll_slice_ms': 1.0,  # sleep granularity; events are stamped after each slice
+    'latch_margin_ms': 2.0,  # slack left between expected frame work and the flip
+    'work_history_frames': 60,  # recent frames whose slowest work time sets the latch point
+    'history': 512,  # latency samples kept per state for percentiles
+}
+
+# Runtime quality levels chosen from measured frame time (see engine/quality_governor.py)
+QUALITY_SETTINGS = {
+    'enabled': True,
+    # Highest first; particle_scale multiplies PERFORMANCE['particle_limit'] and
+    # the particles emitted per burst. Add a knob here only with the system that reads it
+    'levels': [
+        {'name': 'high', 'particle_scale': 1.0},
+        {'name': 'medium', 'particle_scale': 0.6},
+        {'name': 'low', 'particle_scale': 0.3},
+        {'name': 'minimum', 'particle_scale': 0.1},
+    ],
+    'window_frames': 120,  # rolling window of frame work times
+    'evaluate_interval': 30,  # frames between checks
+    'downgrade_ratio': 1.0,  # p95 above this share of the frame budget lowers quality
+    'upgrade_ratio': 0.6,  # p95 below this share of the budget counts as headroom
+    'upgrade_hold_frames': 300,  # frames of headroom before raising quality
+}
+
+# Particle effects (see engine/particle_system.py); the pool size is PERFORMANCE['particle_limit']
+PARTICLE_SETTINGS = {
+    'palette': {
+        'spark': (255, 220, 120),
+        'white': (255, 255, 255),
+        'blood': (200, 40, 40),
+        'smoke': (110, 110, 110),
+        'energy': (120, 200, 255),
+    },
+    'sizes': (1, 2, 3, 4),  # sprite radii in pixels
+    'fade_steps': 4,  # alpha levels pre-rasterized per sprite
+    # Bursts by event; speed and life are (min, max), sizes index into 'sizes'
+    'presets': {
+        'enemy_hit': {'count': 6, 'speed': (60, 160), 'life': (0.15, 0.35),
+                      'colors': ['spark', 'white'], 'sizes': (0, 1)},
+        'enemy_death': {'count': 20, 'speed': (40, 200), 'life': (0.4, 0.9), 'gravity': 200,
+                        'colors': ['blood', 'smoke'], 'sizes': (1, 3)},
+        'tower_fire': {'count': 4, 'speed': (80, 180), 'life': (0.08, 0.2), 'spread': 40,
+                       'colors': ['energy', 'white'], 'sizes': (0, 1)},
+    },
+}
+
 # ==============================================================================
 # GAME CONSTANTS
 # ==============================================================================
@@ -343,6 +495,3 @@ def validate_settings():
     
     if errors:
         raise ValueError("Settings validation failed: " + "; ".join(errors))
-
-# Validate settings on import
-validate_settings()
@@ -4,7 +4,14 @@ import logging
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 # Expose resource‐loading helpers:
-from .resource_loader import load_image, load_sound, load_font, load_json, ResourceLoader
+from .resource_loader import (load_image, load_sound, load_font, load_json, ResourceLoader,
+                              get_resource_loader, resolve_image, get_surface)
+from .texture_atlas import TextureAtlas
+from .asset_cache import AssetCache
+from .asset_preloader import AssetManifest, AssetPreloader
+from .asset_bundle import AssetBundle, AssetBundleBuilder
+from .surface_cache import SurfaceDiskCache
+from .file_watcher import FileWatcher
 
 __all__ = [
     "load_image",
@@ -12,4 +19,15 @@ __all__ = [
     "load_font",
     "load_json",
     "ResourceLoader",
+    "get_resource_loader",
+    "resolve_image",
+    "get_surface",
+    "TextureAtlas",
+    "AssetCache",
+    "AssetManifest",
+    "AssetPreloader",
+    "AssetBundle",
+    "AssetBundleBuilder",
+    "SurfaceDiskCache",
+    "FileWatcher",
 ]
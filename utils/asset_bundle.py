@@ -0,0 +1,207 @@
+"""
+Single-file asset bundle.
+
+Layout (little endian):
+    header  magic b'RLAB', u16 version, u16 reserved, u64 toc offset, u64 toc length
+    payload entries, each aligned to 16 bytes
+    table of contents, UTF-8 JSON: name -> entry description
+
+Images are stored as raw RGBA pixels, sounds as PCM in the mixer format and
+fonts as their original file bytes. Music is not bundled; it is streamed from
+the loose files.
+
+Build with:
+    python -m <package>.utils.asset_bundle [output_path]
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Optional
+import pygame
+from ..settings import ASSETS_DIR, ASSET_PATHS, ASSET_BUNDLE_PATH, AUDIO_SETTINGS
+
+BUNDLE_MAGIC = b'RLAB'
+BUNDLE_VERSION = 1
+HEADER_FORMAT = '<4sHHQQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PAYLOAD_ALIGNMENT = 16
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.mp3', '.flac')
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+def bundle_name(path: str) -> Optional[str]:
+    """
+    Get the bundle entry name for an asset path.
+
+    Returns:
+        Path relative to the assets directory with forward slashes,
+        or None if the path is outside it
+    """
+    relative = os.path.relpath(os.path.abspath(path), ASSETS_DIR)
+    if relative.startswith('..'):
+        return None
+    return relative.replace(os.sep, '/')
+
+class AssetBundle:
+    """
+    Read-only view of a bundle file through mmap.
+    Image surfaces are created directly on the mapped pixels with no copy or
+    decode. The mapping is copy-on-write, so drawing onto such a surface
+    never touches the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+
+        magic, version, _, toc_offset, toc_length = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {BUNDLE_VERSION} asset bundle: {path}")
+
+        toc_bytes = bytes(self._view[toc_offset:toc_offset + toc_length])
+        self._toc: Dict[str, dict] = json.loads(toc_bytes.decode('utf-8'))
+
+    def __contains__(self, name: Optional[str]) -> bool:
+        return name in self._toc
+
+    def __len__(self) -> int:
+        return len(self._toc)
+
+    def _payload(self, entry: dict) -> memoryview:
+        return self._view[entry['offset']:entry['offset'] + entry['length']]
+
+    def get_image(self, name: Optional[str]) -> Optional[pygame.Surface]:
+        """Create a surface sharing the mapped RGBA pixels, or None if not bundled."""
+        entry = self._toc.get(name)
+        if entry is None or entry['type'] != 'image':
+            return None
+        return pygame.image.frombuffer(self._payload(entry), tuple(entry['size']), 'RGBA')
+
+    def get_sound(self, name: Optional[str]) -> Optional[pygame.mixer.Sound]:
+        """
+        Create a sound from bundled PCM, or None if not bundled or if the PCM
+        was built for a different mixer format than the current one.
+        """
+        entry = self._toc.get(name)
+        if entry is None or entry['type'] != 'sound':
+            return None
+        if pygame.mixer.get_init() != tuple(entry['mixer_format']):
+            print(f"Bundled sound {name} has mixer format {entry['mixer_format']}, "
+                  f"current is {pygame.mixer.get_init()}")
+            return None
+        return pygame.mixer.Sound(buffer=self._payload(entry))
+
+    def get_font(self, name: Optional[str], size: int) -> Optional[pygame.font.Font]:
+        """Create a font from bundled font file bytes, or None if not bundled."""
+        entry = self._toc.get(name)
+        if entry is None or entry['type'] != 'font':
+            return None
+        return pygame.font.Font(io.BytesIO(self._payload(entry)), size)
+
+    def close(self):
+        """Release the mapping. Surfaces still sharing its memory keep it alive."""
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # Live surfaces still reference the pixels; let GC unmap later
+            pass
+        self._file.close()
+
+class AssetBundleBuilder:
+    """Packs the loose asset directories into one bundle file."""
+
+    def __init__(self):
+        self._entries = []  # (name, description, payload bytes)
+
+    def add_directory(self, directory: str):
+        """Add every supported image, sound and font file below a directory."""
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                extension = os.path.splitext(filename)[1].lower()
+                try:
+                    if extension in IMAGE_EXTENSIONS:
+                        self.add_image(path)
+                    elif extension in SOUND_EXTENSIONS:
+                        self.add_sound(path)
+                    elif extension in FONT_EXTENSIONS:
+                        self.add_font(path)
+                except pygame.error as e:
+                    print(f"Skipping {path}: {e}")
+
+    def add_image(self, path: str):
+        surface = pygame.image.load(path)
+        pixels = pygame.image.tobytes(surface, 'RGBA')
+        self._entries.append((bundle_name(path), {'type': 'image', 'size': list(surface.get_size())}, pixels))
+
+    def add_sound(self, path: str):
+        sound = pygame.mixer.Sound(path)
+        description = {'type': 'sound', 'mixer_format': list(pygame.mixer.get_init())}
+        self._entries.append((bundle_name(path), description, sound.get_raw()))
+
+    def add_font(self, path: str):
+        with open(path, 'rb') as f:
+            self._entries.append((bundle_name(path), {'type': 'font'}, f.read()))
+
+    def write(self, path: str) -> int:
+        """
+        Write the bundle.
+
+        Returns:
+            Number of entries written
+        """
+        toc = {}
+        with open(path, 'wb') as f:
+            f.write(b'\0' * HEADER_SIZE)
+
+            for name, description, payload in self._entries:
+                padding = -f.tell() % PAYLOAD_ALIGNMENT
+                f.write(b'\0' * padding)
+                toc[name] = dict(description, offset=f.tell(), length=len(payload))
+                f.write(payload)
+
+            toc_bytes = json.dumps(toc, separators=(',', ':')).encode('utf-8')
+            toc_offset = f.tell()
+            f.write(toc_bytes)
+
+            f.seek(0)
+            f.write(struct.pack(HEADER_FORMAT, BUNDLE_MAGIC, BUNDLE_VERSION, 0, toc_offset, len(toc_bytes)))
+
+        return len(toc)
+
+def build_bundle(output_path: str = ASSET_BUNDLE_PATH) -> int:
+    """
+    Bundle images, sounds and fonts from ASSET_PATHS.
+    Sounds are decoded with the mixer format from AUDIO_SETTINGS so the game
+    can use the PCM as is.
+
+    Returns:
+        Number of entries written
+    """
+    # Reinitialize in case the mixer was started with another format
+    pygame.mixer.quit()
+    pygame.mixer.init(
+        frequency=AUDIO_SETTINGS['frequency'],
+        size=AUDIO_SETTINGS['sample_size'],
+        channels=AUDIO_SETTINGS['output_channels'],
+    )
+
+    builder = AssetBundleBuilder()
+    for asset_type in ('images', 'sounds', 'fonts'):
+        builder.add_directory(ASSET_PATHS[asset_type])
+
+    count = builder.write(output_path)
+    print(f"Wrote {count} assets to {output_path}")
+    return count
+
+if __name__ == "__main__":
+    build_bundle(sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE_PATH)
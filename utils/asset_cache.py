@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+class AssetCache:
+    """
+    LRU cache with a byte budget, pinning and hit/miss counters.
+    Least recently used entries are evicted first once the resident size
+    exceeds the budget. Pinned entries are never evicted.
+    """
+
+    def __init__(self, name: str, budget_bytes: Optional[int],
+                 size_of: Callable[[Any], int]):
+        """
+        Args:
+            name: Cache name used in stats and log output
+            budget_bytes: Maximum resident bytes, or None for unbounded
+            size_of: Function returning the estimated byte size of a value
+        """
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self._size_of = size_of
+
+        # key -> (value, size in bytes), oldest first
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._pins: Dict[Hashable, int] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_resident = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up an entry, marking it recently used and counting a hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Look up an entry without touching recency or counters."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or replace an entry, then evict down to the budget."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_resident -= old[1]
+
+        size = self._size_of(value)
+        self._entries[key] = (value, size)
+        self.bytes_resident += size
+        self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry without counting it as an eviction."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.bytes_resident -= entry[1]
+        self._pins.pop(key, None)
+        return entry[0]
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove an entry but keep its pins, so a reloaded value stays protected."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes_resident -= entry[1]
+        return True
+
+    def pin(self, key: Hashable):
+        """Protect an entry from eviction. Pins are reference counted."""
+        self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: Hashable):
+        """Release one pin on an entry and evict if now over budget."""
+        count = self._pins.get(key, 0) - 1
+        if count > 0:
+            self._pins[key] = count
+        else:
+            self._pins.pop(key, None)
+            self._evict()
+
+    def unpin_all(self):
+        """Release every pin and evict down to the budget."""
+        self._pins.clear()
+        self._evict()
+
+    def is_pinned(self, key: Hashable) -> bool:
+        return key in self._pins
+
+    def clear(self):
+        """Drop all entries and pins. Counters are kept."""
+        self._entries.clear()
+        self._pins.clear()
+        self.bytes_resident = 0
+
+    def keys(self) -> Iterator[Hashable]:
+        return iter(list(self._entries.keys()))
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterate (key, value) pairs without touching recency or counters."""
+        return iter([(key, entry[0]) for key, entry in self._entries.items()])
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with entries, bytes, budget, pinned, hits, misses,
+            evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes_resident,
+            'budget': self.budget_bytes,
+            'pinned': len(self._pins),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict(self):
+        """Evict least recently used unpinned entries until within budget."""
+        if self.budget_bytes is None or self.bytes_resident <= self.budget_bytes:
+            return
+
+        for key in list(self._entries.keys()):
+            if self.bytes_resident <= self.budget_bytes:
+                break
+            if key in self._pins:
+                continue
+
+            _, size = self._entries.pop(key)
+            self.bytes_resident -= size
+            self.evictions += 1
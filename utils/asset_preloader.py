@@ -0,0 +1,242 @@
+import json
+import os
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import pygame
+from ..settings import COLORS, DATA_DIR, PRELOAD_SETTINGS, get_asset_path, get_data_path
+from .resource_loader import ResourceLoader, FALLBACK_SHAPES
+
+class AssetManifest:
+    """
+    List of assets a level needs, loaded from data/manifests/<level_id>.json.
+
+    Manifest format:
+        images: [{"file": "tower.png", "object_type": "tower", "scale": [32, 32]}]
+        sounds: ["tower_fire.wav"]
+        json:   ["maps/example_level.json"]  (relative to the data directory)
+    """
+
+    def __init__(self, images: List[tuple] = None, sounds: List[str] = None,
+                 json_files: List[str] = None):
+        # Image entries are full ResourceLoader cache keys so preloaded images
+        # are hits for the same load_game_image()/resolve_game_image() calls
+        self.images: List[tuple] = images or []
+        self.sounds: List[str] = sounds or []
+        self.json_files: List[str] = json_files or []
+
+    @classmethod
+    def from_file(cls, path: str) -> 'AssetManifest':
+        """
+        Load a manifest file.
+
+        Args:
+            path: Path to manifest JSON
+
+        Returns:
+            AssetManifest (empty if the file is missing or invalid)
+        """
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Failed to load manifest {path}: {e}")
+
+        images = []
+        for entry in data.get('images', []):
+            scale = tuple(entry['scale']) if entry.get('scale') else None
+            shape, size, color = FALLBACK_SHAPES.get(
+                entry.get('object_type'), ('rect', (32, 32), COLORS['WHITE'])
+            )
+            images.append((get_asset_path('images', entry['file']), scale, shape, size, color))
+
+        sounds = [get_asset_path('sounds', name) for name in data.get('sounds', [])]
+        json_files = [os.path.join(DATA_DIR, name) for name in data.get('json', [])]
+
+        return cls(images, sounds, json_files)
+
+    @classmethod
+    def for_level(cls, level_id: str) -> 'AssetManifest':
+        """Load the manifest for a level id."""
+        return cls.from_file(get_data_path('manifests', f"{level_id}.json"))
+
+    def __len__(self) -> int:
+        return len(self.images) + len(self.sounds) + len(self.json_files)
+
+class AssetPreloader:
+    """
+    Decodes manifest assets on a thread pool and finishes them on the main
+    thread. File reads, decoding, fallback generation, scaling and disk cache
+    writes run on workers; display-format conversion and cache insertion
+    happen in pump(), which spends at most a small time budget per frame.
+    Sounds are held back until the game has started the mixer, which the
+    workers must not do themselves.
+    """
+
+    def __init__(self, loader: ResourceLoader,
+                 max_workers: int = PRELOAD_SETTINGS['worker_threads']):
+        self.loader = loader
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Decoded results waiting for the main thread: (generation, kind, key, future)
+        self._ready: 'queue.SimpleQueue[Tuple[int, str, object, Future]]' = queue.SimpleQueue()
+        self._futures: List[Future] = []
+        self._generation = 0
+        # Queued or decoding (kind, key) -> whether to pin it once stored
+        self._loading: Dict[Tuple[str, object], bool] = {}
+        # Sound paths waiting for the mixer before they can be decoded
+        self._deferred_sounds: List[str] = []
+
+        # Progress
+        self.total = 0
+        self.completed = 0
+        self._on_progress: Optional[Callable[[int, int], None]] = None
+        self._on_complete: Optional[Callable[[], None]] = None
+
+    def start(self, manifest: AssetManifest,
+              on_progress: Optional[Callable[[int, int], None]] = None,
+              on_complete: Optional[Callable[[], None]] = None,
+              pin: bool = False):
+        """
+        Queue every asset in a manifest that is not already cached or loading.
+        Calling start() again before completion adds to the current batch.
+
+        Args:
+            manifest: Assets to load
+            on_progress: Called with (completed, total) after each finished asset
+            on_complete: Called once when the batch is fully finished
+            pin: Pin loaded assets in the cache (e.g. for the next level)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="asset-preload")
+
+        self._on_progress = on_progress or self._on_progress
+        self._on_complete = on_complete or self._on_complete
+
+        loader = self.loader
+        requested = [('image', key, loader.prepare_image) for key in manifest.images]
+        requested += [('sound', path, loader.decode_sound) for path in manifest.sounds]
+        requested += [('json', path, loader.decode_json) for path in manifest.json_files]
+
+        added = 0
+        for kind, key, decode in requested:
+            if (kind, key) in self._loading:
+                # Already on its way; a pinning request still pins it
+                self._loading[kind, key] |= pin
+            elif not loader.is_cached(kind, key):
+                self._loading[kind, key] = pin
+                added += 1
+                if kind == 'sound' and not pygame.mixer.get_init():
+                    self._deferred_sounds.append(key)
+                else:
+                    self._submit(kind, key, decode)
+
+        self.total += added
+        if self.completed >= self.total:
+            self._finish_batch()
+
+    def pump(self, budget_ms: float = PRELOAD_SETTINGS['frame_budget_ms']) -> bool:
+        """
+        Finish decoded assets on the main thread. Call once per frame.
+
+        Args:
+            budget_ms: Time to spend before returning, at least one asset is finished
+
+        Returns:
+            True if nothing is left to load
+        """
+        if self.total == 0:
+            return True
+
+        if self._deferred_sounds and pygame.mixer.get_init():
+            for path in self._deferred_sounds:
+                self._submit('sound', path, self.loader.decode_sound)
+            self._deferred_sounds = []
+
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while True:
+            try:
+                generation, kind, key, future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+
+            # Results from a cancelled batch
+            if generation != self._generation:
+                continue
+            pin = self._loading.pop((kind, key), False)
+
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Preload failed for {key}: {e}")
+                result = None
+
+            if kind == 'image':
+                surface, derived = result if result else (None, False)
+                self.loader.store_image(key, surface, pin=pin, derived=derived)
+            elif kind == 'sound':
+                self.loader.store_sound(key, result, pin=pin)
+            else:
+                self.loader.store_json(key, result, pin=pin)
+
+            self.completed += 1
+            if self._on_progress:
+                self._on_progress(self.completed, self.total)
+
+            if time.perf_counter() >= deadline:
+                break
+
+        if self.completed >= self.total:
+            self._finish_batch()
+            return True
+        return False
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the current batch finished, 1.0 when idle."""
+        return self.completed / self.total if self.total else 1.0
+
+    def is_done(self) -> bool:
+        return self.completed >= self.total
+
+    def cancel(self):
+        """Drop the current batch. Assets already finished stay cached."""
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._reset()
+
+    def shutdown(self):
+        """Stop worker threads without waiting for queued decodes."""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, kind: str, key, decode: Callable):
+        generation = self._generation
+        future = self._executor.submit(decode, key)
+        future.add_done_callback(
+            lambda f: self._ready.put((generation, kind, key, f))
+        )
+        self._futures.append(future)
+
+    def _finish_batch(self):
+        callback = self._on_complete
+        self._reset()
+        if callback:
+            callback()
+
+    def _reset(self):
+        self._futures = []
+        self.total = 0
+        self.completed = 0
+        self._on_progress = None
+        self._on_complete = None
+        self._loading.clear()
+        self._deferred_sounds = []
@@ -0,0 +1,116 @@
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from ..settings import HOT_RELOAD_SETTINGS
+
+class FileWatcher:
+    """
+    Polling file watcher with no background thread or OS service.
+    Each poll() stats a small batch of files, round-robin, and does nothing
+    until the poll interval has passed, so a frame usually costs one clock
+    read. Watched directories are re-listed once per full sweep to pick up
+    new files.
+    """
+
+    def __init__(self, interval: float = HOT_RELOAD_SETTINGS['poll_interval'],
+                 batch_size: int = HOT_RELOAD_SETTINGS['files_per_poll']):
+        """
+        Args:
+            interval: Seconds between batches
+            batch_size: Files checked per batch
+        """
+        self.interval = interval
+        self.batch_size = batch_size
+
+        # (directory or file, extensions, callback)
+        self._watches: List[Tuple[str, Optional[Tuple[str, ...]], Callable[[str], None]]] = []
+        self._files: List[Tuple[str, Callable[[str], None]]] = []
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._cursor = 0
+        self._next_poll = 0.0
+
+        # Metrics
+        self.checks = 0
+        self.changes = 0
+
+    def watch(self, path: str, callback: Callable[[str], None],
+              extensions: Optional[Tuple[str, ...]] = None):
+        """
+        Watch a file, or every file in a directory tree.
+
+        Args:
+            path: File or directory (need not exist yet)
+            callback: Called with the file path when a file changes or appears
+            extensions: Only watch files with these extensions, e.g. ('.json',)
+        """
+        self._watches.append((path, extensions, callback))
+        for file_path, file_callback in self._list(path, extensions, callback):
+            self._files.append((file_path, file_callback))
+            self._signatures[file_path] = self._signature(file_path)
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        Check the next batch of files if the interval has passed. Call once per frame.
+
+        Returns:
+            Number of changed files found
+        """
+        now = time.perf_counter() if now is None else now
+        if now < self._next_poll:
+            return 0
+        self._next_poll = now + self.interval
+
+        if self._cursor >= len(self._files):
+            self._cursor = 0
+            self._rescan()
+
+        batch = self._files[self._cursor:self._cursor + self.batch_size]
+        self._cursor += len(batch)
+
+        changed = 0
+        for path, callback in batch:
+            self.checks += 1
+            signature = self._signature(path)
+            if signature == self._signatures.get(path):
+                continue
+            self._signatures[path] = signature
+            if signature is None:
+                continue  # Deleted; keep the last loaded version
+
+            changed += 1
+            self.changes += 1
+            try:
+                callback(path)
+            except Exception as e:
+                print(f"Reload failed for {path}: {e}")
+        return changed
+
+    def _rescan(self):
+        """Add files created in watched directories since the last sweep."""
+        for path, extensions, callback in self._watches:
+            for file_path, file_callback in self._list(path, extensions, callback):
+                if file_path not in self._signatures:
+                    self._files.append((file_path, file_callback))
+                    # Unknown signature, so the first check reports it as changed
+                    self._signatures[file_path] = None
+
+    @staticmethod
+    def _list(path: str, extensions: Optional[Tuple[str, ...]], callback):
+        if not os.path.isdir(path):
+            # A missing path without an extension is a directory that may appear later
+            return [(path, callback)] if os.path.splitext(path)[1] else []
+
+        files = []
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                if extensions is None or name.lower().endswith(extensions):
+                    files.append((os.path.join(root, name), callback))
+        return files
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
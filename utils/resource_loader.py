@@ -1,32 +1,51 @@
 import pygame
 import json
 import os
-from typing import Dict, Optional, Tuple, Any
-from ..settings import COLORS
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+from ..settings import COLORS, ATLAS_SETTINGS, AUDIO_SETTINGS, CACHE_SETTINGS, DISK_CACHE_SETTINGS
+from .asset_bundle import AssetBundle, bundle_name
+from .asset_cache import AssetCache
+from .surface_cache import SurfaceDiskCache
+from .texture_atlas import TextureAtlas
 
 class ResourceLoader:
     """
     Resource loader with fallback to geometric shapes when assets are missing.
-    Includes caching for better performance.
+    Includes byte-budgeted LRU caching for better performance.
     """
     
     def __init__(self):
-        self._image_cache: Dict[str, pygame.Surface] = {}
-        self._sound_cache: Dict[str, pygame.mixer.Sound] = {}
-        self._font_cache: Dict[str, pygame.font.Font] = {}
-        self._json_cache: Dict[str, dict] = {}
-        
-        # Initialize pygame components if not already done
-        if not pygame.get_init():
-            pygame.init()
-        if not pygame.font.get_init():
-            pygame.font.init()
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
+        self._image_cache = AssetCache('image', CACHE_SETTINGS['image_budget_bytes'], _surface_bytes)
+        self._sound_cache = AssetCache('sound', CACHE_SETTINGS['sound_budget_bytes'], _sound_bytes)
+        self._font_cache = AssetCache('font', CACHE_SETTINGS['font_budget_bytes'],
+                                      lambda font: CACHE_SETTINGS['font_entry_bytes'])
+        self._json_cache = AssetCache('json', CACHE_SETTINGS['json_budget_bytes'], _json_bytes)
+        self._caches: Dict[str, AssetCache] = {
+            'image': self._image_cache,
+            'sound': self._sound_cache,
+            'font': self._font_cache,
+            'json': self._json_cache,
+        }
+        self._atlas: Optional[TextureAtlas] = None
+        self._bundle: Optional[AssetBundle] = None
+        self._loose_overrides = set()  # Paths changed on disk since the bundle was built
+        self._surface_cache: Optional[SurfaceDiskCache] = (
+            SurfaceDiskCache() if DISK_CACHE_SETTINGS['enabled'] else None
+        )
+        
+        # Image cache keys loaded before the display existed, converted later
+        self._pending_conversion: List[tuple] = []
+        
+        # Image handles: spec tuple -> small int indexing the lists below
+        self._handles: Dict[tuple, int] = {}
+        self._handle_keys: List[tuple] = []
+        self._handle_surfaces: List[Optional[pygame.Surface]] = []
     
     def load_image(self, path: str, scale: Optional[Tuple[int, int]] = None, 
                    fallback_shape: str = "rect", fallback_size: Tuple[int, int] = (32, 32),
-                   fallback_color: Tuple[int, int, int] = COLORS['WHITE']) -> pygame.Surface:
+                   fallback_color: Tuple[int, int, int] = COLORS['WHITE'],
+                   pin: bool = False) -> pygame.Surface:
         """
         Load an image with fallback to geometric shape.
         
@@ -36,28 +55,51 @@ class ResourceLoader:
             fallback_shape: Shape to draw if image not found ('rect', 'circle', 'triangle')
             fallback_size: Size of fallback shape
             fallback_color: Color of fallback shape
+            pin: Protect the cached image from eviction until unpinned
             
         Returns:
             pygame.Surface with image or geometric shape
         """
-        # Create cache key including all parameters
-        cache_key = f"{path}_{scale}_{fallback_shape}_{fallback_size}_{fallback_color}"
+        # Cache key including all parameters
+        cache_key = (path, scale, fallback_shape, fallback_size, fallback_color)
         
-        if cache_key in self._image_cache:
-            return self._image_cache[cache_key]
+        cached = self._image_cache.get(cache_key)
+        if cached is not None:
+            if pin:
+                self._image_cache.pin(cache_key)
+            return cached
         
-        surface = None
+        surface, derived = self.prepare_image(cache_key)
+        return self.store_image(cache_key, surface, pin, derived)
+    
+    def prepare_image(self, cache_key: tuple) -> Tuple[Optional[pygame.Surface], bool]:
+        """
+        Read an image from the on-disk surface cache, or decode its source,
+        apply the fallback shape and scale, and write the result to the disk
+        cache. Safe to call from worker threads, which keeps the disk cache's
+        hashing and file writes off the main thread.
         
-        # Try to load the actual image
-        if os.path.exists(path):
-            try:
-                surface = pygame.image.load(path).convert_alpha()
-                print(f"Loaded image: {path}")
-            except pygame.error as e:
-                print(f"Failed to load image {path}: {e}")
-                surface = None
-        else:
-            print(f"Image not found: {path}, using fallback shape")
+        Args:
+            cache_key: (path, scale, fallback_shape, fallback_size, fallback_color)
+            
+        Returns:
+            (surface, derived): derived is True when the surface is already
+            scaled or rasterized, as it is whenever the disk cache is enabled
+        """
+        disk_key = self._disk_cache_key(cache_key)
+        if disk_key is None:
+            return self.decode_image(cache_key[0]), False
+        
+        surface = self._surface_cache.get(disk_key)
+        if surface is None:
+            surface = self._derive_image(cache_key, self.decode_image(cache_key[0]))
+            # Persist the result so later launches skip decoding and scaling
+            self._surface_cache.put(disk_key, surface)
+        return surface, True
+    
+    def _derive_image(self, cache_key: tuple, surface: Optional[pygame.Surface]) -> pygame.Surface:
+        """Substitute the fallback shape for a missing image and apply the scale."""
+        _, scale, fallback_shape, fallback_size, fallback_color = cache_key
         
         # Create fallback shape if image loading failed
         if surface is None:
@@ -66,13 +108,282 @@ class ResourceLoader:
         # Scale if requested
         if scale and surface:
             surface = pygame.transform.scale(surface, scale)
+        return surface
+    
+    def _disk_cache_key(self, cache_key: tuple) -> Optional[str]:
+        """
+        Identify the derived surface for the on-disk cache: where the pixels
+        come from (source file mtime and size, bundle entry, or fallback shape
+        parameters) plus the scale.
+        
+        Returns:
+            Key string, or None if the surface is not worth caching on disk
+        """
+        if self._surface_cache is None:
+            return None
+        
+        path, scale, fallback_shape, fallback_size, fallback_color = cache_key
+        
+        # Bundled pixels are already raw; only their scaled versions are cached
+        name = self._bundle_name(path)
+        if name is not None and name in self._bundle:
+            if scale is None:
+                return None
+            bundle_stat = os.stat(self._bundle.path)
+            return self._surface_cache.make_key('bundle', name, bundle_stat.st_mtime_ns, scale)
+        
+        try:
+            source_stat = os.stat(path)
+        except OSError:
+            return self._surface_cache.make_key('shape', fallback_shape, fallback_size,
+                                                fallback_color, scale)
+        return self._surface_cache.make_key('file', os.path.abspath(path), source_stat.st_mtime_ns,
+                                            source_stat.st_size, scale)
+    
+    def decode_image(self, path: str) -> Optional[pygame.Surface]:
+        """
+        Decode an image file, or map it from the mounted bundle, without
+        touching the cache. Safe to call from worker threads.
+        
+        Args:
+            path: Path to image file
+            
+        Returns:
+            Unconverted surface, or None if missing or unreadable
+        """
+        name = self._bundle_name(path)
+        if name is not None:
+            surface = self._bundle.get_image(name)
+            if surface is not None:
+                return surface
+        
+        if not os.path.exists(path):
+            print(f"Image not found: {path}, using fallback shape")
+            return None
+        
+        try:
+            surface = pygame.image.load(path)
+            print(f"Loaded image: {path}")
+            return surface
+        except pygame.error as e:
+            print(f"Failed to load image {path}: {e}")
+            return None
+    
+    def store_image(self, cache_key: tuple, surface: Optional[pygame.Surface],
+                    pin: bool = False, derived: bool = False) -> pygame.Surface:
+        """
+        Finish a decoded image on the main thread: fallback, scale, convert, cache.
+        
+        Args:
+            cache_key: (path, scale, fallback_shape, fallback_size, fallback_color)
+            surface: Result of decode_image() or prepare_image(), or None to use
+                the fallback shape
+            pin: Protect the cached image from eviction until unpinned
+            derived: Surface is already scaled/rasterized (from prepare_image())
+            
+        Returns:
+            The cached surface
+        """
+        if not derived:
+            surface = self._derive_image(cache_key, surface)
+        
+        # Match the display pixel format, or defer until the display exists
+        if self._display_ready():
+            surface = self._to_display_format(surface)
+        else:
+            self._pending_conversion.append(cache_key)
         
         # Cache and return
-        self._image_cache[cache_key] = surface
+        if pin:
+            self._image_cache.pin(cache_key)
+        self._image_cache.put(cache_key, surface)
         return surface
     
+    def mount_bundle(self, path: str) -> bool:
+        """
+        Serve images, sounds and fonts from a bundle built by asset_bundle.py.
+        Assets missing from the bundle still load from loose files.
+        
+        Args:
+            path: Path to the bundle file
+            
+        Returns:
+            True if the bundle was mounted
+        """
+        try:
+            bundle = AssetBundle(path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to mount asset bundle {path}: {e}")
+            return False
+        
+        if self._bundle is not None:
+            self._bundle.close()
+        self._bundle = bundle
+        self._loose_overrides.clear()
+        print(f"Mounted asset bundle: {path} ({len(bundle)} assets)")
+        return True
+    
+    def _bundle_name(self, path: str) -> Optional[str]:
+        """Get the bundle entry name to load a path from, or None to use the loose file."""
+        if self._bundle is None or os.path.normpath(path) in self._loose_overrides:
+            return None
+        return bundle_name(path)
+    
+    def invalidate(self, path: str) -> int:
+        """
+        Drop every cached resource loaded from a file, e.g. after it changed on
+        disk. Pins are kept for the reloaded resource, resolved image handles
+        are reloaded in place, and the file is read loose from now on even if
+        a bundle is mounted.
+        
+        Args:
+            path: Path of the changed file
+            
+        Returns:
+            Number of cache entries dropped
+        """
+        path = os.path.normpath(path)
+        if self._bundle is not None:
+            self._loose_overrides.add(path)
+        
+        def from_path(key: Any) -> bool:
+            source = key[0] if isinstance(key, tuple) else key
+            return isinstance(source, str) and os.path.normpath(source) == path
+        
+        dropped = 0
+        for name, cache in self._caches.items():
+            for key in [key for key in cache.keys() if from_path(key)]:
+                cache.invalidate(key)
+                dropped += 1
+                
+                if name == 'image':
+                    if key in self._pending_conversion:
+                        self._pending_conversion.remove(key)
+                    # Atlas regions hold copies of the old pixels
+                    self._atlas = None
+        
+        # Live handles keep pointing at a valid surface
+        for handle, key in enumerate(self._handle_keys):
+            if self._handle_surfaces[handle] is not None and from_path(key):
+                self._handle_surfaces[handle] = self.load_image(*key)
+        
+        if dropped:
+            print(f"Invalidated {dropped} cached resources for {path}")
+        return dropped
+    
+    def convert_pending_surfaces(self) -> int:
+        """
+        Convert images that were loaded before the display was created.
+        Call once after pygame.display.set_mode(). Callers that already hold a
+        pre-display surface keep the unconverted object; later loads return
+        the converted one from the cache.
+        
+        Returns:
+            Number of surfaces converted
+        """
+        if not self._display_ready():
+            return 0
+        
+        converted = 0
+        for cache_key in self._pending_conversion:
+            surface = self._image_cache.peek(cache_key)
+            if surface is not None:
+                surface = self._to_display_format(surface)
+                self._image_cache.put(cache_key, surface)
+                
+                # Keep resolved handles pointing at the converted surface
+                handle = self._handles.get(cache_key)
+                if handle is not None and self._handle_surfaces[handle] is not None:
+                    self._handle_surfaces[handle] = surface
+                converted += 1
+        self._pending_conversion.clear()
+        
+        if converted:
+            print(f"Converted {converted} pending images to display format")
+        return converted
+    
+    def resolve_image(self, path: str, scale: Optional[Tuple[int, int]] = None,
+                      fallback_shape: str = "rect", fallback_size: Tuple[int, int] = (32, 32),
+                      fallback_color: Tuple[int, int, int] = COLORS['WHITE']) -> int:
+        """
+        Resolve an image spec once to an integer handle for per-frame lookups.
+        The image is loaded (with the same fallbacks as load_image) and pinned
+        in the cache until release_image() is called.
+        
+        Args:
+            Same as load_image
+            
+        Returns:
+            Handle for get_surface(); the same spec always maps to the same handle
+        """
+        cache_key = (path, scale, fallback_shape, fallback_size, fallback_color)
+        
+        handle = self._handles.get(cache_key)
+        if handle is None:
+            handle = len(self._handle_keys)
+            self._handles[cache_key] = handle
+            self._handle_keys.append(cache_key)
+            self._handle_surfaces.append(None)
+        
+        if self._handle_surfaces[handle] is None:
+            self._handle_surfaces[handle] = self.load_image(*cache_key, pin=True)
+        return handle
+    
+    def get_surface(self, handle: int) -> Optional[pygame.Surface]:
+        """
+        Get the surface for a resolved handle. O(1), meant for the hot path.
+        
+        Returns:
+            Surface, or None if the handle was released
+        """
+        return self._handle_surfaces[handle]
+    
+    def release_image(self, handle: int):
+        """
+        Release a handle's pin so its image may be evicted again.
+        The handle number stays reserved; resolving the same spec reuses it.
+        """
+        if self._handle_surfaces[handle] is not None:
+            self._handle_surfaces[handle] = None
+            self._image_cache.unpin(self._handle_keys[handle])
+    
+    @staticmethod
+    def _display_ready() -> bool:
+        """Check whether a display surface exists to convert against."""
+        return pygame.display.get_init() and pygame.display.get_surface() is not None
+    
+    @staticmethod
+    def _to_display_format(surface: pygame.Surface) -> pygame.Surface:
+        """
+        Convert a surface to the display pixel format.
+        
+        Colorkey surfaces are converted with RLE acceleration, fully opaque
+        surfaces drop their alpha channel, everything else keeps per-pixel alpha.
+        
+        Args:
+            surface: Surface in any pixel format
+            
+        Returns:
+            New surface in display format
+        """
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            converted = surface.convert()
+            converted.set_colorkey(colorkey, pygame.RLEACCEL)
+            return converted
+        
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert()
+        
+        # Every pixel above alpha 254 means the alpha channel carries nothing
+        width, height = surface.get_size()
+        if pygame.mask.from_surface(surface, 254).count() == width * height:
+            return surface.convert()
+        
+        return surface.convert_alpha()
+    
     def load_sound(self, path: str, fallback_duration: float = 0.1, 
-                   fallback_frequency: int = 440) -> pygame.mixer.Sound:
+                   fallback_frequency: int = 440, pin: bool = False) -> pygame.mixer.Sound:
         """
         Load a sound with fallback to generated tone.
         
@@ -80,35 +391,72 @@ class ResourceLoader:
             path: Path to sound file
             fallback_duration: Duration of fallback tone in seconds
             fallback_frequency: Frequency of fallback tone in Hz
+            pin: Protect the cached sound from eviction until unpinned
             
         Returns:
             pygame.mixer.Sound object
         """
-        if path in self._sound_cache:
-            return self._sound_cache[path]
-        
-        sound = None
+        cached = self._sound_cache.get(path)
+        if cached is not None:
+            if pin:
+                self._sound_cache.pin(path)
+            return cached
+        
+        ensure_mixer()
+        return self.store_sound(path, self.decode_sound(path),
+                                fallback_duration, fallback_frequency, pin)
+    
+    def decode_sound(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Decode a sound file, or read its PCM from the mounted bundle, without
+        touching the cache. Safe to call from worker threads. The mixer must
+        already be running (RuntimeError otherwise): starting it from a worker
+        would race the main thread's ensure_mixer().
         
-        # Try to load the actual sound
-        if os.path.exists(path):
-            try:
-                sound = pygame.mixer.Sound(path)
-                print(f"Loaded sound: {path}")
-            except pygame.error as e:
-                print(f"Failed to load sound {path}: {e}")
-                sound = None
-        else:
+        Returns:
+            Sound, or None if missing or unreadable
+        """
+        if not pygame.mixer.get_init():
+            raise RuntimeError(f"Cannot decode {path} before the mixer is initialized")
+        name = self._bundle_name(path)
+        if name is not None:
+            sound = self._bundle.get_sound(name)
+            if sound is not None:
+                return sound
+        
+        if not os.path.exists(path):
             print(f"Sound not found: {path}, using fallback tone")
+            return None
+        
+        try:
+            sound = pygame.mixer.Sound(path)
+            print(f"Loaded sound: {path}")
+            return sound
+        except pygame.error as e:
+            print(f"Failed to load sound {path}: {e}")
+            return None
+    
+    def store_sound(self, path: str, sound: Optional[pygame.mixer.Sound],
+                    fallback_duration: float = 0.1, fallback_frequency: int = 440,
+                    pin: bool = False) -> pygame.mixer.Sound:
+        """
+        Cache a decoded sound, generating the fallback tone if it is None.
         
+        Returns:
+            The cached sound
+        """
         # Create fallback tone if sound loading failed
         if sound is None:
             sound = self._create_fallback_tone(fallback_duration, fallback_frequency)
         
         # Cache and return
-        self._sound_cache[path] = sound
+        if pin:
+            self._sound_cache.pin(path)
+        self._sound_cache.put(path, sound)
         return sound
     
-    def load_font(self, path: str, size: int, fallback_font: str = None) -> pygame.font.Font:
+    def load_font(self, path: str, size: int, fallback_font: str = None,
+                  pin: bool = False) -> pygame.font.Font:
         """
         Load a font with fallback to system font.
         
@@ -116,27 +464,41 @@ class ResourceLoader:
             path: Path to font file
             size: Font size
             fallback_font: Name of system font to use as fallback
+            pin: Protect the cached font from eviction until unpinned
             
         Returns:
             pygame.font.Font object
         """
-        cache_key = f"{path}_{size}"
+        cache_key = (path, size)
         
-        if cache_key in self._font_cache:
-            return self._font_cache[cache_key]
+        # Font module is started on first use rather than at import
+        if not pygame.font.get_init():
+            pygame.font.init()
+        
+        cached = self._font_cache.get(cache_key)
+        if cached is not None:
+            if pin:
+                self._font_cache.pin(cache_key)
+            return cached
         
         font = None
         
+        # Try the mounted bundle first
+        name = self._bundle_name(path)
+        if name is not None:
+            font = self._bundle.get_font(name, size)
+        
         # Try to load the actual font
-        if os.path.exists(path):
-            try:
-                font = pygame.font.Font(path, size)
-                print(f"Loaded font: {path}")
-            except pygame.error as e:
-                print(f"Failed to load font {path}: {e}")
-                font = None
-        else:
-            print(f"Font not found: {path}, using fallback")
+        if font is None:
+            if os.path.exists(path):
+                try:
+                    font = pygame.font.Font(path, size)
+                    print(f"Loaded font: {path}")
+                except pygame.error as e:
+                    print(f"Failed to load font {path}: {e}")
+                    font = None
+            else:
+                print(f"Font not found: {path}, using fallback")
         
         # Create fallback font if font loading failed
         if font is None:
@@ -149,37 +511,61 @@ class ResourceLoader:
                 font = pygame.font.Font(None, size)  # Default font
         
         # Cache and return
-        self._font_cache[cache_key] = font
+        if pin:
+            self._font_cache.pin(cache_key)
+        self._font_cache.put(cache_key, font)
         return font
     
-    def load_json(self, path: str, fallback_data: Optional[dict] = None) -> dict:
+    def load_json(self, path: str, fallback_data: Optional[dict] = None,
+                  pin: bool = False) -> dict:
         """
         Load JSON data with optional fallback.
         
         Args:
             path: Path to JSON file
             fallback_data: Dictionary to return if loading fails
+            pin: Protect the cached data from eviction until unpinned
             
         Returns:
             Dictionary with loaded data or fallback
         """
-        if path in self._json_cache:
-            return self._json_cache[path]
+        cached = self._json_cache.get(path)
+        if cached is not None:
+            if pin:
+                self._json_cache.pin(path)
+            return cached
         
-        data = None
+        return self.store_json(path, self.decode_json(path), fallback_data, pin)
+    
+    def decode_json(self, path: str) -> Optional[dict]:
+        """
+        Parse a JSON file without touching the cache. Safe to call from
+        worker threads.
         
-        # Try to load the actual JSON
-        if os.path.exists(path):
-            try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                print(f"Loaded JSON: {path}")
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Failed to load JSON {path}: {e}")
-                data = None
-        else:
+        Returns:
+            Parsed data, or None if missing or invalid
+        """
+        if not os.path.exists(path):
             print(f"JSON not found: {path}")
+            return None
+        
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            print(f"Loaded JSON: {path}")
+            return data
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Failed to load JSON {path}: {e}")
+            return None
+    
+    def store_json(self, path: str, data: Optional[dict],
+                   fallback_data: Optional[dict] = None, pin: bool = False) -> dict:
+        """
+        Cache parsed JSON data, using the fallback if it is None.
         
+        Returns:
+            The cached data
+        """
         # Use fallback data if loading failed
         if data is None:
             if fallback_data is not None:
@@ -189,7 +575,9 @@ class ResourceLoader:
                 data = {}
         
         # Cache and return
-        self._json_cache[path] = data
+        if pin:
+            self._json_cache.pin(path)
+        self._json_cache.put(path, data)
         return data
     
     def _create_fallback_shape(self, shape: str, size: Tuple[int, int], 
@@ -265,24 +653,54 @@ class ResourceLoader:
             frequency: Frequency in Hz
             
         Returns:
-            pygame.mixer.Sound with generated tone
+            pygame.mixer.Sound with generated tone, in the current mixer format
+        """
+        # Imported here so NumPy is only needed when a fallback is generated
+        from .sound_synth import synthesize
+        return synthesize(waveform='sine', duration=duration, frequency=frequency,
+                          volume=0.125, attack=0.0, release=0.005)
+    
+    def build_atlas(self, include_fallback_shapes: bool = True,
+                    layout_path: Optional[str] = ATLAS_SETTINGS['layout_cache']) -> TextureAtlas:
+        """
+        Pack every cached image (and optionally every predefined fallback shape)
+        into a texture atlas.
+        
+        Args:
+            include_fallback_shapes: Also pack the shapes from FALLBACK_SHAPES,
+                named "shape:<object_type>"; cached images are named str(cache_key)
+            layout_path: JSON file used to cache the packed layout between runs,
+                or None to always repack
+            
+        Returns:
+            The built TextureAtlas
         """
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
+        atlas = TextureAtlas()
         
-        # Generate sine wave
-        import numpy as np
-        wave_array = np.zeros((frames, 2))  # Stereo
+        for cache_key, surface in self._image_cache.items():
+            atlas.add(str(cache_key), surface)
         
-        for i in range(frames):
-            time = float(i) / sample_rate
-            wave = int(4096 * np.sin(frequency * 2 * np.pi * time))
-            wave_array[i][0] = wave  # Left channel
-            wave_array[i][1] = wave  # Right channel
+        if include_fallback_shapes:
+            for object_type, (shape, size, color) in FALLBACK_SHAPES.items():
+                atlas.add(f"shape:{object_type}", self._create_fallback_shape(shape, size, color))
         
-        # Convert to pygame sound
-        sound = pygame.sndarray.make_sound(wave_array.astype(np.int16))
-        return sound
+        self._atlas = atlas.build(layout_path)
+        print(f"Built texture atlas: {len(atlas)} sprites on {len(atlas.pages)} pages")
+        return self._atlas
+    
+    def get_atlas_region(self, name: Any) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        """
+        Look up a sprite in the last built atlas.
+        
+        Args:
+            name: Image cache key tuple or "shape:<object_type>"
+            
+        Returns:
+            (atlas page, sub-rect) tuple, or None if no atlas or unknown name
+        """
+        if self._atlas is None:
+            return None
+        return self._atlas.get(name if isinstance(name, str) else str(name))
     
     def get_cached_resource(self, path: str, resource_type: str) -> Any:
         """
@@ -295,18 +713,58 @@ class ResourceLoader:
         Returns:
             Cached resource or None if not found
         """
-        cache_map = {
-            'image': self._image_cache,
-            'sound': self._sound_cache,
-            'font': self._font_cache,
-            'json': self._json_cache
-        }
-        
-        cache = cache_map.get(resource_type)
-        if cache:
+        cache = self._caches.get(resource_type)
+        if cache is not None:
             return cache.get(path)
         return None
     
+    def is_cached(self, resource_type: str, key: Any) -> bool:
+        """Check for a cached resource without counting a hit or miss."""
+        cache = self._caches.get(resource_type)
+        return cache is not None and key in cache
+    
+    def pin(self, resource_type: str, key: Any):
+        """
+        Protect a cached resource from eviction. Pins are reference counted.
+        
+        Args:
+            resource_type: Type of resource ('image', 'sound', 'font', 'json')
+            key: Cache key of the resource (path for sounds and JSON,
+                (path, size) for fonts, the full spec tuple for images)
+        """
+        self._caches[resource_type].pin(key)
+    
+    def unpin(self, resource_type: str, key: Any):
+        """Release one pin taken with pin() or a load_* call with pin=True."""
+        self._caches[resource_type].unpin(key)
+    
+    def unpin_all(self, resource_type: Optional[str] = None):
+        """
+        Release all pins, for example when leaving a level.
+        
+        Args:
+            resource_type: Specific type to unpin, or None for all
+        """
+        for name, cache in self._caches.items():
+            if resource_type is None or name == resource_type:
+                cache.unpin_all()
+    
+    def get_cache_stats(self) -> Dict[str, dict]:
+        """
+        Get runtime metrics for every in-memory cache.
+        
+        Returns:
+            Dictionary mapping resource type to entries, bytes, budget, pinned,
+            hits, misses, evictions and hit_rate
+        """
+        return {name: cache.get_stats() for name, cache in self._caches.items()}
+    
+    def get_disk_cache_stats(self) -> Optional[dict]:
+        """Get on-disk surface cache metrics, or None if it is disabled."""
+        if self._surface_cache is None:
+            return None
+        return self._surface_cache.get_stats()
+    
     def clear_cache(self, resource_type: Optional[str] = None):
         """
         Clear resource cache.
@@ -316,6 +774,9 @@ class ResourceLoader:
         """
         if resource_type == 'image' or resource_type is None:
             self._image_cache.clear()
+            self._pending_conversion.clear()
+            self._handle_surfaces = [None] * len(self._handle_keys)
+            self._atlas = None
         if resource_type == 'sound' or resource_type is None:
             self._sound_cache.clear()
         if resource_type == 'font' or resource_type is None:
@@ -328,28 +789,81 @@ class ResourceLoader:
         else:
             print("Cleared all resource caches")
 
+_mixer_lock = threading.Lock()
+
+def ensure_mixer():
+    """
+    Start the mixer with the AUDIO_SETTINGS format if nothing has started it yet.
+    Call from the main thread; worker threads only decode once it is running.
+    """
+    with _mixer_lock:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(
+                frequency=AUDIO_SETTINGS['frequency'],
+                size=AUDIO_SETTINGS['sample_size'],
+                channels=AUDIO_SETTINGS['output_channels'],
+                buffer=AUDIO_SETTINGS['buffer_size']
+            )
+
+# Byte size estimates used by the cache budgets
+def _surface_bytes(surface: pygame.Surface) -> int:
+    """Size of a surface's pixel buffer"""
+    return surface.get_pitch() * surface.get_height()
+
+def _sound_bytes(sound: pygame.mixer.Sound) -> int:
+    """Size of a sound's decoded PCM buffer in the current mixer format"""
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        return 0
+    frequency, size, channels = mixer_format
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+def _json_bytes(data: Any) -> int:
+    """Serialized size of JSON data, a rough stand-in for its memory use"""
+    return len(json.dumps(data, default=str))
+
 # Convenience functions for easy access
+
 def load_image(path: str, scale: Optional[Tuple[int, int]] = None, 
                fallback_shape: str = "rect", fallback_size: Tuple[int, int] = (32, 32),
-               fallback_color: Tuple[int, int, int] = COLORS['WHITE']) -> pygame.Surface:
+               fallback_color: Tuple[int, int, int] = COLORS['WHITE'],
+               pin: bool = False) -> pygame.Surface:
     """Convenience function for loading images"""
-    return _global_loader.load_image(path, scale, fallback_shape, fallback_size, fallback_color)
+    return get_resource_loader().load_image(path, scale, fallback_shape, fallback_size, fallback_color, pin)
 
 def load_sound(path: str, fallback_duration: float = 0.1, 
-               fallback_frequency: int = 440) -> pygame.mixer.Sound:
+               fallback_frequency: int = 440, pin: bool = False) -> pygame.mixer.Sound:
     """Convenience function for loading sounds"""
-    return _global_loader.load_sound(path, fallback_duration, fallback_frequency)
+    return get_resource_loader().load_sound(path, fallback_duration, fallback_frequency, pin)
 
-def load_font(path: str, size: int, fallback_font: str = None) -> pygame.font.Font:
+def load_font(path: str, size: int, fallback_font: str = None,
+              pin: bool = False) -> pygame.font.Font:
     """Convenience function for loading fonts"""
-    return _global_loader.load_font(path, size, fallback_font)
+    return get_resource_loader().load_font(path, size, fallback_font, pin)
 
-def load_json(path: str, fallback_data: Optional[dict] = None) -> dict:
+def load_json(path: str, fallback_data: Optional[dict] = None, pin: bool = False) -> dict:
     """Convenience function for loading JSON"""
-    return _global_loader.load_json(path, fallback_data)
+    return get_resource_loader().load_json(path, fallback_data, pin)
 
-# Global loader instance
-_global_loader = ResourceLoader()
+def resolve_image(path: str, scale: Optional[Tuple[int, int]] = None,
+                  fallback_shape: str = "rect", fallback_size: Tuple[int, int] = (32, 32),
+                  fallback_color: Tuple[int, int, int] = COLORS['WHITE']) -> int:
+    """Convenience function for resolving image handles"""
+    return get_resource_loader().resolve_image(path, scale, fallback_shape, fallback_size, fallback_color)
+
+def get_surface(handle: int) -> Optional[pygame.Surface]:
+    """Convenience function for handle lookups (a handle implies the loader exists)"""
+    return _global_loader._handle_surfaces[handle]
+
+def get_resource_loader() -> ResourceLoader:
+    """Get the shared loader used by the convenience functions, creating it on first use"""
+    global _global_loader
+    if _global_loader is None:
+        _global_loader = ResourceLoader()
+    return _global_loader
+
+# Global loader instance, created lazily so importing this module has no side effects
+_global_loader: Optional[ResourceLoader] = None
 
 # Predefined fallback shapes for common game objects
 FALLBACK_SHAPES = {
@@ -379,6 +893,25 @@ def load_game_image(path: str, object_type: str, scale: Optional[Tuple[int, int]
     """
     if object_type in FALLBACK_SHAPES:
         shape, size, color = FALLBACK_SHAPES[object_type]
-        return load_image(path, scale, shape, size, color)
+        return get_resource_loader().load_image(path, scale, shape, size, color)
+    else:
+        return get_resource_loader().load_image(path, scale)
+
+def resolve_game_image(path: str, object_type: str, scale: Optional[Tuple[int, int]] = None) -> int:
+    """
+    Resolve a handle for an image with predefined fallbacks for common game objects.
+    Resolve once (e.g. when an entity is created) and call get_surface() each frame.
+    
+    Args:
+        path: Path to image file
+        object_type: Type of game object (key in FALLBACK_SHAPES)
+        scale: Optional scaling
+        
+    Returns:
+        Image handle
+    """
+    if object_type in FALLBACK_SHAPES:
+        shape, size, color = FALLBACK_SHAPES[object_type]
+        return get_resource_loader().resolve_image(path, scale, shape, size, color)
     else:
-        return load_image(path, scale)
\ No newline at end of file
+        return get_resource_loader().resolve_image(path, scale)
\ No newline at end of file
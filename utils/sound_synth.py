@@ -0,0 +1,135 @@
+import functools
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pygame
+from .resource_loader import ensure_mixer
+
+WAVEFORMS = ('sine', 'square', 'saw', 'triangle', 'noise')
+
+# Procedural sound effects, generated at startup instead of shipping files.
+# Keys are synthesize() keyword arguments.
+SFX_PRESETS = {
+    'tower_fire': {'waveform': 'square', 'duration': 0.08, 'frequency': 880, 'end_frequency': 440,
+                   'volume': 0.25, 'attack': 0.002, 'release': 0.04},
+    'enemy_hit': {'waveform': 'noise', 'duration': 0.06, 'frequency': 0, 'volume': 0.3,
+                  'attack': 0.001, 'release': 0.04},
+    'enemy_death': {'waveform': 'saw', 'duration': 0.3, 'frequency': 300, 'end_frequency': 60,
+                    'volume': 0.35, 'noise': 0.2, 'release': 0.15},
+    'card_play': {'waveform': 'triangle', 'duration': 0.12, 'frequency': 520, 'end_frequency': 780,
+                  'volume': 0.3, 'release': 0.05},
+    'wave_start': {'waveform': 'square', 'duration': 0.5, 'frequency': 220, 'end_frequency': 330,
+                   'volume': 0.3, 'attack': 0.02, 'decay': 0.1, 'sustain': 0.6, 'release': 0.2},
+    'ui_click': {'waveform': 'sine', 'duration': 0.03, 'frequency': 1200, 'volume': 0.2,
+                 'release': 0.02},
+}
+
+def render_samples(sample_rate: int, waveform: str = 'sine', duration: float = 0.1,
+                   frequency: float = 440.0, end_frequency: Optional[float] = None,
+                   volume: float = 0.5, attack: float = 0.005, decay: float = 0.0,
+                   sustain: float = 1.0, release: float = 0.01, noise: float = 0.0,
+                   seed: int = 0) -> np.ndarray:
+    """
+    Render a mono float32 buffer in [-1, 1] with whole-array NumPy operations.
+
+    Args:
+        sample_rate: Output sample rate in Hz
+        waveform: One of WAVEFORMS
+        duration: Length in seconds
+        frequency: Start frequency in Hz
+        end_frequency: End frequency for an exponential pitch sweep, None for constant pitch
+        volume: Peak amplitude (0-1)
+        attack, decay, release: ADSR segment lengths in seconds
+        sustain: ADSR sustain level (0-1)
+        noise: Amount of white noise mixed in (0-1)
+        seed: Noise seed, so the same parameters always give the same sound
+
+    Returns:
+        float32 array of samples
+    """
+    frames = max(int(duration * sample_rate), 1)
+    t = np.arange(frames, dtype=np.float64) / sample_rate
+    rng = np.random.default_rng(seed)
+
+    if waveform == 'noise':
+        wave = rng.uniform(-1.0, 1.0, frames)
+    else:
+        # Phase is the running integral of frequency so sweeps stay continuous
+        if end_frequency is None or end_frequency == frequency or frequency <= 0:
+            phase = frequency * t
+        else:
+            instantaneous = frequency * (end_frequency / frequency) ** (t / duration)
+            phase = np.cumsum(instantaneous) / sample_rate
+        cycle = phase % 1.0
+
+        if waveform == 'square':
+            wave = np.where(cycle < 0.5, 1.0, -1.0)
+        elif waveform == 'saw':
+            wave = 2.0 * cycle - 1.0
+        elif waveform == 'triangle':
+            wave = 1.0 - 4.0 * np.abs(cycle - 0.5)
+        else:  # Default to sine
+            wave = np.sin(2.0 * np.pi * phase)
+
+    if noise > 0.0:
+        wave = (1.0 - noise) * wave + noise * rng.uniform(-1.0, 1.0, frames)
+
+    # ADSR envelope as a piecewise-linear interpolation
+    release_start = max(duration - release, 0.0)
+    attack_end = min(attack, release_start)
+    decay_end = min(attack + decay, release_start)
+    envelope = np.interp(t, [0.0, attack_end, decay_end, release_start, duration],
+                         [0.0 if attack > 0 else 1.0, 1.0, sustain, sustain, 0.0 if release > 0 else sustain])
+
+    return (wave * envelope * volume).astype(np.float32)
+
+def to_mixer_array(samples: np.ndarray, mixer_format: Tuple[int, int, int]) -> np.ndarray:
+    """
+    Convert float samples to the sample type and channel layout of the mixer.
+
+    Args:
+        samples: Mono float array in [-1, 1]
+        mixer_format: (frequency, size, channels) from pygame.mixer.get_init()
+
+    Returns:
+        Array accepted by pygame.sndarray.make_sound
+    """
+    _, size, channels = mixer_format
+
+    if size == 32:
+        converted = samples
+    elif size == -16:
+        converted = (samples * 32767).astype(np.int16)
+    elif size == 16:
+        converted = (samples * 32767 + 32768).astype(np.uint16)
+    elif size == -8:
+        converted = (samples * 127).astype(np.int8)
+    else:  # Unsigned 8-bit
+        converted = (samples * 127 + 128).astype(np.uint8)
+
+    if channels == 1:
+        return np.ascontiguousarray(converted)
+    return np.ascontiguousarray(np.repeat(converted[:, None], channels, axis=1))
+
+@functools.lru_cache(maxsize=128)
+def _synthesize_cached(mixer_format: Tuple[int, int, int], params: Tuple[Tuple[str, object], ...]) -> pygame.mixer.Sound:
+    samples = render_samples(mixer_format[0], **dict(params))
+    return pygame.sndarray.make_sound(to_mixer_array(samples, mixer_format))
+
+def synthesize(**params) -> pygame.mixer.Sound:
+    """
+    Generate a sound in the current mixer format, memoized by parameters.
+    Accepts the keyword arguments of render_samples() except sample_rate.
+
+    Returns:
+        pygame.mixer.Sound (shared between calls with identical parameters)
+    """
+    ensure_mixer()
+    return _synthesize_cached(pygame.mixer.get_init(), tuple(sorted(params.items())))
+
+def generate_sfx(name: str) -> pygame.mixer.Sound:
+    """Generate a sound from SFX_PRESETS."""
+    return synthesize(**SFX_PRESETS[name])
+
+def generate_all_sfx() -> Dict[str, pygame.mixer.Sound]:
+    """Generate every preset, e.g. once at startup."""
+    return {name: generate_sfx(name) for name in SFX_PRESETS}
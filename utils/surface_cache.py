@@ -0,0 +1,158 @@
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from typing import Optional
+import pygame
+from ..settings import DISK_CACHE_SETTINGS
+
+# File layout: header followed by raw RGBA pixels
+SURFACE_CACHE_MAGIC = b'RLSC'
+SURFACE_CACHE_VERSION = 1
+HEADER_FORMAT = '<4sHHIII'  # magic, version, reserved, width, height, crc32 of pixels
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+FILE_EXTENSION = '.surf'
+
+class SurfaceDiskCache:
+    """
+    Persistent cache of decoded, scaled or generated surfaces.
+    Entries are raw RGBA pixel files named by a digest of the source identity
+    and transform parameters, checked with CRC32 on read. The directory is
+    kept under a byte cap by deleting least recently used files.
+    Safe to use from worker threads.
+    """
+
+    def __init__(self, directory: str = DISK_CACHE_SETTINGS['directory'],
+                 max_bytes: int = DISK_CACHE_SETTINGS['max_bytes']):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # scanned lazily
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build an entry key from hashable parts (source identity, transform params)."""
+        text = repr((SURFACE_CACHE_VERSION,) + parts)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[pygame.Surface]:
+        """
+        Read a cached surface.
+
+        Returns:
+            Unconverted RGBA surface, or None if missing or failing the integrity check
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+                pixels = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            magic, version, _, width, height, checksum = struct.unpack(HEADER_FORMAT, header)
+        except struct.error:
+            magic = None
+
+        if (magic != SURFACE_CACHE_MAGIC or version != SURFACE_CACHE_VERSION
+                or len(pixels) != width * height * 4 or zlib.crc32(pixels) != checksum):
+            print(f"Discarding corrupt surface cache entry: {path}")
+            self.corrupt += 1
+            self.misses += 1
+            self._remove(path)
+            return None
+
+        # Touch so the size cap evicts least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return pygame.image.frombytes(pixels, (width, height), 'RGBA')
+
+    def put(self, key: str, surface: pygame.Surface):
+        """Write a surface, then trim the directory to the byte cap."""
+        pixels = pygame.image.tobytes(surface, 'RGBA')
+        width, height = surface.get_size()
+        header = struct.pack(HEADER_FORMAT, SURFACE_CACHE_MAGIC, SURFACE_CACHE_VERSION, 0,
+                             width, height, zlib.crc32(pixels))
+
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            existing = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(temp_path, 'wb') as f:
+                f.write(header)
+                f.write(pixels)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Failed to write surface cache entry {path}: {e}")
+            self._remove(temp_path)
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += HEADER_SIZE + len(pixels) - existing
+            if self._total_bytes > self.max_bytes:
+                self._trim()
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            for entry in self._entries():
+                self._remove(entry.path)
+            self._total_bytes = 0
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'corrupt': self.corrupt,
+            'bytes': self._total_bytes,
+            'budget': self.max_bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + FILE_EXTENSION)
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.directory)
+                    if entry.name.endswith(FILE_EXTENSION)]
+        except OSError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _trim(self):
+        """Delete least recently used files until under the cap. Caller holds the lock."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            if self._remove(entry.path):
+                self._total_bytes -= size
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
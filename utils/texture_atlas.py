@@ -0,0 +1,210 @@
+import pygame
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+from ..settings import ATLAS_SETTINGS
+
+# Layout format version, bump when the cached layout structure changes
+ATLAS_LAYOUT_VERSION = 1
+
+class TextureAtlas:
+    """
+    Packs many small surfaces into a few large atlas pages.
+    Sprites are packed with a shelf algorithm (tallest first) so a renderer
+    can blit every sprite from a handful of source surfaces.
+    """
+
+    def __init__(self, page_size: Tuple[int, int] = ATLAS_SETTINGS['page_size'],
+                 padding: int = ATLAS_SETTINGS['padding']):
+        self.page_size = tuple(page_size)
+        self.padding = padding
+        self.pages: List[pygame.Surface] = []
+
+        # name -> (page index, pygame.Rect inside that page)
+        self._regions: Dict[str, Tuple[int, pygame.Rect]] = {}
+        self._pending: Dict[str, pygame.Surface] = {}
+
+    def add(self, name: str, surface: pygame.Surface):
+        """
+        Queue a surface for packing on the next build().
+
+        Args:
+            name: Unique name used for lookups
+            surface: Surface to copy into the atlas
+        """
+        self._pending[name] = surface
+
+    def build(self, layout_path: Optional[str] = None) -> 'TextureAtlas':
+        """
+        Pack all queued surfaces into atlas pages.
+
+        Args:
+            layout_path: Optional JSON file used to reuse a previous layout.
+                The cached layout is only used when the set of names and sizes
+                matches exactly; otherwise a new layout is packed and saved.
+
+        Returns:
+            self, for chaining
+        """
+        layout = None
+        if layout_path:
+            layout = self._load_layout(layout_path)
+
+        if layout is None:
+            layout = self._pack()
+            if layout_path:
+                self._save_layout(layout_path, layout)
+
+        self._blit_pages(layout)
+        self._pending.clear()
+        return self
+
+    def get(self, name: str) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        """
+        Look up a packed sprite.
+
+        Args:
+            name: Name the surface was added with
+
+        Returns:
+            (atlas page, sub-rect) tuple, or None if the name is unknown
+        """
+        region = self._regions.get(name)
+        if region is None:
+            return None
+        page_index, rect = region
+        return self.pages[page_index], rect
+
+    def blit(self, target: pygame.Surface, name: str, pos: Tuple[int, int]) -> bool:
+        """
+        Blit a packed sprite onto a target surface.
+
+        Returns:
+            True if the sprite exists and was drawn
+        """
+        region = self._regions.get(name)
+        if region is None:
+            return False
+        page_index, rect = region
+        target.blit(self.pages[page_index], pos, rect)
+        return True
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._regions
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def _signature(self) -> List[list]:
+        """Names and sizes of queued surfaces, used to validate cached layouts."""
+        return sorted([name, *surface.get_size()] for name, surface in self._pending.items())
+
+    def _pack(self) -> Dict[str, list]:
+        """
+        Shelf-pack queued surfaces.
+
+        Returns:
+            Dictionary mapping name -> [page, x, y, width, height]
+        """
+        page_w, page_h = self.page_size
+        pad = self.padding
+
+        # Tallest first keeps shelves tightly filled
+        items = sorted(self._pending.items(),
+                       key=lambda item: (item[1].get_height(), item[1].get_width()),
+                       reverse=True)
+
+        layout = {}
+        page = -1
+        shelf_x = shelf_y = shelf_h = 0
+
+        for name, surface in items:
+            width, height = surface.get_size()
+
+            # Oversized sprites get a dedicated page of their own size
+            if width > page_w or height > page_h:
+                page += 1
+                layout[name] = [page, 0, 0, width, height]
+                shelf_x = shelf_y = shelf_h = 0
+                page += 1
+                continue
+
+            if page < 0:
+                page = 0
+
+            # Start a new shelf when the current one is full
+            if shelf_x + width > page_w:
+                shelf_y += shelf_h + pad
+                shelf_x = shelf_h = 0
+
+            # Start a new page when there is no vertical room left
+            if shelf_y + height > page_h:
+                page += 1
+                shelf_x = shelf_y = shelf_h = 0
+
+            layout[name] = [page, shelf_x, shelf_y, width, height]
+            shelf_x += width + pad
+            shelf_h = max(shelf_h, height)
+
+        return layout
+
+    def _blit_pages(self, layout: Dict[str, list]):
+        """Create page surfaces and copy queued sprites into them."""
+        page_count = max((entry[0] for entry in layout.values()), default=-1) + 1
+
+        # Size each page to what it actually holds (oversized sprites included)
+        page_sizes = [[0, 0] for _ in range(page_count)]
+        for page, x, y, width, height in layout.values():
+            page_sizes[page][0] = max(page_sizes[page][0], x + width)
+            page_sizes[page][1] = max(page_sizes[page][1], y + height)
+
+        self.pages = []
+        for width, height in page_sizes:
+            page_surface = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+            page_surface.fill((0, 0, 0, 0))
+            self.pages.append(page_surface)
+
+        self._regions = {}
+        for name, (page, x, y, width, height) in layout.items():
+            self.pages[page].blit(self._pending[name], (x, y))
+            self._regions[name] = (page, pygame.Rect(x, y, width, height))
+
+        # Match the display pixel format so blits take the fast path
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            self.pages = [page_surface.convert_alpha() for page_surface in self.pages]
+
+    def _load_layout(self, path: str) -> Optional[Dict[str, list]]:
+        """Load a cached layout if it matches the queued surfaces."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Failed to load atlas layout {path}: {e}")
+            return None
+
+        if (data.get('version') != ATLAS_LAYOUT_VERSION
+                or data.get('page_size') != list(self.page_size)
+                or data.get('padding') != self.padding
+                or data.get('signature') != self._signature()):
+            return None
+
+        print(f"Loaded atlas layout: {path}")
+        return data['layout']
+
+    def _save_layout(self, path: str, layout: Dict[str, list]):
+        """Write a packed layout so the next run can skip packing."""
+        data = {
+            'version': ATLAS_LAYOUT_VERSION,
+            'page_size': list(self.page_size),
+            'padding': self.padding,
+            'signature': self._signature(),
+            'layout': layout,
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(data, f)
+        except IOError as e:
+            print(f"Failed to save atlas layout {path}: {e}")